@@ -1,3 +1,5 @@
+#include <math.h>
+#include <string.h>
 #include "ws2812b.pio.h"
 #include "backend.h"
 
@@ -14,6 +16,31 @@ bool has_white;
 
 uint8_t backend_incoming_data_buffer[BackendIncomingDataBufferSize];
 
+// Recent frames as sent by the host, 3 bytes per LED, for decoding delta packets
+uint8_t delta_frames[DeltaHistoryFrames][LEDCount * 3];
+uint16_t delta_frame_ids[DeltaHistoryFrames];
+bool delta_frame_valid[DeltaHistoryFrames]; // Frame has every delta packet sent for it
+uint16_t delta_frame_parts[DeltaHistoryFrames]; // Delta packets received for a frame, 0 if broken
+
+// Packet being received in fragments, handled once the commit command confirms it is complete
+uint8_t fragment_buffer[BackendIncomingDataBufferSize];
+uint16_t fragment_frame_id;
+uint32_t fragments_received[MaxFragments / 32]; // One bit per fragment
+
+// Colors and settings last rendered to each LED by a delta packet, so unchanged LEDs are not
+// rendered again. Settings are the correction, saturation, brightness and flags of the packet,
+// all zero if the LED was rendered some other way since then
+#define ShownSettingsSize 6
+#define ShownFlagValid 0x80
+uint8_t shown_colors[LEDCount * 3];
+uint8_t shown_settings[LEDCount * ShownSettingsSize];
+
+// Output lookup tables fold gamma, brightness, and color correction into one table per
+// channel, so no per-pixel math is needed after the color transform
+uint8_t lut_r[256], lut_g[256], lut_b[256], lut_w[256];
+uint32_t lut_settings;
+bool lut_valid = false;
+
 uint32_t pack_rgbw(uint8_t r, uint8_t g, uint8_t b, uint8_t w) {
   return (w << shift_w) | (r << shift_r) | (g << shift_g) | (b << shift_b);
 }
@@ -22,20 +49,39 @@ uint8_t scale_8(uint8_t a, uint8_t b) {
   return ((uint16_t)a * (uint16_t)b) >> 8;
 }
 
+// Rebuild the output lookup tables if the settings have changed since they were built
+void update_lut(uint8_t corr_r, uint8_t corr_g, uint8_t corr_b, uint8_t brightness) {
+  uint32_t settings = (corr_r << 24) | (corr_g << 16) | (corr_b << 8) | brightness;
+  if (lut_valid && settings == lut_settings) return;
+  for (uint i = 0; i < 256; i++) {
+    float x = i / 255.0f;
+    if (Gamma != 1.0f) x = powf(x, Gamma);
+    x *= brightness / 255.0f;
+    lut_r[i] = x * corr_r;
+    lut_g[i] = x * corr_g;
+    lut_b[i] = x * corr_b;
+    lut_w[i] = x * 255.0f;
+  }
+  lut_settings = settings;
+  lut_valid = true;
+}
+
+// LEDs in a range were rendered without a delta packet, so the next delta packet renders them
+void invalidate_shown(uint start, uint end) {
+  memset(shown_settings + start * ShownSettingsSize, 0, (end - start) * ShownSettingsSize);
+}
+
 void backend_write_frame_buffer() {
   for (uint i = 0; i < LEDCount; i++) {
     pio_sm_put_blocking(PIOBlock, PIOStateMachine, frame_buffer[i]);
   }
 }
 
-uint32_t render_hsv2rgb_rainbow(uint8_t h, uint8_t s, uint8_t v,
-                                uint8_t corr_r, uint8_t corr_g, uint8_t corr_b,
-                                uint8_t saturation, uint8_t brightness) {
+uint32_t render_hsv2rgb_rainbow(uint8_t h, uint8_t s, uint8_t v, uint8_t saturation) {
   uint8_t hue = h;
   uint8_t sat = scale_8(s, saturation);
   uint8_t val = scale_8(v, v);
   if (val > 0 && val < 255) val += 1;
-  val = scale_8(val, brightness);
   uint8_t r, g, b, w;
 
   w = 0;
@@ -151,16 +197,11 @@ uint32_t render_hsv2rgb_rainbow(uint8_t h, uint8_t s, uint8_t v,
     }
   }
 
-  r = scale_8(r, corr_r);
-  g = scale_8(g, corr_g);
-  b = scale_8(b, corr_b);
-
-  return pack_rgbw(r, g, b, w);
+  // Brightness, gamma, and color correction are applied by the lookup tables
+  return pack_rgbw(lut_r[r], lut_g[g], lut_b[b], lut_w[w]);
 }
 
-uint32_t render_rgb(uint8_t r, uint8_t g, uint8_t b,
-                    uint8_t corr_r, uint8_t corr_g, uint8_t corr_b,
-                    uint8_t saturation, uint8_t brightness) {
+uint32_t render_rgb(uint8_t r, uint8_t g, uint8_t b, uint8_t saturation) {
   uint8_t w = 0;
 
   if (has_white) {
@@ -199,12 +240,8 @@ uint32_t render_rgb(uint8_t r, uint8_t g, uint8_t b,
     }
   }
 
-  r = ((uint32_t)r * (uint32_t)brightness * (uint32_t)corr_r) >> 16;
-  g = ((uint32_t)g * (uint32_t)brightness * (uint32_t)corr_g) >> 16;
-  b = ((uint32_t)b * (uint32_t)brightness * (uint32_t)corr_b) >> 16;
-  w = scale_8(w, brightness);
-
-  return pack_rgbw(r, g, b, w);
+  // Brightness, gamma, and color correction are applied by the lookup tables
+  return pack_rgbw(lut_r[r], lut_g[g], lut_b[b], lut_w[w]);
 }
 
 void rgb_render_calibration(uint8_t corr_r, uint8_t corr_g, uint8_t corr_b,
@@ -218,10 +255,129 @@ void rgb_render_calibration(uint8_t corr_r, uint8_t corr_g, uint8_t corr_b,
   }
 }
 
-void backend_handle_command() {
+void send_reply(backend_reply_function reply, uint8_t command_type, uint8_t a, uint8_t b) {
+  uint8_t packet[6] = { PacketStartByte, command_type, 0, 6, a, b };
+  if (reply != NULL) reply(packet, sizeof(packet));
+}
+
+// Apply a delta packet to the frame it was encoded from and render the LEDs that changed
+// Returns false if the packet can't be decoded because the frame it needs is missing
+bool render_delta(uint length) {
+  uint8_t *data = backend_incoming_data_buffer;
+  length = MIN(length, BackendIncomingDataBufferSize);
+  if (length < DeltaHeaderSize) return false;
+  uint start = MIN(data[9] << 8 | data[10], LEDCount);
+  uint end = MIN(data[11] << 8 | data[12], LEDCount);
+  uint8_t flags = data[13];
+  uint16_t frame_id = data[14] << 8 | data[15];
+  uint16_t base_id = data[16] << 8 | data[17];
+
+  uint slot = frame_id % DeltaHistoryFrames;
+  uint8_t *frame = delta_frames[slot];
+  if (flags & DeltaFlagContinue) {
+    // Later ranges are only added to a frame that has every range before them
+    if (delta_frame_valid[slot] || delta_frame_parts[slot] == 0 ||
+        delta_frame_ids[slot] != frame_id) {
+      return false;
+    }
+  } else if (flags & DeltaFlagKeyframe) {
+    memset(frame, 0, sizeof(delta_frames[0]));
+  } else {
+    uint base_slot = base_id % DeltaHistoryFrames;
+    if (base_slot == slot || !delta_frame_valid[base_slot] ||
+        delta_frame_ids[base_slot] != base_id) {
+      return false;
+    }
+    memcpy(frame, delta_frames[base_slot], sizeof(delta_frames[0]));
+  }
+  delta_frame_valid[slot] = false;
+  delta_frame_ids[slot] = frame_id;
+  uint16_t parts = (flags & DeltaFlagContinue) ? delta_frame_parts[slot] : 0;
+  delta_frame_parts[slot] = 0;
+
+  // Spans of changed LEDs, each with the number of unchanged LEDs before it
+  uint pos = DeltaHeaderSize;
+  uint led = start;
+  while (pos + 4 <= length) {
+    led += data[pos] << 8 | data[pos + 1];
+    uint count = data[pos + 2] << 8 | data[pos + 3];
+    pos += 4;
+    if (count & 0x8000) {
+      // Run of one color
+      count &= 0x7fff;
+      if (pos + 3 > length) return false;
+      for (uint i = led; i < led + count && i < end; i++) {
+        memcpy(frame + i * 3, data + pos, 3);
+      }
+      pos += 3;
+    } else {
+      if (pos + count * 3 > length) return false;
+      if (led < end) memcpy(frame + led * 3, data + pos, MIN(count, end - led) * 3);
+      pos += count * 3;
+    }
+    led += count;
+  }
+  delta_frame_parts[slot] = parts + 1;
+
+  uint8_t settings[ShownSettingsSize] = { data[4], data[5], data[6], data[7], data[8],
+                                          ShownFlagValid | (flags & DeltaFlagHSV) };
+  update_lut(data[4], data[5], data[6], data[8]);
+  for (uint i = start; i < end; i++) {
+    uint8_t *c = frame + i * 3;
+    uint8_t *shown = shown_settings + i * ShownSettingsSize;
+    if (memcmp(settings, shown, ShownSettingsSize) == 0 &&
+        memcmp(c, shown_colors + i * 3, 3) == 0) continue;
+    if (flags & DeltaFlagHSV) {
+      frame_buffer[i] = render_hsv2rgb_rainbow(c[0], c[1], c[2], data[7]);
+    } else {
+      frame_buffer[i] = render_rgb(c[0], c[1], c[2], data[7]);
+    }
+    memcpy(shown_colors + i * 3, c, 3);
+    memcpy(shown, settings, ShownSettingsSize);
+  }
+  return true;
+}
+
+// Copy a fragment into the fragment buffer, fragments of a new frame discard the previous one
+void receive_fragment(uint length) {
+  uint8_t *data = backend_incoming_data_buffer;
+  length = MIN(length, BackendIncomingDataBufferSize);
+  if (length < FragmentHeaderSize) return;
+  uint16_t frame_id = data[4] << 8 | data[5];
+  uint8_t index = data[6];
+  uint offset = data[7] << 8 | data[8];
+  uint size = length - FragmentHeaderSize;
+  if (offset + size > BackendIncomingDataBufferSize) return;
+  if (frame_id != fragment_frame_id) {
+    fragment_frame_id = frame_id;
+    memset(fragments_received, 0, sizeof(fragments_received));
+  }
+  memcpy(fragment_buffer + offset, data + FragmentHeaderSize, size);
+  fragments_received[index / 32] |= 1u << (index % 32);
+}
+
+// Returns true and moves the packet into the incoming data buffer if all fragments arrived
+bool commit_fragments() {
+  uint8_t *data = backend_incoming_data_buffer;
+  uint16_t frame_id = data[4] << 8 | data[5];
+  uint count = data[6];
+  if (frame_id != fragment_frame_id || count == 0) return false;
+  for (uint i = 0; i < count; i++) {
+    if (!(fragments_received[i / 32] & (1u << (i % 32)))) return false;
+  }
+  memset(fragments_received, 0, sizeof(fragments_received));
+  // Fragmented packets can't contain other fragments
+  if (fragment_buffer[1] == CmdTypeFragment || fragment_buffer[1] == CmdTypeCommit) return false;
+  memcpy(backend_incoming_data_buffer, fragment_buffer, BackendIncomingDataBufferSize);
+  return true;
+}
+
+void backend_handle_command(backend_reply_function reply) {
   if (backend_incoming_data_buffer[0] != PacketStartByte) return;
   uint8_t command_type = backend_incoming_data_buffer[1];
+  uint length = backend_incoming_data_buffer[2] << 8 | backend_incoming_data_buffer[3];
   if (command_type == CmdTypeCalibration) {
+    invalidate_shown(0, LEDCount);
     rgb_render_calibration(backend_incoming_data_buffer[4],
                            backend_incoming_data_buffer[5],
                            backend_incoming_data_buffer[6],
@@ -234,17 +390,18 @@ void backend_handle_command() {
     start = MIN(start, LEDCount);
     end = MIN(end, LEDCount);
     if (start >= end) return;
+    invalidate_shown(start, end);
+    update_lut(backend_incoming_data_buffer[4],
+               backend_incoming_data_buffer[5],
+               backend_incoming_data_buffer[6],
+               backend_incoming_data_buffer[8]);
     if (command_type == CmdTypeRenderRGB) {
       for (int i = start; i < end; i++) {
         uint pos = (i - start) * 3 + 13;
         frame_buffer[i] = render_rgb(backend_incoming_data_buffer[pos],
                                      backend_incoming_data_buffer[pos + 1],
                                      backend_incoming_data_buffer[pos + 2],
-                                     backend_incoming_data_buffer[4],
-                                     backend_incoming_data_buffer[5],
-                                     backend_incoming_data_buffer[6],
-                                     backend_incoming_data_buffer[7],
-                                     backend_incoming_data_buffer[8]);
+                                     backend_incoming_data_buffer[7]);
       }
     } else if (command_type == CmdTypeRenderHSV) {
       for (int i = start; i < end; i++) {
@@ -252,15 +409,32 @@ void backend_handle_command() {
         frame_buffer[i] = render_hsv2rgb_rainbow(backend_incoming_data_buffer[pos],
                                                  backend_incoming_data_buffer[pos + 1],
                                                  backend_incoming_data_buffer[pos + 2],
-                                                 backend_incoming_data_buffer[4],
-                                                 backend_incoming_data_buffer[5],
-                                                 backend_incoming_data_buffer[6],
-                                                 backend_incoming_data_buffer[7],
-                                                 backend_incoming_data_buffer[8]);
+                                                 backend_incoming_data_buffer[7]);
       }
     }
   } else if (command_type == CmdTypeWriteLEDs) {
     backend_write_frame_buffer();
+    if (length >= WriteLEDsFrameSize) {
+      // Frames are acknowledged once every delta packet in them has arrived, so the host can
+      // encode later frames relative to them
+      uint8_t *data = backend_incoming_data_buffer;
+      uint16_t frame_id = data[5] << 8 | data[6];
+      uint16_t parts = data[7] << 8 | data[8];
+      uint slot = frame_id % DeltaHistoryFrames;
+      if (!delta_frame_valid[slot] && delta_frame_parts[slot] == parts && parts > 0 &&
+          delta_frame_ids[slot] == frame_id) {
+        delta_frame_valid[slot] = true;
+        send_reply(reply, CmdTypeAck, frame_id >> 8, frame_id & 0xff);
+      }
+    }
+  } else if (command_type == CmdTypeHello) {
+    send_reply(reply, CmdTypeHello, ProtocolVersion, DeltaHistoryFrames);
+  } else if (command_type == CmdTypeRenderDelta) {
+    render_delta(length);
+  } else if (command_type == CmdTypeFragment) {
+    receive_fragment(length);
+  } else if (command_type == CmdTypeCommit) {
+    if (commit_fragments()) backend_handle_command(reply);
   }
 }
 
@@ -280,5 +454,11 @@ void backend_init() {
     frame_buffer[i] = 0x00000000;
   }
 
+  for (uint i = 0; i < DeltaHistoryFrames; i++) {
+    delta_frame_valid[i] = false;
+    delta_frame_parts[i] = 0;
+  }
+  memset(fragments_received, 0, sizeof(fragments_received));
+
   backend_write_frame_buffer();
 }
@@ -7,14 +7,34 @@ enum CmdType {
     CmdTypeRenderRGB,
     CmdTypeRenderHSV,
     CmdTypeWriteLEDs,
+    CmdTypeHello,
+    CmdTypeRenderDelta,
+    CmdTypeAck,
+    CmdTypeFragment,
+    CmdTypeCommit,
     CmdTypeMax
 };
 
 #define PacketStartByte 0
 
+// Highest remote rendering protocol version supported, see ledcontrol/remoteprotocol.py
+#define ProtocolVersion 4
+// Number of received frames kept so changes can be applied to the frame they were encoded from
+#define DeltaHistoryFrames 4
+#define DeltaHeaderSize 18
+#define DeltaFlagHSV 0x01
+#define DeltaFlagKeyframe 0x02
+#define DeltaFlagContinue 0x04 // Packet adds a range to the frame started by an earlier packet
+#define WriteLEDsFrameSize 9 // Write LEDs command with a frame ID and number of delta packets
+#define FragmentHeaderSize 9
+#define MaxFragments 256
+
+// Sends a reply to the host the current command came from
+typedef void (*backend_reply_function)(const uint8_t *data, uint length);
+
 #define BackendIncomingDataBufferSize (LEDCount * 3 + 64)
 extern uint8_t backend_incoming_data_buffer[BackendIncomingDataBufferSize];
 
 void backend_write_frame_buffer();
-void backend_handle_command();
+void backend_handle_command(backend_reply_function reply);
 void backend_init();
@@ -5,3 +5,4 @@
 #define StripType SK6812_STRIP_GRBW // See definitions in ws2812b.h
 #define LEDPin 12 // RP2040 GPIO Pin
 #define LEDCount 144 // Number of LEDs
+#define Gamma 1.0f // Gamma correction exponent, 1.0 disables gamma correction (--led_gamma is not sent to remote targets)
@@ -12,6 +12,11 @@
 uint uart_packet_index = 0;
 uint uart_packet_length;
 
+void uart_reply(const uint8_t *data, uint length) {
+  for (uint i = 0; i < length; i++) putchar_raw(data[i]);
+  stdio_flush();
+}
+
 void handle_uart_input(char c) {
   backend_incoming_data_buffer[uart_packet_index] = c;
   if (uart_packet_index == 0 && c == PacketStartByte) {
@@ -36,7 +41,7 @@ void handle_uart_input(char c) {
     uart_packet_index++;
     if (uart_packet_index == uart_packet_length ||
         uart_packet_index == BackendIncomingDataBufferSize + 2) {
-      backend_handle_command();
+      backend_handle_command(uart_reply);
       uart_packet_index = 0;
     }
   } else {
@@ -16,12 +16,37 @@
 
 struct udp_pcb *pcb;
 
+// Address of the host that sent the packet being handled
+static const ip_addr_t *reply_addr;
+static unsigned short reply_port;
+
+static void udp_reply(const uint8_t *data, uint length) {
+  struct pbuf *p = pbuf_alloc(PBUF_TRANSPORT, length, PBUF_RAM);
+  if (p == NULL) return;
+  memcpy(p->payload, data, length);
+  udp_sendto(pcb, p, reply_addr, reply_port);
+  pbuf_free(p);
+}
+
 static void udp_receive(void *arg, struct udp_pcb *pcb, struct pbuf *p, const struct ip4_addr *addr, unsigned short port) {
   if(p == NULL) return;
 
-  uint8_t *req_data = (uint8_t *)p->payload;
-  memcpy(backend_incoming_data_buffer, req_data, MIN(p->len, BackendIncomingDataBufferSize));
-  backend_handle_command();
+  reply_addr = addr;
+  reply_port = port;
+
+  // A datagram can contain several commands, each starting with its length
+  // Large datagrams can be split across a chain of pbufs
+  uint offset = 0;
+  while (offset + 4 <= p->tot_len) {
+    uint8_t header[4];
+    pbuf_copy_partial(p, header, 4, offset);
+    uint length = header[2] << 8 | header[3];
+    if (header[0] != PacketStartByte || length < 4) break;
+    pbuf_copy_partial(p, backend_incoming_data_buffer,
+                      MIN(MIN(length, p->tot_len - offset), BackendIncomingDataBufferSize), offset);
+    backend_handle_command(udp_reply);
+    offset += length;
+  }
 
   pbuf_free(p);
 }
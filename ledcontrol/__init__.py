@@ -26,20 +26,65 @@ def main():
                         help='DMA channel for LEDs. DO NOT USE CHANNEL 5 ON Pi 3 B. Default: 10')
     parser.add_argument('--led_pixel_order', default='GRB',
                         help='LED color channel order. Any combination of RGB with or without a W at the end. Default: GRB, try GRBW for SK6812')
+    parser.add_argument('--led_gamma', type=float, default=1.0,
+                        help='Gamma correction exponent for LED output. 1.0 disables gamma correction, try 2.2 for perceptually even brightness. Only applies to local output, remote targets use the Gamma setting in their firmware config. Default: 1.0')
     parser.add_argument('--led_brightness_limit', type=float, default=1.0,
                         help='LED maximum brightness limit for the web UI. Float from 0.0-1.0. Default: 1.0')
     parser.add_argument('--save_interval', type=int, default=60,
                         help='Interval for automatically saving settings in seconds. Default: 60')
     parser.add_argument('--sacn', action='store_true',
                         help='Enable sACN / E1.31 support. Default: False')
+    parser.add_argument('--sacn_universe', type=int, default=1,
+                        help='First sACN universe to receive. Each universe contains 170 LEDs, starting from the first LED. Default: 1')
+    parser.add_argument('--sacn_universe_count', type=int, default=0,
+                        help='Number of consecutive sACN universes to receive. 0 receives enough universes for all LEDs. Default: 0')
+    parser.add_argument('--sacn_sync_universe', type=int, default=0,
+                        help='Only output sACN frames when a synchronization packet for this universe is received. 0 outputs frames when all universes have been received. Default: 0')
+    parser.add_argument('--sacn_render_on_arrival', action='store_true',
+                        help='Output sACN frames as soon as they are received, limited by --fps, instead of at the next scheduled frame. Default: False')
+    parser.add_argument('--timer_spin_us', type=int, default=0,
+                        help='Busy-wait for this many microseconds before each frame for more precise frame timing, at the cost of CPU usage. Default: 0')
+    parser.add_argument('--timer_no_frame_skip', action='store_true',
+                        help='Start the next frame immediately after a frame that took too long instead of skipping to the next scheduled frame. Default: False')
+    parser.add_argument('--timer_realtime_priority', type=int, default=0,
+                        help='Run the animation thread with this SCHED_FIFO realtime priority from 1-99, requires root. 0 disables realtime scheduling. Default: 0')
+    parser.add_argument('--timer_cpu', type=int, default=-1,
+                        help='Run the animation thread on this CPU core only. -1 allows any core. Default: -1')
     parser.add_argument('--hap', action='store_true',
                         help='Enable HomeKit Accessory Protocol support. Default: False')
     parser.add_argument('--no_timer_reset', action='store_true',
                         help='Do not reset the animation timer when patterns are changed. Default: False')
+    parser.add_argument('--wavetable_frames', type=int, default=0,
+                        help='Number of frames to precompute for patterns that repeat every time unit. 0 disables precomputing. Default: 0')
+    parser.add_argument('--wavetable_memory', type=int, default=32,
+                        help='Memory limit for precomputed frames, in MB. Default: 32')
+    parser.add_argument('--wavetable_uint8', action='store_true',
+                        help='Store precomputed frames as 8-bit values to save memory. Default: False')
+    parser.add_argument('--wavetable_no_interpolation', action='store_true',
+                        help='Do not interpolate between precomputed frames. Default: False')
+    parser.add_argument('--render_processes', type=int, default=0,
+                        help='Number of worker processes to render patterns in. 0 renders in the main process. Default: 0')
+    parser.add_argument('--pipeline_buffers', type=int, default=0,
+                        help='Number of frame buffers for rendering frames while previous frames are being output. 0 outputs frames in the animation thread. Default: 0')
+    parser.add_argument('--palette_size', type=int, default=1024,
+                        help='Number of colors in palette lookup tables, must be a power of 2. Larger tables give smoother gradients on large installations. Default: 1024')
+    parser.add_argument('--palette_memory', type=int, default=4,
+                        help='Memory limit for palette lookup tables, in MB. Tables for the least recently used palettes are discarded and calculated again when needed. Default: 4')
     parser.add_argument('--dev', action='store_true',
                         help='Development flag. Default: False')
     args = parser.parse_args()
 
+    if args.palette_size < 2 or args.palette_size & (args.palette_size - 1) != 0:
+        parser.error('--palette_size must be a power of 2')
+    if (args.sacn_universe < 1 or args.sacn_universe_count < 0
+            or args.sacn_universe + args.sacn_universe_count > 64000
+            or not 0 <= args.sacn_sync_universe < 64000):
+        parser.error('sACN universes must be from 1-63999')
+    if args.timer_spin_us < 0:
+        parser.error('--timer_spin_us must not be negative')
+    if not 0 <= args.timer_realtime_priority <= 99:
+        parser.error('--timer_realtime_priority must be from 0-99')
+
     app = create_app(args.led_count,
                      args.config_file,
                      args.pixel_mapping_json,
@@ -48,11 +93,28 @@ def main():
                      args.led_data_rate,
                      args.led_dma_channel,
                      args.led_pixel_order.upper(),
+                     args.led_gamma,
                      args.led_brightness_limit,
                      args.save_interval,
                      args.sacn,
+                     args.sacn_universe,
+                     args.sacn_universe_count,
+                     args.sacn_sync_universe,
+                     args.sacn_render_on_arrival,
+                     args.timer_spin_us / 1e6,
+                     not args.timer_no_frame_skip,
+                     args.timer_realtime_priority,
+                     args.timer_cpu if args.timer_cpu >= 0 else None,
                      args.hap,
                      args.no_timer_reset,
+                     args.wavetable_frames,
+                     args.wavetable_memory,
+                     args.wavetable_uint8,
+                     not args.wavetable_no_interpolation,
+                     args.render_processes,
+                     args.pipeline_buffers,
+                     args.palette_size,
+                     args.palette_memory,
                      args.dev)
 
     if args.dev:
@@ -6,15 +6,22 @@ import random
 import time
 import traceback
 import RestrictedPython
-import sacn
 import collections
-from itertools import zip_longest
+import numpy as np
+from threading import Lock
 from ledcontrol.intervaltimer import IntervalTimer
+from ledcontrol.wavetablecache import WavetableCache
+from ledcontrol.palettecache import PaletteCache
+from ledcontrol.renderpool import RenderPool
+from ledcontrol.sacnreceiver import LatencyHistogram, SACNReceiver
 
 import ledcontrol.ledcontroller as ledcontroller
 import ledcontrol.animationfunctions as animfunctions
 import ledcontrol.colorpalettes as colorpalettes
+import ledcontrol.vectorfunctions as vectorfunctions
+import ledcontrol.patterncompiler as patterncompiler
 import ledcontrol.driver as driver
+import ledcontrol.sacnreceiver as sacnreceiver
 import ledcontrol.utils as utils
 
 class AnimationController:
@@ -25,23 +32,68 @@ class AnimationController:
                  mapping_func,
                  enable_sacn,
                  no_timer_reset,
-                 global_brightness_limit):
+                 global_brightness_limit,
+                 wavetable_frames=0,
+                 wavetable_memory=32,
+                 wavetable_uint8=False,
+                 wavetable_interpolation=True,
+                 render_processes=0,
+                 palette_size=1024,
+                 palette_memory=4,
+                 sacn_universe=1,
+                 sacn_universe_count=0,
+                 sacn_sync_universe=0,
+                 sacn_render_on_arrival=False,
+                 timer_spin_time=0.0,
+                 timer_frame_skip=True,
+                 timer_realtime_priority=0,
+                 timer_cpu=None,
+                 native_rendering=None):
         self._led_controller = led_controller
         self._refresh_rate = refresh_rate
         self._led_count = led_count
         self._mapping_func = mapping_func
         self._enable_sacn = enable_sacn
+        self._sacn_render_on_arrival = enable_sacn and sacn_render_on_arrival
+        self._receiver = None
+        self._timer = None
+        self._timer_args = (timer_spin_time, timer_frame_skip, timer_realtime_priority, timer_cpu)
         self._no_timer_reset = no_timer_reset
         self._global_brightness_limit = global_brightness_limit
 
-        # Initialize prev state array
-        self._prev_state = [(0, 0, 0) for i in range(self._led_count)]
+        # Initialize prev state array, which also stores the colors of the current frame
+        # Arrays are allocated once and reused every frame
+        self._prev_state_array = np.zeros((self._led_count, 3), dtype=np.float32)
+        self._unique_state_array = np.zeros((self._led_count, 3), dtype=np.float32)
+        self._blank_array = np.zeros((self._led_count, 3), dtype=np.float32)
+        # Palette table indices for patterns that return palette_index
+        self._index_array = np.zeros(self._led_count, dtype=np.uint32)
+        self._unique_index_array = np.zeros(self._led_count, dtype=np.uint32)
 
         # Map led indices to normalized position vectors
         self._mapped = [self._mapping_func(i) for i in range(self._led_count)]
+        self._mapped_array = np.array(self._mapped, dtype=np.float64).reshape(-1, 3)
 
-        # Create dictionary of lists used to cache current mappings
+        # Create dictionaries of lists and arrays used to cache current mappings
         self._mappings = {}
+        self._mapping_arrays = {}
+        self._unique_x = {}
+
+        # Worker processes for rendering, created after everything else is initialized
+        self._render_pool = None
+
+        # Unmodified default patterns are rendered by the driver if it is available
+        if native_rendering is None:
+            native_rendering = driver.is_raspberrypi()
+        self._native_rendering = native_rendering
+
+        # Cache of precomputed frames for patterns that repeat every time unit
+        self._wavetables = None
+        if wavetable_frames > 0:
+            self._wavetables = WavetableCache(wavetable_frames,
+                                              wavetable_memory * 1024 * 1024,
+                                              np.uint8 if wavetable_uint8 else np.float32,
+                                              wavetable_interpolation)
 
         # All user-editable animation settings stored here
         self._settings = {
@@ -70,24 +122,32 @@ class AnimationController:
                     'speed': 0.2,
                     'scale': 1.0,
                     'palette': 0,
+                    'fps': 0,
                 }
             }
         }
 
-        # Dictionary for pattern functions
+        # Color palette used for animations
+        self._palette_table_size = palette_size
+        self._palettes = dict(colorpalettes.default)
+        # Lookup tables are calculated when palettes are selected, and kept for recently used
+        # palettes
+        self._palette_cache = PaletteCache(self._calculate_palette_array,
+                                           palette_memory * 1024 * 1024)
+        self._current_palette_table = []
+        self._current_palette_array = np.zeros((self._palette_table_size, 3), dtype=np.float32)
+        # Palette table in output colors for each group, for patterns that return palette_index
+        # Recalculated when the palette, color correction, saturation, or brightness changes
+        self._output_palette_tables = {}
+
+        # Dictionaries for pattern functions and information about how they are run
         self._functions = {}
+        self._function_info = {}
 
         # Initialize default pattern functions
         for k, v in animfunctions.default.items():
             self.set_pattern_function(k, v['source'])
 
-        # Color palette used for animations
-        self._palette_table_size = 1000
-        self._palettes = dict(colorpalettes.default)
-        self._palette_tables = {}
-        self._current_palette_table = []
-        self.calculate_palette_tables()
-
         # Set default color temp
         self.calculate_color_correction()
 
@@ -97,48 +157,104 @@ class AnimationController:
         # Prepare to start
         self.reset_timer()
         self._time = 0
-        self._update_needed = True # Is the LED state going to change this frame?
+        self._update_needed = True # Do all groups need to be rendered this frame?
+        # Time each animated group is rendered next, and time each group was last rendered
+        # Groups with an fps setting are rendered only when their time comes, others every frame
+        self._group_due = {}
+        self._group_last_render = {}
+        # Output is only sent from one thread at a time, and LEDs are cleared by the animation
+        # thread when group ranges or targets change
+        self._output_lock = Lock()
+        self._clear_needed = False
+        # Number of groups the LED controller keeps output lookup tables for
+        self._group_count = 0
+
+        if render_processes > 0:
+            self._render_pool = RenderPool(render_processes,
+                                           self._led_count,
+                                           self._mapped,
+                                           (wavetable_frames,
+                                            wavetable_memory,
+                                            wavetable_uint8,
+                                            wavetable_interpolation),
+                                           (palette_size,
+                                            palette_memory))
+            self._render_pool.set_group_settings(self._settings['groups'])
 
         # Initialize sACN / E1.31
         if enable_sacn:
-            self._sacn_buffer = [(0, 0, 0) for i in range(self._led_count)]
-            self._last_sacn_time = 0
-            self._sacn_perf_avg = 0
-            self._sacn_count = 0
+            # Universes are mapped to consecutive ranges of 170 LEDs, and DMX data is copied
+            # straight into one buffer that is output without conversion to floats
+            if sacn_universe_count <= 0:
+                sacn_universe_count = max(-(-self._led_count // sacnreceiver.leds_per_universe), 1)
+            self._sacn_receiver_args = (self._led_count, sacn_universe, sacn_universe_count,
+                                        sacn_sync_universe)
+            self._sacn_buffer = np.zeros((self._led_count, 3), dtype=np.uint8)
+            # Time from receiving the last packet of a frame until it has been output
+            self._sacn_latency = LatencyHistogram()
 
     # Computing cached values
 
+    def _calculate_palette_array(self, key):
+        'Calculate the palette lookup table for one palette'
+        colors = np.array(self._palettes[key]['colors'], dtype=np.float64).reshape(-1, 3)
+        sector_size = 1.0 / (len(colors) - 1)
+        f = np.arange(self._palette_table_size) / self._palette_table_size
+        sector = np.floor(f / sector_size).astype(np.int64)
+        f = (f % sector_size / sector_size).reshape(-1, 1)
+        c1, c2 = colors[sector], colors[sector + 1]
+        d = c2 - c1
+        # Allow full spectrum if extremes are 0 and 1 in any order
+        # otherwise pick shortest path between colors
+        h1 = d[:, 0]
+        shortest = np.abs(h1) != 1
+        h1[shortest & (h1 < -0.5)] += 1
+        h1[shortest & (h1 > 0.5)] -= 1
+        return (f * d + c1).astype(np.float32)
+
     def calculate_palette_table(self, key):
-        'Calculate and store the palette lookup table for one palette'
-        palette = self._palettes[key]
-        palette_table = []
-        sector_size = 1.0 / (len(palette['colors']) - 1)
-        for i in range(self._palette_table_size):
-            f = i / self._palette_table_size
-            sector = math.floor(f / sector_size)
-            f = f % sector_size / sector_size
-            c1, c2 = palette['colors'][sector], palette['colors'][sector + 1]
-            # Allow full spectrum if extremes are 0 and 1 in any order
-            # otherwise pick shortest path between colors
-            h1 = c2[0] - c1[0]
-            if abs(h1) != 1:
-                if h1 < -0.5:
-                    h1 += 1
-                if h1 > 0.5:
-                    h1 -= 1
-            palette_table.append((
-                f * h1 + c1[0],
-                f * (c2[1] - c1[1]) + c1[1],
-                f * (c2[2] - c1[2]) + c1[2],
-            ))
-        self._palette_tables[key] = palette_table
-        self._update_needed = True
+        'Recalculate the palette lookup table for one palette after it is changed'
+        self._palette_cache.invalidate(key)
+        if self._wavetables is not None:
+            self._wavetables.invalidate(1, key)
+        if self._render_pool is not None:
+            self._render_pool.set_palette(key, self._palettes[key])
+        if any(settings['palette'] == key for settings in self._settings['groups'].values()):
+            self._palette_cache.prewarm([key])
+        self._request_update()
 
     def calculate_palette_tables(self):
-        'Calculate and store the palette lookup tables for all palettes'
+        'Recalculate the palette lookup tables for all palettes'
         for key in self._palettes:
             self.calculate_palette_table(key)
 
+    def prewarm_palettes(self, keys):
+        'Calculate palette lookup tables in the background before the palettes are used'
+        self._palette_cache.prewarm(keys)
+
+    def get_palette_array(self, key):
+        'Get the palette lookup table for vectorized patterns, calculated when first needed'
+        return self._palette_cache.get_array(key)
+
+    def get_palette_table(self, key):
+        'Get the palette lookup table for per-pixel patterns, calculated when first needed'
+        # Per-pixel patterns index a list of tuples, which is faster than indexing an array
+        return self._palette_cache.get_table(key)
+
+    def get_output_palette_table(self, group, palette_array, saturation, brightness):
+        '''
+        Get the palette lookup table of a group converted to output colors
+        Returns None if palette tables are not supported
+        '''
+        entry = self._output_palette_tables.get(group)
+        if (entry is None or entry[0] is not palette_array
+            or entry[1:4] != (self._correction, saturation, brightness)):
+            table = self._led_controller.render_palette_table(palette_array, self._correction,
+                                                              saturation, brightness)
+            entry = (palette_array, self._correction, saturation, brightness, table)
+            self._output_palette_tables[group] = entry
+        return entry[4]
+
     def calculate_color_correction(self):
         'Calculate and store color temperature correction'
         rgb = driver.blackbody_to_rgb(self._settings['global_color_temp'])
@@ -160,9 +276,37 @@ class AnimationController:
                     (self._mapped[i][1] / scale) % 1,
                     (self._mapped[i][2] / scale) % 1
                 ) for i in range(self._led_count)]
+                self._mapping_arrays[group] = (self._mapped_array / scale) % 1
 
             else:
                 self._mappings[group] = [(0, 0, 0) for i in range(self._led_count)]
+                self._mapping_arrays[group] = np.zeros((self._led_count, 3), dtype=np.float64)
+        self._unique_x = {}
+        if self._wavetables is not None:
+            self._wavetables.clear()
+
+    def set_state_array(self, array):
+        'Use an existing array of shape (led_count, 3) to store the previous LED states'
+        self._prev_state_array = array
+
+    def get_mapping_array(self, group):
+        'Get the scaled positions of all LEDs for a group as an array of shape (led_count, 3)'
+        return self._mapping_arrays[group]
+
+    def get_unique_x(self, group, range_start, range_end):
+        '''
+        Get indices of LEDs with distinct x positions in a group, the index of the distinct
+        value for every LED, and the distinct positions, or None if all positions are distinct
+        '''
+        key = (group, range_start, range_end)
+        if key not in self._unique_x:
+            xyz = self._mapping_arrays[group][range_start:range_end]
+            _, index, inverse = np.unique(xyz[:, 0], return_index=True, return_inverse=True)
+            if len(index) < len(xyz):
+                self._unique_x[key] = (index, inverse.reshape(-1), xyz[index])
+            else:
+                self._unique_x[key] = None
+        return self._unique_x[key]
 
     # Settings frontend
 
@@ -191,21 +335,23 @@ class AnimationController:
                     d1[k] = min(d1[k], self._global_brightness_limit)
                 elif k == 'scale':
                     self._flag_mapping = True
+                elif k == 'palette':
+                    self._palette_cache.prewarm([v])
                 elif k == 'function':
-                    if v not in self._functions: # for uncompiled functions
-                        self._functions[v] = animfunctions.blank
+                    self._check_function(v)
                     self._check_reset_animation_state()
                 elif k in ['range_start', 'range_end']:
                     self._flag_clear = True # clear LEDs to make range selection less ambiguous
                 elif k in ['render_mode', 'render_target']:
                     self._flag_clear = True
                 elif k == 'sacn' and self._enable_sacn:
+                    if self._receiver is not None:
+                        self._receiver.stop()
+                        self._receiver = None
                     if v:
-                        self._receiver = sacn.sACNreceiver()
-                        self._receiver.listen_on('universe', universe=1)(self._sacn_callback)
+                        self._receiver = SACNReceiver(*self._sacn_receiver_args,
+                                                      on_frame=self._trigger_frame)
                         self._receiver.start()
-                    elif hasattr(self, '_receiver'):
-                        self._receiver.stop()
 
             return d1
 
@@ -215,27 +361,117 @@ class AnimationController:
         if self._flag_mapping:
             self.calculate_mapping()
         if self._flag_clear:
-            self.clear_leds()
-        self._update_needed = True
+            self._clear_needed = True
+        if self._render_pool is not None:
+            self._render_pool.set_group_settings(self._settings['groups'])
+        self._request_update()
+
+    def set_group_settings(self, groups):
+        'Replace all group settings without clearing LEDs, used by render worker processes'
+        scales = [(k, v['scale']) for k, v in self._settings['groups'].items()]
+        self._settings['groups'] = groups
+        for settings in groups.values():
+            self._check_function(settings['function'])
+        if scales != [(k, v['scale']) for k, v in groups.items()]:
+            self.calculate_mapping()
+        self._request_update()
 
     def delete_group(self, key):
         'Delete a group'
         if key != 'main':
             del self._settings['groups'][key]
+            if self._render_pool is not None:
+                self._render_pool.set_group_settings(self._settings['groups'])
 
     # Functions frontend
 
     def set_pattern_function(self, key, source):
         'Update and recompile a pattern function'
+        restricted_globals = self._pattern_globals()
+        restricted_locals = {}
+        arg_names = ['t', 'dt', 'x', 'y', 'z', 'prev_state']
+
+        result = RestrictedPython.compile_restricted_exec(source)
+        if result.code:
+            exec(result.code, restricted_globals, restricted_locals)
+
+        # Vectorized patterns look up array versions of the utility functions at call time
+        vectorized = 'pattern_vectorized' in restricted_locals
+        if vectorized:
+            restricted_globals.update(self._vectorized_globals())
+
+        warnings = list(result.warnings)
+        for name in result.used_names:
+            if name not in restricted_globals and name not in arg_names:
+                warnings.append(f'NameError: name \'{name}\' is not defined')
+
+        # Determine which inputs the pattern reads to skip unnecessary work when rendering
+        analysis = patterncompiler.analyze(source)
+        native = (key in animfunctions.native_function_ids
+                  and source == animfunctions.default[key]['source'])
+
+        if len(result.errors) == 0 and vectorized:
+            self._functions[key] = restricted_locals['pattern_vectorized']
+            self._function_info[key] = {'path': 'vectorized', 'vectorized': True, **analysis,
+                                        'periodic': self._check_periodic(result.code, analysis),
+                                        'native': native}
+            self._check_reset_animation_state()
+        elif len(result.errors) == 0 and 'pattern' in restricted_locals:
+            # Run per-pixel patterns as vectorized patterns if they can be translated
+            code, reason = self._translate_pattern(source, 'random' in result.used_names)
+            if code is not None:
+                restricted_globals = self._pattern_globals()
+                restricted_globals.update(self._vectorized_globals())
+                restricted_locals = {}
+                exec(code, restricted_globals, restricted_locals)
+                self._functions[key] = restricted_locals['pattern_vectorized']
+                self._function_info[key] = {'path': 'translated', 'vectorized': True, **analysis,
+                                            'periodic': self._check_periodic(code, analysis),
+                                            'native': False}
+            else:
+                self._functions[key] = restricted_locals['pattern']
+                self._function_info[key] = {'path': 'scalar', 'vectorized': False, **analysis,
+                                            'periodic': False, 'native': False}
+                warnings.append(f'Pattern will not be vectorized: {reason}')
+            self._check_reset_animation_state()
+
+        if self._wavetables is not None:
+            self._wavetables.invalidate(0, key)
+
+        if self._render_pool is not None:
+            self._render_pool.set_pattern_function(key, source)
+        self._request_update()
+        return result.errors, warnings
+
+    def _check_function(self, key):
+        'Use a blank pattern for functions that have not been compiled'
+        if key not in self._functions:
+            self._functions[key] = animfunctions.blank
+            self._function_info[key] = {'path': 'scalar', 'vectorized': False,
+                                        **patterncompiler.analyze(''), 'periodic': False,
+                                        'native': False}
+
+    def _is_native(self, settings):
+        'Check if a group runs a pattern that is rendered by the driver'
+        return (self._native_rendering
+                and settings['render_mode'] == ledcontroller.TargetMode.local
+                and self._function_info.get(settings['function'], {}).get('native', False))
+
+    def get_pattern_info(self, key):
+        'Get information about how a compiled pattern function is run'
+        return self._function_info.get(key, {})
+
+    def _pattern_globals(self):
+        'Create the globals dict for a pattern function'
         def getitem(obj, index):
-            if obj is not None and type(obj) in (list, tuple, dict):
+            if obj is not None and type(obj) in (list, tuple, dict, np.ndarray):
                 return obj[index]
             raise Exception()
 
         def getiter(obj):
             return obj
 
-        restricted_globals = {
+        return {
             '__builtins__': RestrictedPython.Guards.safe_builtins,
             '_print_': RestrictedPython.PrintCollector,
             '_getattr_': RestrictedPython.Guards.safer_getattr,
@@ -248,6 +484,7 @@ class AnimationController:
             'palette_mirrored': self._get_palette_color_mirrored,
             'hsv': animfunctions.ColorMode.hsv,
             'rgb': animfunctions.ColorMode.rgb,
+            'palette_index': animfunctions.ColorMode.palette_index,
             'clamp': utils.clamp,
             'wave_pulse': driver.wave_pulse,
             'wave_triangle': driver.wave_triangle,
@@ -262,24 +499,156 @@ class AnimationController:
             'blackbody_to_rgb': driver.blackbody_to_rgb,
             'blackbody_correction_rgb': driver.blackbody_correction_rgb,
         }
-        restricted_locals = {}
-        arg_names = ['t', 'dt', 'x', 'y', 'z', 'prev_state']
 
-        result = RestrictedPython.compile_restricted_exec(source)
-        warnings = list(result.warnings)
-        for name in result.used_names:
-            if name not in restricted_globals and name not in arg_names:
-                warnings.append(f'NameError: name \'{name}\' is not defined')
+    def _vectorized_globals(self):
+        'Globals that replace the scalar utility functions for vectorized patterns'
+        return {
+            'math': vectorfunctions.math,
+            'random': vectorfunctions.random,
+            'where': np.where,
+            'logical_and': np.logical_and,
+            'logical_or': np.logical_or,
+            'logical_not': np.logical_not,
+            'palette': self._get_palette_color_vectorized,
+            'palette_mirrored': self._get_palette_color_mirrored_vectorized,
+            'clamp': vectorfunctions.clamp,
+            'wave_pulse': vectorfunctions.wave_pulse,
+            'wave_triangle': vectorfunctions.wave_triangle,
+            'wave_sine': vectorfunctions.wave_sine,
+            'wave_cubic': vectorfunctions.wave_cubic,
+            'plasma_sines': vectorfunctions.plasma_sines,
+            'plasma_sines_octave': vectorfunctions.plasma_sines_octave,
+            'perlin_noise_3d': vectorfunctions.perlin_noise_3d,
+            'fbm_noise_3d': vectorfunctions.fbm_noise_3d,
+            'impulse_exp': vectorfunctions.impulse_exp,
+            'fract': vectorfunctions.fract,
+        }
 
-        if result.code:
-            exec(result.code, restricted_globals, restricted_locals)
+    def _test_globals(self, table):
+        '''
+        Create globals dicts for per-pixel and vectorized pattern functions that use a test palette
+        The per-pixel function uses the NumPy utility functions here so the results are identical
+        '''
+        table_array = np.array(table)
+        size = len(table)
+        vectorized_globals = self._pattern_globals()
+        vectorized_globals.update(self._vectorized_globals())
+        vectorized_globals.update({
+            'palette': lambda t: table_array[vectorfunctions.palette_index(t, size)],
+            'palette_mirrored':
+                lambda t: table_array[vectorfunctions.palette_index_mirrored(t, size)],
+        })
+        scalar_globals = self._pattern_globals()
+        for k in scalar_globals:
+            if k not in ('math', 'random') and k in vectorized_globals:
+                scalar_globals[k] = vectorized_globals[k]
+        scalar_globals.update({
+            'palette': lambda t: table[vectorfunctions.palette_index(t, size)],
+            'palette_mirrored': lambda t: table[vectorfunctions.palette_index_mirrored(t, size)],
+        })
+        return scalar_globals, vectorized_globals
+
+    def _translate_pattern(self, source, uses_random):
+        'Translate a per-pixel pattern function to vectorized form, returns (code, reason)'
+        try:
+            tree = patterncompiler.vectorize(source)
+        except patterncompiler.UnsupportedPattern as e:
+            return None, str(e)
 
-        if len(result.errors) == 0 and 'pattern' in restricted_locals:
-            self._functions[key] = restricted_locals['pattern']
-            self._check_reset_animation_state()
+        result = RestrictedPython.compile_restricted_exec(tree)
+        if len(result.errors) > 0:
+            return None, ', '.join(result.errors)
 
-        self._update_needed = True
-        return result.errors, warnings
+        # Check that both functions give the same results with a test palette
+        size = self._palette_table_size
+        table = [(i / size, 1 - i / size, i * 0.618034 % 1) for i in range(size)]
+        scalar_globals, vectorized_globals = self._test_globals(table)
+
+        try:
+            scalar_locals, vectorized_locals = {}, {}
+            exec(RestrictedPython.compile_restricted_exec(source).code,
+                 scalar_globals, scalar_locals)
+            exec(result.code, vectorized_globals, vectorized_locals)
+            if not self._compare_patterns(scalar_locals['pattern'],
+                                          vectorized_locals['pattern_vectorized'],
+                                          uses_random):
+                return None, 'translated pattern gives different results'
+        except Exception as e:
+            return None, f'translated pattern failed with {type(e).__name__}'
+
+        return result.code, ''
+
+    def _compare_patterns(self, scalar_function, vectorized_function, uses_random):
+        'Check if a per-pixel and a vectorized pattern function give the same results'
+        rng = np.random.default_rng(0)
+        count = 32
+        x, y, z = rng.random((3, count))
+        prev_state = rng.random((count, 3))
+        compared = False
+        for t in (0.0, 0.37, 123.45):
+            with np.errstate(all='ignore'):
+                c, mode = vectorized_function(t, 0.016, x, y, z, prev_state)
+            colors = self._broadcast_result(c, mode, count)
+            for i in range(count):
+                try:
+                    c, mode_i = scalar_function(t, 0.016, x[i].item(), y[i].item(), z[i].item(),
+                                                tuple(prev_state[i].tolist()))
+                except Exception:
+                    continue # Only compare values where the per-pixel function succeeds
+                if mode_i != mode:
+                    return False
+                if not uses_random and not np.allclose(c, colors[i], rtol=1e-5, atol=1e-5):
+                    return False
+                compared = True
+        return compared
+
+    def _broadcast_result(self, c, mode, count):
+        'Convert the result of a vectorized pattern to an array of colors or palette indices'
+        if mode == animfunctions.ColorMode.palette_index:
+            return vectorfunctions.broadcast_values(c, count)
+        return vectorfunctions.broadcast_colors(c, count)
+
+    def _check_periodic(self, code, analysis):
+        'Check if a compiled vectorized pattern repeats every time unit'
+        if (self._wavetables is None or not analysis['deterministic'] or not analysis['uses_t']
+            or analysis['uses_dt'] or analysis['uses_prev_state']):
+            return False
+
+        # Use a smooth test palette so palette indices that differ by one give similar colors
+        size = self._palette_table_size
+        table = [(i / size,
+                  0.5 + 0.5 * math.cos(2 * math.pi * i / size),
+                  0.5 + 0.5 * math.sin(2 * math.pi * i / size)) for i in range(size)]
+        _, vectorized_globals = self._test_globals(table)
+
+        rng = np.random.default_rng(0)
+        count = 64
+        x, y, z = rng.random((3, count))
+        prev_state = np.zeros((count, 3))
+        try:
+            vectorized_locals = {}
+            exec(code, vectorized_globals, vectorized_locals)
+            function = vectorized_locals['pattern_vectorized']
+            errors = []
+            for t in (0.13, 0.5, 0.77):
+                with np.errstate(all='ignore'):
+                    c, mode = function(t, 0.0, x, y, z, prev_state)
+                    a = self._broadcast_result(c, mode, count)
+                    for period in (1, 7):
+                        c, mode_1 = function(t + period, 0.0, x, y, z, prev_state)
+                        if mode_1 != mode:
+                            return False
+                        d = np.abs(self._broadcast_result(c, mode, count) - a)
+                        if mode == animfunctions.ColorMode.hsv:
+                            d[:, 0] = np.abs(d[:, 0] - np.round(d[:, 0])) # Hue wraps around
+                        elif mode == animfunctions.ColorMode.palette_index:
+                            d = np.abs(d - np.round(d)) # Palette indices wrap around
+                        errors.append(d)
+        except Exception:
+            return False
+
+        # Allow a few values to differ where quantization steps fall between samples
+        return np.mean(np.concatenate(errors) < 0.01) > 0.99
 
     # Palettes frontend
 
@@ -290,34 +659,94 @@ class AnimationController:
     def set_palette(self, key, value):
         'Update palette'
         self._palettes[key] = value
+        self._request_update()
 
     def delete_palette(self, key):
         'Delete palette'
         del self._palettes[key]
+        self._palette_cache.invalidate(key)
 
     # Palettes backend
 
     def _get_palette_color(self, t):
         'Get color from current palette corresponding to index between 0 and 1'
+        if isinstance(t, np.ndarray):
+            return self._get_palette_color_vectorized(t)
         # This gives a surprising performance improvement over doing the math in python
-        # If the palette size is ever changed here, it needs to be changed in animation_utils.h
-        return self._current_palette_table[driver.float_to_int_1000(t)]
+        return self._current_palette_table[driver.palette_index(t, self._palette_table_size)]
 
     def _get_palette_color_mirrored(self, t):
         'Version of get_palette_color that samples a mirrored version of the palette'
-        return self._current_palette_table[driver.float_to_int_1000_mirror(t)]
+        if isinstance(t, np.ndarray):
+            return self._get_palette_color_mirrored_vectorized(t)
+        index = driver.palette_index_mirrored(t, self._palette_table_size)
+        return self._current_palette_table[index]
+
+    def _get_palette_color_vectorized(self, t):
+        'Version of get_palette_color that returns an array of colors for an array of indices'
+        return np.take(self._current_palette_array,
+                       vectorfunctions.palette_index(t, self._palette_table_size), axis=0)
+
+    def _get_palette_color_mirrored_vectorized(self, t):
+        'Version of get_palette_color_mirrored that returns an array of colors'
+        return np.take(self._current_palette_array,
+                       vectorfunctions.palette_index_mirrored(t, self._palette_table_size), axis=0)
 
     # Animation and timer
 
     def begin_animation_thread(self):
         'Start animating'
-        self._timer = IntervalTimer(1.0 / self._refresh_rate, self.update_leds)
+        self._timer = IntervalTimer(1.0 / self._refresh_rate, self.update_leds, *self._timer_args)
+        self._timer.set_next_run_check(self._get_next_run)
         self._timer.start()
 
+    def set_timer(self, timer):
+        '''
+        Use a timer that was created elsewhere instead of starting the animation thread
+        update_leds is then called by the owner of the timer, used for benchmarks
+        '''
+        self._timer = timer
+
+    def _get_next_run(self):
+        '''
+        Returns the timer time the next frame needs to be rendered, so the animation thread can
+        sleep until then instead of waking up every frame. This is the time the next group is
+        due, or math.inf if nothing can change until settings are changed or an sACN frame arrives
+        '''
+        if self._settings['sacn'] != 0:
+            return math.inf if self._sacn_render_on_arrival else 0
+        if self._update_needed or self._settings['calibration'] != 0:
+            return 0
+        return self._start + min(self._group_due.values(), default=math.inf)
+
+    def _trigger_frame(self):
+        'Wake the animation thread if it is idle'
+        if self._timer is not None:
+            self._timer.trigger()
+
+    def _request_update(self):
+        'Render the next frame, waking the animation thread if it is idle'
+        self._update_needed = True
+        self._trigger_frame()
+
     def get_frame_rate(self):
         'Get frame rate'
         return self._timer.get_rate()
 
+    def get_frame_stats(self):
+        'Get frame count, scheduling latency, execution time, and jitter statistics'
+        return self._timer.get_stats()
+
+    def get_sacn_stats(self):
+        'Get numbers of sACN packets and frames received and output latency statistics'
+        if not self._enable_sacn:
+            return {}
+        return {
+            'packets': self._receiver.packet_count if self._receiver else 0,
+            'frames': self._receiver.frame_count if self._receiver else 0,
+            'latency': self._sacn_latency.get_stats(),
+        }
+
     def _check_reset_animation_state(self):
         'Reset animation timer if allowed by configuration flag'
         if not self._no_timer_reset:
@@ -326,15 +755,146 @@ class AnimationController:
     def reset_timer(self):
         'Reset animation timer'
         self._start = time.perf_counter()
+        self._request_update() # Times groups are rendered next are relative to the old start
+
+    def reset_animation_state(self, start):
+        'Reset animation timer to a timer time and clear the previous state of all LEDs'
+        self._start = start
+        self._time = 0
+        self._prev_state_array[:] = 0
+        self._request_update()
+
+    def render_group(self, group, time_1, delta_t_1, range_start, range_end):
+        '''
+        Run the pattern for a range of LEDs in a group, returns colors and color mode
+        If the mode is palette_index, the colors are the palette colors and the palette table
+        indices are stored in the index array
+        '''
+        settings = self._settings['groups'][group]
+        mapping = self._mappings[group]
+        mapping_array = self._mapping_arrays[group]
+        function_1 = self._functions[settings['function']]
+        function_info = self._function_info[settings['function']]
+        self._current_palette_array = self.get_palette_array(settings['palette'])
+        if not function_info['vectorized']:
+            self._current_palette_table = self.get_palette_table(settings['palette'])
+
+        # Colors are written into the prev state array, which is returned
+        frame = self._prev_state_array[range_start:range_end]
+
+        # Patterns that only depend on x only need to run once for each distinct x
+        # Colors are written into another array and then copied to every LED
+        unique_x = None
+        if function_info['one_dimensional']:
+            unique_x = self.get_unique_x(group, range_start, range_end)
+        if unique_x is not None:
+            index, inverse, xyz = unique_x
+            out = self._unique_state_array[:len(index)]
+            indices = self._unique_index_array[:len(index)]
+        else:
+            xyz = mapping_array[range_start:range_end]
+            out = frame
+            indices = self._index_array[range_start:range_end]
+
+        if function_info['vectorized']:
+            # Run pattern once for the whole group
+            # Patterns that only depend on x do not read prev_state
+            prev_state = frame if unique_x is None else out
+
+            def render(t):
+                # Translated patterns evaluate both sides of conditions, ignore errors there
+                with np.errstate(all='ignore'):
+                    c, mode = function_1(t,
+                                         delta_t_1,
+                                         xyz[:, 0],
+                                         xyz[:, 1],
+                                         xyz[:, 2],
+                                         prev_state)
+                if mode == animfunctions.ColorMode.palette_index:
+                    self._render_palette_indices(vectorfunctions.broadcast_values(c, len(xyz)),
+                                                 out, indices)
+                    return out, mode
+                return vectorfunctions.broadcast_colors(c, len(xyz), out), mode
+
+            # Look up periodic patterns in a wavetable instead if possible
+            wavetable = None
+            if function_info['periodic']:
+                wavetable = self._wavetables.get((settings['function'],
+                                                  settings['palette'],
+                                                  settings['scale'],
+                                                  range_start,
+                                                  range_end),
+                                                 len(xyz))
+            if wavetable is not None:
+                # Wavetables store palette colors, not indices
+                def render_colors(t):
+                    c, mode = render(t)
+                    if mode == animfunctions.ColorMode.palette_index:
+                        mode = animfunctions.ColorMode.hsv
+                    return c, mode
+                _, mode = wavetable.lookup(time_1, render_colors, out)
+            else:
+                _, mode = render(time_1)
 
-    def update_leds(self):
-        'Determine time, render frame, and display'
+        else:
+            # Determine current pattern mode
+            if function_info['mode'] is not None:
+                mode = animfunctions.ColorMode[function_info['mode']]
+            else:
+                c, mode = function_1(0, 0.1, 0, 0, 0, (0, 0, 0))
+
+            # Run pattern to determine color
+            if unique_x is not None:
+                values = [function_1(time_1,
+                                     delta_t_1,
+                                     mapping[i][0],
+                                     mapping[i][1],
+                                     mapping[i][2],
+                                     (0, 0, 0))[0]
+                          for i in (index + range_start).tolist()]
+            else:
+                prev_state = frame.tolist()
+                values = [function_1(time_1,
+                                     delta_t_1,
+                                     mapping[i][0],
+                                     mapping[i][1],
+                                     mapping[i][2],
+                                     prev_state[i - range_start])[0]
+                          for i in range(range_start, range_end)]
+            if mode == animfunctions.ColorMode.palette_index:
+                self._render_palette_indices(np.array(values, dtype=np.float64), out, indices)
+            else:
+                out[:] = values
+
+        if unique_x is not None:
+            np.take(out, inverse, axis=0, out=frame)
+            if mode == animfunctions.ColorMode.palette_index:
+                np.take(indices, inverse, out=self._index_array[range_start:range_end])
+        return frame, mode
+
+    def _render_palette_indices(self, values, out, indices):
+        'Convert palette positions to palette table indices and write the palette colors into out'
+        indices[:] = vectorfunctions.palette_index(values, self._palette_table_size)
+        np.take(self._current_palette_array, indices, axis=0, out=out)
+
+    def update_leds(self, render_all=False):
+        'Determine time, render frame, and display, rendering every group if render_all is set'
+        with self._output_lock:
+            if render_all:
+                self._update_needed = True
+            self._update_leds()
+
+    def _update_leds(self):
         last_t = self._time
         self._time = self._timer.last_start - self._start
         delta_t = self._time - last_t
 
         if self._timer.get_count() % 100 == 0:
             print(f'Execution time: {self._timer.get_perf_avg():0.5f}s, {self._timer.get_rate():05.1f} FPS')
+            if self._settings['sacn'] != 0 and self._enable_sacn:
+                latency = self._sacn_latency.get_stats()
+                print(f'sACN latency: p50 {latency["p50_ms"]:0.2f}ms, '
+                      f'p99 {latency["p99_ms"]:0.2f}ms')
 
         if self._settings['calibration'] == 1:
             for group, settings in list(self._settings['groups'].items()):
@@ -350,61 +910,139 @@ class AnimationController:
 
             return
 
-        if self._update_needed:
-            self._update_needed = False
-            # Store dict keys as list in case they are changed during iteration
-            for group, settings in list(self._settings['groups'].items()):
+        # The latest complete sACN frame is copied into the buffer that is output
+        sacn_frame_time = None
+        if self._settings['sacn'] != 0 and self._receiver is not None:
+            sacn_frame_time = self._receiver.get_frame(self._sacn_buffer)
+
+        # Flags are cleared before rendering, so changes made during this frame are not lost
+        render_all = self._update_needed or self._clear_needed or sacn_frame_time is not None
+        self._update_needed = False
+
+        # Clear LEDs to make range selection less ambiguous, groups are rendered over them
+        if self._clear_needed:
+            self._clear_needed = False
+            self._set_blank()
+
+        # Render all groups when something changed, otherwise only the groups that are due
+        # Groups that are not rendered keep their colors from the last frame they were rendered
+        # Store dict items as list in case they are changed during iteration
+        groups = list(self._settings['groups'].items())
+        if len(groups) != self._group_count:
+            self._group_count = len(groups)
+            self._led_controller.set_group_count(self._group_count)
+        for group in set(self._group_due) - {group for group, settings in groups}: # Deleted groups
+            del self._group_due[group]
+            self._group_last_render.pop(group, None)
+        if not render_all:
+            groups = [(group, settings) for group, settings in groups
+                      if self._group_due.get(group, math.inf) <= self._time]
+
+        if groups:
+            # Reset time every week to prevent strange math issues
+            time_fix = self._time % 604800
+            # Delta time is the time since each group was last rendered
+            group_delta_t = {group: self._time - self._group_last_render.get(group, last_t)
+                             for group, settings in groups}
+            for group, settings in groups:
+                self._group_last_render[group] = self._time
+            # Ranges are read once, settings can be changed by other threads during the frame
+            group_ranges = {group: (settings['range_start'],
+                                    min(self._led_count, settings['range_end']))
+                            for group, settings in groups}
+
+            # Render all groups in worker processes at the same time if enabled
+            if self._render_pool is not None and self._settings['sacn'] == 0:
                 try:
-                    mapping = self._mappings[group]
-                    range_start = settings['range_start']
-                    range_end = min(self._led_count, settings['range_end'])
-
-                    # Begin render
-                    self._current_palette_table = self._palette_tables[settings['palette']]
+                    self._render_pool.render([(group,
+                                               time_fix * settings['speed'],
+                                               group_delta_t[group] * settings['speed'],
+                                               *group_ranges[group])
+                                              for group, settings in groups
+                                              if not self._is_native(settings)])
+                except (EOFError, OSError) as e:
+                    # A worker process crashed or was killed, render in this process from now on
+                    print(f'Render worker process failed, rendering in the main process: {e!r}')
+                    self._render_pool.terminate()
+                    self._render_pool = None
+
+            for group, settings in groups:
+                try:
+                    # Raises KeyError if cached values for the group haven't been calculated
+                    self._mappings[group]
+                    palette_array = self.get_palette_array(settings['palette'])
+                    range_start, range_end = group_ranges[group]
                     computed_brightness = self._settings['on'] * self._settings['global_brightness'] * settings['brightness']
                     computed_saturation = self._settings['global_saturation'] * settings['saturation']
-                    function_1 = self._functions[settings['function']]
+                    function_info = self._function_info[settings['function']]
 
                     # Calculate times
-                    # Reset time every week to prevent strange math issues
-                    time_fix = self._time % 604800
                     # time component = time (s) * speed (cycle/s)
                     time_1 = time_fix * settings['speed']
-                    delta_t_1 = delta_t * settings['speed']
+                    delta_t_1 = group_delta_t[group] * settings['speed']
 
                 except KeyError as e: # Ignore if settings haven't been calculated yet
                     continue
 
                 try:
-                    if self._settings['sacn'] == 0:
-                        # Determine current pattern mode
-                        c, mode = function_1(0, 0.1, 0, 0, 0, (0, 0, 0))
-
-                        # Run pattern to determine color
-                        state = [function_1(time_1,
-                                            delta_t_1,
-                                            mapping[i][0],
-                                            mapping[i][1],
-                                            mapping[i][2],
-                                            self._prev_state[i])[0]
-                                for i in range(range_start, range_end)]
-                        self._prev_state[range_start:range_end] = state
-
-                        self._led_controller.set_range(
-                            state,
+                    if self._settings['sacn'] == 0 and self._is_native(settings):
+                        self._led_controller.render_default_pattern(
+                            settings['function'],
+                            self._mapping_arrays[group][range_start:range_end],
+                            palette_array,
                             range_start,
                             range_end,
+                            time_1,
                             self._correction,
                             computed_saturation,
-                            computed_brightness,
-                            mode,
-                            settings['render_mode'],
-                            settings['render_target']
+                            computed_brightness
                         )
 
+                    elif self._settings['sacn'] == 0:
+                        if self._render_pool is not None:
+                            state, mode = self._render_pool.get_result(group)
+                        else:
+                            state, mode = self.render_group(group,
+                                                            time_1,
+                                                            delta_t_1,
+                                                            range_start,
+                                                            range_end)
+
+                        # Patterns that return palette indices are output with a pre-rendered
+                        # table if possible
+                        table = None
+                        if mode == animfunctions.ColorMode.palette_index:
+                            mode = animfunctions.ColorMode.hsv
+                            if (self._render_pool is None
+                                and settings['render_mode'] == ledcontroller.TargetMode.local):
+                                table = self.get_output_palette_table(group,
+                                                                      palette_array,
+                                                                      computed_saturation,
+                                                                      computed_brightness)
+
+                        if table is not None:
+                            self._led_controller.set_range_indexed(
+                                self._index_array[range_start:range_end],
+                                table,
+                                range_start,
+                                range_end
+                            )
+                        else:
+                            self._led_controller.set_range(
+                                state,
+                                range_start,
+                                range_end,
+                                self._correction,
+                                computed_saturation,
+                                computed_brightness,
+                                mode,
+                                settings['render_mode'],
+                                settings['render_target']
+                            )
+
                     else:
                         self._led_controller.set_range(
-                            [self._sacn_buffer[i] for i in range(range_start, range_end)],
+                            self._sacn_buffer[range_start:range_end],
                             range_start,
                             range_end,
                             self._correction,
@@ -418,9 +1056,10 @@ class AnimationController:
                 except Exception as e:
                     msg = traceback.format_exception(type(e), e, e.__traceback__)
                     print(f'Error during animation execution: {msg}')
-                    r = 0.1 * driver.wave_pulse(time_fix, 0.5)
+                    error_state = self._prev_state_array[range_start:range_end]
+                    error_state[:] = (0.1 * driver.wave_pulse(time_fix, 0.5), 0, 0)
                     self._led_controller.set_range(
-                        [(r, 0, 0) for i in range(range_end - range_start)],
+                        error_state,
                         range_start,
                         range_end,
                         self._correction,
@@ -433,35 +1072,44 @@ class AnimationController:
                     self._led_controller.render()
                     return
 
-                # If displaying a static pattern, brightness is 0, or speed is 0:
-                # no update is needed the next frame
-                if (not self._update_needed
-                    and settings['function'] not in animfunctions.static_function_ids
-                    and settings['speed'] != 0
-                    and computed_brightness > 0):
-                    self._update_needed = True
+                # If displaying a time-invariant pattern, brightness is 0, or speed is 0:
+                # the group doesn't need to be rendered again until something changes
+                # sACN frames rendered as they arrive don't need an update every frame
+                if self._settings['sacn'] != 0:
+                    self._group_due.pop(group, None)
+                    if not self._sacn_render_on_arrival:
+                        self._update_needed = True
+                elif (not function_info['time_invariant']
+                      and settings['speed'] != 0
+                      and computed_brightness > 0):
+                    self._schedule_group(group, settings.get('fps', 0))
+                else:
+                    self._group_due.pop(group, None)
 
             self._led_controller.render()
+            if sacn_frame_time is not None:
+                self._sacn_latency.add(time.perf_counter() - sacn_frame_time)
 
-    def _sacn_callback(self, packet):
-        'Callback for sACN / E1.31 client'
-        sacn_time = time.perf_counter()
-        self._sacn_perf_avg += (sacn_time - self._last_sacn_time)
-        self._last_sacn_time = sacn_time
-
-        self._sacn_count += 1
-        if self._sacn_count % 100 == 0:
-            print('Average sACN rate (packets/s): {}'.format(1 / (self._sacn_perf_avg / 100)))
-            self._sacn_perf_avg = 0
-
-        data = [x / 255.0 for x in packet.dmxData[:self._led_count * 3]]
-        self._sacn_buffer = list(zip_longest(*(iter(data),) * 3))
+    def _schedule_group(self, group, fps):
+        'Set the time an animated group is rendered next, groups without an fps are always due'
+        if fps <= 0:
+            self._group_due[group] = self._time
+            return
+        # Stay on schedule unless the group was rendered early because something changed
+        due = self._group_due.get(group, math.inf)
+        due = due + 1 / fps if due <= self._time else self._time + 1 / fps
+        self._group_due[group] = max(due, self._time)
 
     def clear_leds(self):
         'Turn all LEDs off'
+        with self._output_lock:
+            self._set_blank()
+            self._led_controller.render()
+
+    def _set_blank(self):
         for group, settings in list(self._settings['groups'].items()):
             self._led_controller.set_range(
-                [(0, 0, 0) for i in range(self._led_count)],
+                self._blank_array,
                 0,
                 self._led_count,
                 self._correction,
@@ -471,11 +1119,12 @@ class AnimationController:
                 settings['render_mode'],
                 settings['render_target']
             )
-        self._led_controller.render()
 
     def end_animation(self):
         'Stop rendering in the animation thread and stop sACN receiver'
         self._timer.stop()
+        if self._render_pool is not None:
+            self._render_pool.stop()
         try:
             if self._enable_sacn and self._receiver:
                 self._receiver.stop()
@@ -7,12 +7,19 @@ from enum import Enum
 import ledcontrol.driver as driver
 import ledcontrol.utils as utils
 
-ColorMode = Enum('ColorMode', ['hsv', 'rgb'])
+ColorMode = Enum('ColorMode', ['hsv', 'rgb', 'palette_index'])
 
 def blank(t, dt, x, y, z, prev_state):
     return (0, 0, 0), ColorMode.hsv
 
-static_function_ids = [0, 1, 2, 3] # pattern IDs that display a solid color
+# Default patterns with native versions in the Raspberry Pi driver (see default_patterns.h)
+# These are rendered by the driver when their source has not been modified
+native_function_ids = [
+    0, 1, 2, 3,
+    100, 110, 112, 114, 120, 130, 140, 141, 150, 160, 161, 170, 180, 200, 210,
+    310, 320, 330, 331, 340, 350,
+    400, 410, 420, 430, 440, 450,
+]
 
 default = {
     0: {
@@ -21,7 +28,7 @@ default = {
         'primary_scale': 1.0,
         'default': True,
         'source': '''
-def pattern(t, dt, x, y, z, prev_state):
+def pattern_vectorized(t, dt, x, y, z, prev_state):
     return palette(0), hsv
 '''
     },
@@ -31,7 +38,7 @@ def pattern(t, dt, x, y, z, prev_state):
         'primary_scale': 1.0,
         'default': True,
         'source': '''
-def pattern(t, dt, x, y, z, prev_state):
+def pattern_vectorized(t, dt, x, y, z, prev_state):
     return (0, 0, 1), hsv
 '''
     },
@@ -41,7 +48,7 @@ def pattern(t, dt, x, y, z, prev_state):
         'primary_scale': 1.0,
         'default': True,
         'source': '''
-def pattern(t, dt, x, y, z, prev_state):
+def pattern_vectorized(t, dt, x, y, z, prev_state):
     return palette(x), hsv
 '''
     },
@@ -51,7 +58,7 @@ def pattern(t, dt, x, y, z, prev_state):
         'primary_scale': 1.0,
         'default': True,
         'source': '''
-def pattern(t, dt, x, y, z, prev_state):
+def pattern_vectorized(t, dt, x, y, z, prev_state):
     return palette_mirrored(x), hsv
 '''
     },
@@ -62,15 +69,13 @@ def pattern(t, dt, x, y, z, prev_state):
         'primary_scale': 1.0,
         'default': True,
         'source': '''
-def pattern(t, dt, x, y, z, prev_state):
-    v = prev_state[2] - dt
-    if v <= 0:
-        c = palette(x)
-        return (c[0], c[1], random.random()), hsv
-    elif v > 0:
-        return (prev_state[0], prev_state[1], v), hsv
-    else:
-        return (0, 0, 0), hsv
+def pattern_vectorized(t, dt, x, y, z, prev_state):
+    v = prev_state[:, 2] - dt
+    c = palette(x)
+    off = v <= 0
+    return (where(off, c[:, 0], prev_state[:, 0]),
+            where(off, c[:, 1], prev_state[:, 1]),
+            where(off, random.random(len(v)), v)), hsv
 '''
     },
     7: {
@@ -79,14 +84,12 @@ def pattern(t, dt, x, y, z, prev_state):
         'primary_scale': 1.0,
         'default': True,
         'source': '''
-def pattern(t, dt, x, y, z, prev_state):
-    v = prev_state[2] - dt
-    if v <= 0:
-        return (0, 0, random.random()), hsv
-    elif v > 0:
-        return (prev_state[0], prev_state[1], v), hsv
-    else:
-        return (0, 0, 0), hsv
+def pattern_vectorized(t, dt, x, y, z, prev_state):
+    v = prev_state[:, 2] - dt
+    off = v <= 0
+    return (where(off, 0, prev_state[:, 0]),
+            where(off, 0, prev_state[:, 1]),
+            where(off, random.random(len(v)), v)), hsv
 '''
     },
 
@@ -96,7 +99,7 @@ def pattern(t, dt, x, y, z, prev_state):
         'primary_scale': 1.0,
         'default': True,
         'source': '''
-def pattern(t, dt, x, y, z, prev_state):
+def pattern_vectorized(t, dt, x, y, z, prev_state):
     return palette(t + x), hsv
 '''
     },
@@ -106,7 +109,7 @@ def pattern(t, dt, x, y, z, prev_state):
         'primary_scale': 1.0,
         'default': True,
         'source': '''
-def pattern(t, dt, x, y, z, prev_state):
+def pattern_vectorized(t, dt, x, y, z, prev_state):
     return palette_mirrored(t + x), hsv
 '''
     },
@@ -116,9 +119,9 @@ def pattern(t, dt, x, y, z, prev_state):
         'primary_scale': 1.0,
         'default': True,
         'source': '''
-def pattern(t, dt, x, y, z, prev_state):
+def pattern_vectorized(t, dt, x, y, z, prev_state):
     c = palette_mirrored(t + x)
-    return (c[0], c[1], ((t + x) % 1 > 0.5) * 1.0), hsv
+    return (c[:, 0], c[:, 1], ((t + x) % 1 > 0.5) * 1.0), hsv
 '''
     },
     114: {
@@ -127,12 +130,10 @@ def pattern(t, dt, x, y, z, prev_state):
         'primary_scale': 1.0,
         'default': True,
         'source': '''
-def pattern(t, dt, x, y, z, prev_state):
+def pattern_vectorized(t, dt, x, y, z, prev_state):
     c = palette_mirrored(t + x)
-    if x < 0.5:
-        return (c[0], c[1], ((t + x) % 1 < 0.5) * 1.0), hsv
-    else:
-        return (c[0], c[1], ((t - x) % 1 < 0.5) * 1.0), hsv
+    v = where(x < 0.5, (t + x) % 1 < 0.5, (t - x) % 1 < 0.5)
+    return (c[:, 0], c[:, 1], v * 1.0), hsv
 '''
     },
     120: {
@@ -141,7 +142,7 @@ def pattern(t, dt, x, y, z, prev_state):
         'primary_scale': 1.0,
         'default': True,
         'source': '''
-def pattern(t, dt, x, y, z, prev_state):
+def pattern_vectorized(t, dt, x, y, z, prev_state):
     t = (t + x) % 1
     return palette(t - (t % (1 / 6))), hsv
 '''
@@ -152,7 +153,7 @@ def pattern(t, dt, x, y, z, prev_state):
         'primary_scale': 1.0,
         'default': True,
         'source': '''
-def pattern(t, dt, x, y, z, prev_state):
+def pattern_vectorized(t, dt, x, y, z, prev_state):
     t = t + x
     i = (t - (t % 0.2)) / 0.2
     return palette(i * 0.618034), hsv
@@ -164,7 +165,7 @@ def pattern(t, dt, x, y, z, prev_state):
         'primary_scale': 1.0,
         'default': True,
         'source': '''
-def pattern(t, dt, x, y, z, prev_state):
+def pattern_vectorized(t, dt, x, y, z, prev_state):
     return palette_mirrored(wave_triangle(t) + x), hsv
 '''
     },
@@ -174,7 +175,7 @@ def pattern(t, dt, x, y, z, prev_state):
         'primary_scale': 1.0,
         'default': True,
         'source': '''
-def pattern(t, dt, x, y, z, prev_state):
+def pattern_vectorized(t, dt, x, y, z, prev_state):
     return palette_mirrored(wave_sine(t) + x), hsv
 '''
     },
@@ -184,10 +185,10 @@ def pattern(t, dt, x, y, z, prev_state):
         'primary_scale': 1.0,
         'default': True,
         'source': '''
-def pattern(t, dt, x, y, z, prev_state):
+def pattern_vectorized(t, dt, x, y, z, prev_state):
     h = (x + t) * 0.1 + x + wave_sine(t)
     c = palette(wave_triangle(h))
-    return (c[0], c[1], wave_sine(h + t)), hsv
+    return (c[:, 0], c[:, 1], wave_sine(h + t)), hsv
 '''
     },
     160: {
@@ -196,12 +197,12 @@ def pattern(t, dt, x, y, z, prev_state):
         'primary_scale': 1.0,
         'default': True,
         'source': '''
-def pattern(t, dt, x, y, z, prev_state):
+def pattern_vectorized(t, dt, x, y, z, prev_state):
     wave1 = wave_sine(t / 4 + x)
     wave2 = wave_sine(t / 8 - x)
     wave3 = wave_sine(x + wave1 + wave2)
     c = palette(wave3 % 0.15 + t)
-    return (c[0], c[1], wave1 + wave3), hsv
+    return (c[:, 0], c[:, 1], wave1 + wave3), hsv
 '''
     },
     161: {
@@ -210,12 +211,12 @@ def pattern(t, dt, x, y, z, prev_state):
         'primary_scale': 1.0,
         'default': True,
         'source': '''
-def pattern(t, dt, x, y, z, prev_state):
+def pattern_vectorized(t, dt, x, y, z, prev_state):
     wave1 = wave_sine(t / 4 + x)
     wave2 = wave_sine(t / 8 - x)
     wave3 = wave_sine(x + wave1 + wave2)
     c = palette(wave3 % 0.8 + t)
-    return (c[0], c[1], wave1 + wave3), hsv
+    return (c[:, 0], c[:, 1], wave1 + wave3), hsv
 '''
     },
     170: {
@@ -224,7 +225,7 @@ def pattern(t, dt, x, y, z, prev_state):
         'primary_scale': 1.0,
         'default': True,
         'source': '''
-def pattern(t, dt, x, y, z, prev_state):
+def pattern_vectorized(t, dt, x, y, z, prev_state):
     v = plasma_sines(x, y, t, 1.0, 0.5, 0.5, 1.0)
     return palette(wave_triangle(v)), hsv
 '''
@@ -235,7 +236,7 @@ def pattern(t, dt, x, y, z, prev_state):
         'primary_scale': 1.0,
         'default': True,
         'source': '''
-def pattern(t, dt, x, y, z, prev_state):
+def pattern_vectorized(t, dt, x, y, z, prev_state):
     v = plasma_sines_octave(x, y, t, 7, 2.0, 0.5)
     return palette(wave_triangle(v)), hsv
 '''
@@ -246,15 +247,13 @@ def pattern(t, dt, x, y, z, prev_state):
         'primary_scale': 1.0,
         'default': True,
         'source': '''
-def pattern(t, dt, x, y, z, prev_state):
-    v = prev_state[2] - dt
-    if v <= 0:
-        c = palette(t + x)
-        return (c[0], c[1], random.random()), hsv
-    elif v > 0:
-        return (prev_state[0], prev_state[1], v), hsv
-    else:
-        return (0, 0, 0), hsv
+def pattern_vectorized(t, dt, x, y, z, prev_state):
+    v = prev_state[:, 2] - dt
+    c = palette(t + x)
+    off = v <= 0
+    return (where(off, c[:, 0], prev_state[:, 0]),
+            where(off, c[:, 1], prev_state[:, 1]),
+            where(off, random.random(len(v)), v)), hsv
 '''
     },
     200: {
@@ -263,7 +262,7 @@ def pattern(t, dt, x, y, z, prev_state):
         'primary_scale': 1.0,
         'default': True,
         'source': '''
-def pattern(t, dt, x, y, z, prev_state):
+def pattern_vectorized(t, dt, x, y, z, prev_state):
     return palette(perlin_noise_3d(x, y, t)), hsv
 '''
     },
@@ -273,7 +272,7 @@ def pattern(t, dt, x, y, z, prev_state):
         'primary_scale': 1.0,
         'default': True,
         'source': '''
-def pattern(t, dt, x, y, z, prev_state):
+def pattern_vectorized(t, dt, x, y, z, prev_state):
     v = fbm_noise_3d(x, y, t * 0.5, 7, 2.0, 0.5)
     return palette(wave_triangle(v * 4)), hsv
 '''
@@ -285,7 +284,7 @@ def pattern(t, dt, x, y, z, prev_state):
         'primary_scale': 1.0,
         'default': True,
         'source': '''
-def pattern(t, dt, x, y, z, prev_state):
+def pattern_vectorized(t, dt, x, y, z, prev_state):
     return (t + x, 1, 1), hsv
 '''
     },
@@ -295,7 +294,7 @@ def pattern(t, dt, x, y, z, prev_state):
         'primary_scale': 1.0,
         'default': True,
         'source': '''
-def pattern(t, dt, x, y, z, prev_state):
+def pattern_vectorized(t, dt, x, y, z, prev_state):
     hue = (t + x) % 1
     return (hue - (hue % 0.1666), 1, 1), hsv
 '''
@@ -306,7 +305,7 @@ def pattern(t, dt, x, y, z, prev_state):
         'primary_scale': 1.0,
         'default': True,
         'source': '''
-def pattern(t, dt, x, y, z, prev_state):
+def pattern_vectorized(t, dt, x, y, z, prev_state):
     return (wave_triangle(t) + x, 1, 1), hsv
 '''
     },
@@ -316,7 +315,7 @@ def pattern(t, dt, x, y, z, prev_state):
         'primary_scale': 1.0,
         'default': True,
         'source': '''
-def pattern(t, dt, x, y, z, prev_state):
+def pattern_vectorized(t, dt, x, y, z, prev_state):
     return (wave_sine(t) + x, 1, 1), hsv
 '''
     },
@@ -326,7 +325,7 @@ def pattern(t, dt, x, y, z, prev_state):
         'primary_scale': 1.0,
         'default': True,
         'source': '''
-def pattern(t, dt, x, y, z, prev_state):
+def pattern_vectorized(t, dt, x, y, z, prev_state):
     h = (x + t) * 0.5 + x + wave_sine(t)
     return (h, 1, wave_sine(h + t)), hsv
 '''
@@ -337,7 +336,7 @@ def pattern(t, dt, x, y, z, prev_state):
         'primary_scale': 1.0,
         'default': True,
         'source': '''
-def pattern(t, dt, x, y, z, prev_state):
+def pattern_vectorized(t, dt, x, y, z, prev_state):
     wave1 = wave_sine(t / 4 + x)
     wave2 = wave_sine(t / 8 - x)
     wave3 = wave_sine(x + wave1 + wave2)
@@ -351,7 +350,7 @@ def pattern(t, dt, x, y, z, prev_state):
         'primary_scale': 1.0,
         'default': True,
         'source': '''
-def pattern(t, dt, x, y, z, prev_state):
+def pattern_vectorized(t, dt, x, y, z, prev_state):
     return (wave_sine(t + x),
             wave_sine((t + x) * 1.2),
             wave_sine((t + x) * 1.4)), rgb
@@ -363,7 +362,7 @@ def pattern(t, dt, x, y, z, prev_state):
         'primary_scale': 1.0,
         'default': True,
         'source': '''
-def pattern(t, dt, x, y, z, prev_state):
+def pattern_vectorized(t, dt, x, y, z, prev_state):
     return (wave_cubic(t + x),
             wave_cubic((t + x) * 1.2),
             wave_cubic((t + x) * 1.4)), rgb
@@ -375,7 +374,7 @@ def pattern(t, dt, x, y, z, prev_state):
         'primary_scale': 1.0,
         'default': True,
         'source': '''
-def pattern(t, dt, x, y, z, prev_state):
+def pattern_vectorized(t, dt, x, y, z, prev_state):
     v0 = x + (wave_sine(t)) + wave_sine(x + 0.666 * t)
     v1 = x + (wave_sine(t + 0.05)) + wave_sine(x + 0.666 * t + 0.05)
     v2 = x + (wave_sine(t + 0.1)) + wave_sine(x + 0.666 * t + 0.1)
@@ -388,7 +387,7 @@ def pattern(t, dt, x, y, z, prev_state):
         'primary_scale': 1.0,
         'default': True,
         'source': '''
-def pattern(t, dt, x, y, z, prev_state):
+def pattern_vectorized(t, dt, x, y, z, prev_state):
     v = plasma_sines(x, y, t, 1.0, 0.5, 0.5, 1.0)
     return (wave_sine(v),
             wave_sine(v + 0.333),
@@ -401,7 +400,7 @@ def pattern(t, dt, x, y, z, prev_state):
         'primary_scale': 1.0,
         'default': True,
         'source': '''
-def pattern(t, dt, x, y, z, prev_state):
+def pattern_vectorized(t, dt, x, y, z, prev_state):
     v = plasma_sines(x, y, t, 1.0, 0.5, 0.5, 1.0)
     return (0.9 - wave_sine(v),
             wave_sine(v + 0.333) - 0.1,
@@ -414,7 +413,7 @@ def pattern(t, dt, x, y, z, prev_state):
         'primary_scale': 1.0,
         'default': True,
         'source': '''
-def pattern(t, dt, x, y, z, prev_state):
+def pattern_vectorized(t, dt, x, y, z, prev_state):
     v = plasma_sines_octave(x, y, t, 7, 2.0, 0.5)
     return (1.0 - wave_sine(v),
             wave_sine(v + 0.333),
@@ -10,6 +10,7 @@ from pathlib import Path
 from flask import Flask, render_template, request, jsonify
 from ledcontrol.animationcontroller import AnimationController
 from ledcontrol.ledcontroller import LEDController
+from ledcontrol.outputpipeline import OutputPipeline
 from ledcontrol.homekit import homekit_start
 
 import ledcontrol.pixelmappings as pixelmappings
@@ -25,11 +26,28 @@ def create_app(led_count,
                led_data_rate,
                led_dma_channel,
                led_pixel_order,
+               led_gamma,
                led_brightness_limit,
                save_interval,
                enable_sacn,
+               sacn_universe,
+               sacn_universe_count,
+               sacn_sync_universe,
+               sacn_render_on_arrival,
+               timer_spin_time,
+               timer_frame_skip,
+               timer_realtime_priority,
+               timer_cpu,
                enable_hap,
                no_timer_reset,
+               wavetable_frames,
+               wavetable_memory,
+               wavetable_uint8,
+               wavetable_interpolation,
+               render_processes,
+               pipeline_buffers,
+               palette_size,
+               palette_memory,
                dev):
     app = Flask(__name__)
 
@@ -48,14 +66,33 @@ def create_app(led_count,
                          led_pin,
                          led_data_rate,
                          led_dma_channel,
-                         led_pixel_order)
+                         led_pixel_order,
+                         led_gamma)
+    if pipeline_buffers > 0:
+        leds = OutputPipeline(leds, led_count, pipeline_buffers)
+        atexit.register(leds.stop)
     controller = AnimationController(leds,
                                      refresh_rate,
                                      led_count,
                                      mapping_func,
                                      enable_sacn,
                                      no_timer_reset,
-                                     led_brightness_limit)
+                                     led_brightness_limit,
+                                     wavetable_frames,
+                                     wavetable_memory,
+                                     wavetable_uint8,
+                                     wavetable_interpolation,
+                                     render_processes,
+                                     palette_size,
+                                     palette_memory,
+                                     sacn_universe,
+                                     sacn_universe_count,
+                                     sacn_sync_universe,
+                                     sacn_render_on_arrival,
+                                     timer_spin_time,
+                                     timer_frame_skip,
+                                     timer_realtime_priority,
+                                     timer_cpu)
 
     presets = {}
     functions = dict(animfunctions.default)
@@ -148,6 +185,10 @@ def create_app(led_count,
                 controller.set_palette(int(k), v)
             controller.calculate_palette_tables()
 
+            # Calculate tables for palettes used in presets ahead of time
+            controller.prewarm_palettes([v['palette'] for preset in presets.values()
+                                         for v in preset.values() if 'palette' in v])
+
             print(f'Loaded saved settings from {filename}')
 
         except Exception as e:
@@ -214,7 +255,8 @@ def create_app(led_count,
         'Compiles a function, returns errors and warnings in JSON array form'
         key = request.json['key']
         errors, warnings = controller.set_pattern_function(key, functions[key]['source'])
-        return jsonify(errors=errors, warnings=warnings)
+        return jsonify(errors=errors, warnings=warnings,
+                       path=controller.get_pattern_info(key).get('path'))
 
     @app.post('/updatefunction')
     def update_function():
@@ -251,6 +293,16 @@ def create_app(led_count,
         'Returns latest animation frames per second'
         return jsonify(fps=controller.get_frame_rate())
 
+    @app.get('/getframestats')
+    def get_frame_stats():
+        'Returns frame scheduling latency, execution time, and jitter statistics'
+        return jsonify(controller.get_frame_stats())
+
+    @app.get('/getsacnstats')
+    def get_sacn_stats():
+        'Returns sACN packet and frame counts and receive to output latency statistics'
+        return jsonify(controller.get_sacn_stats())
+
     @app.get('/resettimer')
     def reset_timer():
         'Resets animation timer'
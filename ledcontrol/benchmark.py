@@ -0,0 +1,399 @@
+# led-control WS2812B LED Controller Server
+# Copyright 2023 jackw01. Released under the MIT License (see LICENSE for details).
+
+import argparse
+import hashlib
+import json
+import math
+import platform
+import sys
+import time
+import numpy as np
+
+import ledcontrol.animationfunctions as animfunctions
+import ledcontrol.pixelmappings as pixelmappings
+import ledcontrol.remoteprotocol as remoteprotocol
+import ledcontrol.vectorfunctions as vectorfunctions
+from ledcontrol.animationcontroller import AnimationController
+from ledcontrol.remoteprotocol import CmdType
+
+class StandInReceiver:
+    'Handles remote rendering packets the same way as the Pi Pico firmware'
+
+    def __init__(self, led_count):
+        self.colors = np.zeros((led_count, 3), dtype=np.uint8) # As they would be displayed
+        self._frames = [None] * remoteprotocol.delta_history
+        self._frame_ids = [None] * remoteprotocol.delta_history
+        # Delta packets received for each frame, and whether all of them have arrived
+        self._frame_parts = [0] * remoteprotocol.delta_history
+        self._frame_complete = [False] * remoteprotocol.delta_history
+        self._fragment_id = None
+        self._fragments = {} # Offset: data
+
+    def handle(self, datagram):
+        'Returns a list of replies to the packets in a datagram'
+        replies = []
+        offset = 0
+        while offset + 4 <= len(datagram):
+            length = datagram[offset + 2] << 8 | datagram[offset + 3]
+            if datagram[offset] != remoteprotocol.packet_start or length < 4:
+                break
+            replies += self._handle_packet(datagram[offset:offset + length])
+            offset += length
+        return replies
+
+    def _handle_packet(self, packet):
+        command_type = packet[1]
+        if command_type == CmdType.fragment:
+            fragment_id = packet[4] << 8 | packet[5]
+            if fragment_id != self._fragment_id:
+                self._fragment_id = fragment_id
+                self._fragments = {}
+            offset = packet[7] << 8 | packet[8]
+            self._fragments[offset] = packet[remoteprotocol.fragment_header_size:]
+            return []
+        elif command_type == CmdType.commit:
+            fragment_id = packet[4] << 8 | packet[5]
+            if fragment_id != self._fragment_id or len(self._fragments) != packet[6]:
+                return []
+            packet = b''.join(self._fragments[offset] for offset in sorted(self._fragments))
+            self._fragments = {}
+            command_type = packet[1]
+
+        start = min(packet[9] << 8 | packet[10], len(self.colors)) if len(packet) > 12 else 0
+        end = min(packet[11] << 8 | packet[12], len(self.colors)) if len(packet) > 12 else 0
+        if command_type == CmdType.hello:
+            return [bytes((remoteprotocol.packet_start, CmdType.hello, 0, 6,
+                           remoteprotocol.protocol_version, len(self._frames)))]
+        elif command_type in (CmdType.render_rgb, CmdType.render_hsv):
+            self.colors[start:end] = np.frombuffer(packet, dtype=np.uint8, count=(end - start) * 3,
+                                                   offset=13).reshape(-1, 3)
+        elif command_type == CmdType.render_delta:
+            frame_id = packet[14] << 8 | packet[15]
+            base_id = packet[16] << 8 | packet[17]
+            slot = frame_id % len(self._frames)
+            if packet[13] & remoteprotocol.delta_flag_continue:
+                # Later ranges are only added to a frame that has every range before them
+                if (self._frame_ids[slot] != frame_id or self._frame_complete[slot]
+                        or self._frame_parts[slot] == 0):
+                    return []
+                frame = self._frames[slot]
+            elif packet[13] & remoteprotocol.delta_flag_keyframe:
+                frame = np.zeros_like(self.colors)
+            else:
+                base_slot = base_id % len(self._frames)
+                if (base_slot == slot or self._frame_ids[base_slot] != base_id
+                        or not self._frame_complete[base_slot]):
+                    return []
+                frame = self._frames[base_slot].copy()
+            if not packet[13] & remoteprotocol.delta_flag_continue:
+                self._frame_parts[slot] = 0
+            remoteprotocol.decode_delta(packet[remoteprotocol.delta_header_size:],
+                                        frame[start:])
+            self._frames[slot] = frame
+            self._frame_ids[slot] = frame_id
+            self._frame_complete[slot] = False
+            self._frame_parts[slot] += 1
+            self.colors[start:end] = frame[start:end]
+        elif (command_type == CmdType.write_leds
+                and len(packet) >= remoteprotocol.write_leds_frame_size):
+            # Frames are acknowledged once every delta packet in them has arrived
+            frame_id = packet[5] << 8 | packet[6]
+            slot = frame_id % len(self._frames)
+            if (self._frame_ids[slot] == frame_id and not self._frame_complete[slot]
+                    and self._frame_parts[slot] == packet[7] << 8 | packet[8]):
+                self._frame_complete[slot] = True
+                return [bytes((remoteprotocol.packet_start, CmdType.ack, 0, 6,
+                               frame_id >> 8, frame_id & 0xff))]
+        return []
+
+class BenchmarkLEDController:
+    '''
+    LEDController that discards all output, or keeps a copy of the last frame if record is set
+    If remote is set, colors are also sent to a stand-in receiver with the remote rendering
+    protocol, and a fraction of packets set by remote_loss is dropped
+    '''
+
+    def __init__(self, led_count, record=False, remote=False, remote_loss=0.0):
+        self._record = record
+        self.frame = np.zeros((led_count, 3), dtype=np.float32)
+        self._remote = remote
+        if remote:
+            self._target = remoteprotocol.RemoteTarget(led_count)
+            self._receiver = StandInReceiver(led_count)
+            self._remote_loss = remote_loss
+            self._rng = np.random.default_rng(0)
+            self._data = np.zeros((led_count * 3,), dtype=np.float32)
+            self._data_uint8 = np.zeros((led_count * 3,), dtype=np.uint8)
+            # Packets and colors of each range in the current frame
+            self._packets = []
+            self._ranges = []
+        self.reset_remote_stats()
+
+    def reset_remote_stats(self):
+        self.remote_bytes = 0
+        self.remote_v1_bytes = 0
+        self.remote_errors = 0 # Ranges where the receiver would display different colors
+
+    def set_range(self, pixels, start, end,
+                  correction, saturation, brightness, color_mode,
+                  render_mode, render_target):
+        if self._record:
+            self.frame[start:end] = pixels
+        if self._remote:
+            count = (end - start) * 3
+            hsv = color_mode == animfunctions.ColorMode.hsv
+            colors = remoteprotocol.colors_to_uint8(pixels, hsv,
+                                                    self._data[0:count],
+                                                    self._data_uint8[0:count])
+            self._packets += self._target.range_packets(colors, hsv,
+                                                        correction, saturation, brightness,
+                                                        start, end)
+            self._ranges.append((start, end, colors.reshape(-1, 3).copy()))
+            self.remote_v1_bytes += 13 + count
+
+    def set_group_count(self, count):
+        pass
+
+    def render_palette_table(self, palette, correction, saturation, brightness):
+        return None
+
+    def set_range_indexed(self, indices, table, start, end):
+        pass
+
+    def render_default_pattern(self, function, mapping, palette, start, end, time,
+                               correction, saturation, brightness):
+        pass
+
+    def show_calibration_color(self, count, correction, brightness,
+                               render_mode, render_target):
+        pass
+
+    def render(self):
+        if self._remote and self._packets:
+            # Packets are sent like they would be to a UDP target
+            self._packets.append(self._target.end_frame())
+            for datagram in self._target.datagrams(self._packets):
+                self.remote_bytes += len(datagram)
+                if self._rng.random() >= self._remote_loss:
+                    for reply in self._receiver.handle(datagram):
+                        self._target.handle_replies(reply)
+            self.remote_v1_bytes += len(remoteprotocol.write_leds_packet)
+            for start, end, colors in self._ranges:
+                if not np.array_equal(self._receiver.colors[start:end], colors):
+                    self.remote_errors += 1
+            self._packets = []
+            self._ranges = []
+
+class BenchmarkTimer:
+    'Replaces the IntervalTimer, time advances by a fixed interval every frame'
+
+    def __init__(self, interval):
+        self._interval = interval
+        self.last_start = 0.0
+
+    def advance(self):
+        self.last_start += self._interval
+
+    def get_count(self):
+        return 1 # Keeps the animation controller from printing its frame rate
+
+    def get_perf_avg(self):
+        return 0
+
+    def get_rate(self):
+        return 0
+
+    def trigger(self):
+        pass
+
+    def stop(self):
+        pass
+
+def grid(count):
+    'Square 2D grid mapping'
+    width = math.ceil(math.sqrt(count))
+    return pixelmappings.from_array([(i % width, i // width, 0) for i in range(count)])
+
+def cloud(count):
+    'Random 3D point cloud mapping, the same for every run'
+    rng = np.random.default_rng(0)
+    return pixelmappings.from_array(rng.random((count, 3)).tolist())
+
+mappings = {
+    'line': pixelmappings.line,
+    'grid': grid,
+    'cloud': cloud,
+}
+
+def run_pattern(controller, leds, timer, function, frames, warmup):
+    'Render a pattern for a number of frames, returns frame times in seconds and a checksum'
+    controller.update_settings({'groups': {'main': {'function': function}}})
+    # Every pattern starts from the same state, so results don't depend on earlier patterns
+    timer.last_start = 0.0
+    controller.reset_animation_state(0.0)
+    vectorfunctions.random.bit_generator.state = np.random.PCG64(0).state
+    times = []
+    for i in range(warmup + frames):
+        if i == warmup:
+            leds.reset_remote_stats()
+        timer.advance()
+        start = time.perf_counter()
+        controller.update_leds(render_all=True) # Measure rendering even if nothing changes
+        if i >= warmup:
+            times.append(time.perf_counter() - start)
+    checksum = hashlib.md5(leds.frame.tobytes()).hexdigest()
+    return np.array(times), checksum
+
+def run(led_counts, mapping_names, patterns, frames, warmup,
+        wavetable_frames, render_processes, palette_size, remote=False, remote_loss=0.0):
+    'Run all benchmarks and return a list of results'
+    results = []
+    for mapping_name in mapping_names:
+        for led_count in led_counts:
+            leds = BenchmarkLEDController(led_count, record=True,
+                                          remote=remote, remote_loss=remote_loss)
+            timer = BenchmarkTimer(1.0 / 60)
+            controller = AnimationController(leds, 60, led_count,
+                                             mappings[mapping_name](led_count),
+                                             False, True, 1.0,
+                                             wavetable_frames=wavetable_frames,
+                                             render_processes=render_processes,
+                                             palette_size=palette_size,
+                                             # The null controller does not render native patterns
+                                             native_rendering=False)
+            controller.set_timer(timer)
+            controller.update_settings({'global_brightness': 1.0})
+
+            for function in patterns:
+                times, checksum = run_pattern(controller, leds, timer, function, frames, warmup)
+                mean = float(np.mean(times))
+                result = {
+                    'pattern': function,
+                    'name': animfunctions.default[function]['name'],
+                    'mapping': mapping_name,
+                    'led_count': led_count,
+                    'path': controller.get_pattern_info(function).get('path'),
+                    'mean_ms': mean * 1000,
+                    'p50_ms': float(np.percentile(times, 50)) * 1000,
+                    'p99_ms': float(np.percentile(times, 99)) * 1000,
+                    'fps': 1 / mean if mean > 0 else math.inf,
+                    'checksum': checksum,
+                }
+                if remote:
+                    result['remote_bytes'] = leds.remote_bytes / frames
+                    result['remote_v1_bytes'] = leds.remote_v1_bytes / frames
+                    result['remote_errors'] = leds.remote_errors
+                results.append(result)
+                print(f'{result["name"]:<40} {mapping_name:<6} {led_count:>6} LEDs  '
+                      f'mean {result["mean_ms"]:8.3f} ms  p50 {result["p50_ms"]:8.3f} ms  '
+                      f'p99 {result["p99_ms"]:8.3f} ms  {result["fps"]:9.1f} FPS')
+                if remote:
+                    ratio = result['remote_bytes'] / result['remote_v1_bytes']
+                    print(f'{"":<40} remote {result["remote_bytes"]:10.0f} bytes/frame  '
+                          f'{ratio:7.1%} of version 1  '
+                          f'{result["remote_errors"]} ranges displayed incorrectly')
+
+            controller.end_animation()
+    return results
+
+def compare(results, baseline, threshold, threshold_ms):
+    '''
+    Compare results with a baseline
+    Returns a list of (result, baseline result, ratio) for regressions
+    '''
+    baseline_results = {(r['pattern'], r['mapping'], r['led_count']): r
+                        for r in baseline['results']}
+    regressions = []
+    changed = 0
+    print(f'\nComparison with baseline (median frame time, regression threshold {threshold:.0%}):')
+    for result in results:
+        key = (result['pattern'], result['mapping'], result['led_count'])
+        if key not in baseline_results:
+            continue
+        base = baseline_results[key]
+        ratio = result['p50_ms'] / base['p50_ms'] if base['p50_ms'] > 0 else 1.0
+        status = ''
+        if ratio > 1 + threshold and result['p50_ms'] - base['p50_ms'] > threshold_ms:
+            status = 'REGRESSION'
+            regressions.append((result, base, ratio))
+        elif ratio < 1 / (1 + threshold):
+            status = 'faster'
+        if result['checksum'] != base.get('checksum'):
+            changed += 1
+            status += ' (output changed)'
+        print(f'{result["name"]:<40} {result["mapping"]:<6} {result["led_count"]:>6} LEDs  '
+              f'{base["p50_ms"]:8.3f} ms -> {result["p50_ms"]:8.3f} ms  {ratio:6.2f}x  {status}')
+    print(f'{len(regressions)} regressions, {changed} patterns with different output')
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Measure rendering performance of the built-in patterns')
+    parser.add_argument('--led_counts', type=int, nargs='+', default=[100, 1000, 5000, 20000],
+                        help='Numbers of LEDs to test. Default: 100 1000 5000 20000')
+    parser.add_argument('--mappings', nargs='+', choices=list(mappings), default=list(mappings),
+                        help='Pixel mappings to test: line, 2D grid, and random 3D cloud. Default: all')
+    parser.add_argument('--patterns', type=int, nargs='+', default=list(animfunctions.default),
+                        help='IDs of built-in patterns to test. Default: all')
+    parser.add_argument('--frames', type=int, default=100,
+                        help='Number of frames to measure for each pattern. Default: 100')
+    parser.add_argument('--warmup', type=int, default=5,
+                        help='Number of frames to render before measuring. Default: 5')
+    parser.add_argument('--wavetable_frames', type=int, default=0,
+                        help='Same as the ledcontrol option. Default: 0')
+    parser.add_argument('--render_processes', type=int, default=0,
+                        help='Same as the ledcontrol option. Default: 0')
+    parser.add_argument('--palette_size', type=int, default=1024,
+                        help='Same as the ledcontrol option. Default: 1024')
+    parser.add_argument('--remote', action='store_true',
+                        help='Also send frames to a stand-in remote receiver and measure the data sent. Frame times include encoding and decoding')
+    parser.add_argument('--remote_loss', type=float, default=0.0,
+                        help='Fraction of packets to the stand-in receiver that are dropped. Default: 0')
+    parser.add_argument('--output', type=argparse.FileType('w'),
+                        help='Write results to a JSON file')
+    parser.add_argument('--baseline', type=argparse.FileType('r'),
+                        help='Compare results with a JSON file written by a previous run')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='Fraction a median frame time can increase compared to the baseline before it is reported as a regression. Default: 0.1')
+    parser.add_argument('--threshold_ms', type=float, default=0.05,
+                        help='Smallest increase in median frame time that is reported as a regression, in ms. Default: 0.05')
+    args = parser.parse_args()
+
+    for function in args.patterns:
+        if function not in animfunctions.default:
+            parser.error(f'{function} is not a built-in pattern')
+    if args.palette_size < 2 or args.palette_size & (args.palette_size - 1) != 0:
+        parser.error('--palette_size must be a power of 2')
+
+    results = run(args.led_counts, args.mappings, args.patterns, args.frames, args.warmup,
+                  args.wavetable_frames, args.render_processes, args.palette_size,
+                  args.remote, args.remote_loss)
+    output = {
+        'host': {
+            'platform': platform.platform(),
+            'machine': platform.machine(),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+        },
+        'settings': {
+            'frames': args.frames,
+            'warmup': args.warmup,
+            'wavetable_frames': args.wavetable_frames,
+            'render_processes': args.render_processes,
+            'palette_size': args.palette_size,
+            'remote': args.remote,
+            'remote_loss': args.remote_loss,
+        },
+        'results': results,
+    }
+
+    if args.output is not None:
+        json.dump(output, args.output, indent=2)
+        args.output.close()
+
+    if args.baseline is not None:
+        baseline = json.load(args.baseline)
+        args.baseline.close()
+        if compare(results, baseline, args.threshold, args.threshold_ms):
+            sys.exit(1)
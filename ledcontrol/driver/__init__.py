@@ -16,6 +16,10 @@ if is_raspberrypi():
     # Import the extension module
     from _ledcontrol_rpi_ws281x_driver import *
 else:
-    from . driver_non_raspberry_pi import *
+    try:
+        # Native animation and color utility functions, if they were built for this host
+        from _ledcontrol_animation_utils import *
+    except ImportError:
+        from . driver_non_raspberry_pi import *
 
 
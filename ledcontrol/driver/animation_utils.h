@@ -7,13 +7,16 @@
 #include <math.h>
 
 // Optimized C utility functions
-// Not stupid if it works
-int float_to_int_1000(float t) {
-  return (int)(t * 999.9) % 1000;
+// Index into a palette table with size entries, size must be a power of 2 so
+// values of t outside 0-1 wrap with a mask instead of a modulo
+int palette_index(double t, int size) {
+  return (int)((long long)(t * (size - 0.1)) & (size - 1));
 }
 
-int float_to_int_1000_mirror(float t) {
-  return abs((int)(t * 1998.9) % 1999 - 999);
+// Mirrored version goes from the end of the table to the start and back
+int palette_index_mirrored(double t, int size) {
+  int i = (int)((long long)(t * (2 * size - 0.1)) & (2 * size - 1));
+  return size - 1 - (i < size ? i : 2 * size - 1 - i);
 }
 
 // Waveforms for pattern generation.
@@ -121,10 +124,17 @@ double lerp(double t, double a, double b) {
   return a + t * (b - a);
 }
 
+// Gradients are looked up in a table instead of chosen with branches, which are mispredicted
+// for most points because hashes are random. Results are the same as the reference version
 double grad(int hash, double x, double y, double z) {
-  int h = hash & 15;
-  double u = h < 8 ? x : y, v = h < 4 ? y : h == 12 || h == 14 ? x : z;
-  return ((h & 1) == 0 ? u : -u) + ((h & 2) == 0 ? v : -v);
+  static const double gradients[16][3] = {
+    { 1,  1,  0}, {-1,  1,  0}, { 1, -1,  0}, {-1, -1,  0},
+    { 1,  0,  1}, {-1,  0,  1}, { 1,  0, -1}, {-1,  0, -1},
+    { 0,  1,  1}, { 0, -1,  1}, { 0,  1, -1}, { 0, -1, -1},
+    { 1,  1,  0}, { 0, -1,  1}, {-1,  1,  0}, { 0, -1, -1},
+  };
+  const double *g = gradients[hash & 15];
+  return g[0] * x + g[1] * y + g[2] * z;
 }
 
 double perlin_noise_3d(double x, double y, double z) {
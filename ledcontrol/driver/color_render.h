@@ -0,0 +1,369 @@
+// led-control WS2812B LED Controller Server
+// Copyright 2021 jackw01. Released under the MIT License (see LICENSE for details).
+
+#ifndef __COLOR_RENDER_H__
+#define __COLOR_RENDER_H__
+
+#include <math.h>
+#include <pthread.h>
+#include <stdlib.h>
+
+// Color conversion functions that do not depend on rpi_ws281x, so they can also be built
+// on other hosts
+
+const uint8_t debug = 0;
+
+// Unpack 24 bit rgb from int
+color_rgb unpack_rgb(uint32_t in) {
+  uint8_t r = in >> 16 & 0xff;
+  uint8_t g = in >> 8 & 0xff;
+  uint8_t b = in & 0xff;
+  return (color_rgb){ r, g, b };
+}
+
+// Pack 32 bit rgbw to int
+uint32_t pack_rgbw(uint8_t r, uint8_t g, uint8_t b, uint8_t w) {
+  return (w << 24) | (r << 16) | (g << 8) | b;
+}
+
+// Scale one 8 bit int by another (a * b / 255)
+uint8_t scale_8(uint8_t a, uint8_t b) {
+  return ((uint16_t)a * (uint16_t)b) >> 8;
+}
+
+// Float clamp
+float clamp(float d, float min, float max) {
+  const float t = d < min ? min : d;
+  return t > max ? max : t;
+}
+
+color_rgb_float blackbody_to_rgb(float kelvin) {
+  // See http://www.tannerhelland.com/4435/convert-temperature-rgb-algorithm-code/
+  // See http://www.zombieprototypes.com/?p=210
+
+  float tmp_internal = kelvin / 100.0;
+  float r_out = 0.0;
+  float g_out = 0.0;
+  float b_out = 0.0;
+
+  if (tmp_internal <= 66) {
+    float xg = tmp_internal - 2.0;
+    r_out = 1.0;
+    g_out = clamp((-155.255 - 0.446 * xg + 104.492 * logf(xg)) / 255.0, 0, 1);
+  } else {
+    float xr = tmp_internal - 55.0;
+    float xg = tmp_internal - 50.0;
+    r_out = clamp((351.977 + 0.114 * xr - 40.254 * logf(xr)) / 255.0, 0, 1);
+    g_out = clamp((325.449 + 0.079 * xg - 28.085 * logf(xg)) / 255.0, 0, 1);
+  }
+
+  if (tmp_internal >= 66) {
+    b_out = 1.0;
+  } else if (tmp_internal <= 19) {
+    b_out = 0.0;
+  } else {
+    float xb = tmp_internal - 10.0;
+    b_out = clamp((-254.769 + 0.827 * xb + 115.680 * logf(xb)) / 255.0, 0, 1);
+  }
+
+  return (color_rgb_float){r_out, g_out, b_out};
+}
+
+color_rgb_float blackbody_correction_rgb(color_rgb_float rgb, float kelvin) {
+  color_rgb_float bb = blackbody_to_rgb(kelvin);
+  return (color_rgb_float){bb.r * rgb.r, bb.g * rgb.g, bb.b * rgb.b};
+}
+
+#ifndef SWIG
+// Output lookup tables fold gamma, brightness, and color correction into one table per
+// channel, so no per-pixel math is needed after the color transform
+// Tables are indexed by 12 bit channel intensity before brightness is applied
+#define OUTPUT_LUT_SIZE 4096
+#define OUTPUT_LUT_CACHE_SIZE 4
+
+typedef struct {
+  uint8_t r[OUTPUT_LUT_SIZE];
+  uint8_t g[OUTPUT_LUT_SIZE];
+  uint8_t b[OUTPUT_LUT_SIZE];
+  uint8_t w[OUTPUT_LUT_SIZE];
+  uint32_t correction;
+  float brightness;
+  float gamma;
+  uint8_t valid;
+} output_lut;
+
+static void build_output_lut(output_lut *lut, uint32_t correction,
+                             float brightness, float gamma) {
+  color_rgb corr_rgb = unpack_rgb(correction);
+  float scale = clamp(brightness, 0, 1);
+  for (int i = 0; i < OUTPUT_LUT_SIZE; i++) {
+    float x = (float)i / (OUTPUT_LUT_SIZE - 1);
+    if (gamma != 1.0f) x = powf(x, gamma);
+    x *= scale;
+    lut->r[i] = x * corr_rgb.r;
+    lut->g[i] = x * corr_rgb.g;
+    lut->b[i] = x * corr_rgb.b;
+    lut->w[i] = x * 255;
+  }
+  lut->correction = correction;
+  lut->brightness = brightness;
+  lut->gamma = gamma;
+  lut->valid = 1;
+}
+
+// Tables for the most recently used settings, so each group keeps its own table
+// Rendering functions are called from more than one thread with the GIL released, so the
+// lock is held from looking up a table until rendering with it is done
+static output_lut output_lut_default_cache[OUTPUT_LUT_CACHE_SIZE];
+static output_lut *output_lut_cache = output_lut_default_cache;
+static int output_lut_cache_size = OUTPUT_LUT_CACHE_SIZE;
+static int output_lut_next = 0;
+static pthread_mutex_t output_lut_mutex = PTHREAD_MUTEX_INITIALIZER;
+
+// Get the output lookup table for a set of settings, tables are only built when settings change
+// unlock_output_lut must be called when the table is not used anymore
+static const output_lut *lock_output_lut(uint32_t correction, float brightness, float gamma) {
+  pthread_mutex_lock(&output_lut_mutex);
+  for (int i = 0; i < output_lut_cache_size; i++) {
+    const output_lut *lut = &output_lut_cache[i];
+    if (lut->valid && lut->correction == correction
+        && lut->brightness == brightness && lut->gamma == gamma) {
+      return lut;
+    }
+  }
+  output_lut *lut = &output_lut_cache[output_lut_next];
+  output_lut_next = (output_lut_next + 1) % output_lut_cache_size;
+  build_output_lut(lut, correction, brightness, gamma);
+  return lut;
+}
+
+static void unlock_output_lut(void) {
+  pthread_mutex_unlock(&output_lut_mutex);
+}
+
+// Convert a 0-1 float channel intensity to an output lookup table index
+static inline int lut_index(float x) {
+  return clamp(x, 0, 1) * (OUTPUT_LUT_SIZE - 1);
+}
+
+// Render float HSV to LEDs with "Rainbow" color transform from FastLED
+static inline uint32_t render_hsv2rgb_rainbow_lut(color_hsv_float hsv, const output_lut *lut,
+                                                  float saturation, uint8_t has_white) {
+  uint8_t hue = fmod(hsv.hue, 1.0) * 255.0;
+  uint8_t sat = hsv.sat * saturation * 255.0;
+  uint8_t val = (hsv.val * hsv.val) * 255;
+  if (val > 0 && val < 255) val += 1;
+  uint8_t r, g, b, w;
+
+  w = 0;
+
+  uint8_t offset = hue & 0x1F; // 0..31
+  uint8_t offset8 = offset << 3;
+  uint8_t third = offset8 / 3;
+
+  if (!(hue & 0x80)) {
+    if (!(hue & 0x40)) {
+      // section 0-1
+      if (!(hue & 0x20)) {
+        // case 0: // R -> O
+        r = 255 - third;
+        g = third;
+        b = 0;
+      } else {
+        // case 1: // O -> Y
+        r = 171;
+        g = 85 + third;
+        b = 0;
+      }
+    } else {
+      // section 2-3
+      if (!(hue & 0x20)) {
+        // case 2: // Y -> G
+        r = 171 - third * 2;
+        g = 170 + third;
+        b = 0;
+      } else {
+        // case 3: // G -> A
+        r = 0;
+        g = 255 - third;
+        b = third;
+      }
+    }
+  } else {
+    // section 4-7
+    if (!(hue & 0x40))  {
+      if (!(hue & 0x20)) {
+        // case 4: // A -> B
+        r = 0;
+        uint8_t twothirds = third * 2;
+        g = 171 - twothirds; // K170?
+        b = 85 + twothirds;
+      } else {
+        // case 5: // B -> P
+        r = third;
+        g = 0;
+        b = 255 - third;
+      }
+    } else {
+      if (!(hue & 0x20)) {
+        // case 6: // P -- K
+        r = 85 + third;
+        g = 0;
+        b = 171 - third;
+      } else {
+        // case 7: // K -> R
+        r = 170 + third;
+        g = 0;
+        b = 85 - third;
+      }
+    }
+  }
+
+  // Scale down colors if we're desaturated at all
+  // and add the brightness_floor to r, g, and b.
+  if (has_white) {
+    if (sat != 255) {
+      if (sat == 0) {
+        r = 0;
+        b = 0;
+        g = 0;
+        w = 255;
+      } else {
+        uint8_t desat = 255 - sat;
+        desat = scale_8(desat, desat);
+        r = scale_8(r, sat);
+        g = scale_8(g, sat);
+        b = scale_8(b, sat);
+        w = desat;
+      }
+    }
+  } else {
+    if (sat != 255) {
+      if (sat == 0) {
+        r = 255;
+        b = 255;
+        g = 255;
+      } else {
+        uint8_t desat = 255 - sat;
+        desat = scale_8(desat, desat);
+        r = scale_8(r, sat) + desat;
+        g = scale_8(g, sat) + desat;
+        b = scale_8(b, sat) + desat;
+      }
+    }
+  }
+
+  // Scale by value into a 12 bit table index (c * val * 4095 / 65025)
+  // Brightness, gamma, and color correction are applied by the lookup table
+  uint32_t scale = val * 4128;
+  uint32_t c = pack_rgbw(lut->r[(r * scale) >> 16],
+                         lut->g[(g * scale) >> 16],
+                         lut->b[(b * scale) >> 16],
+                         lut->w[(w * scale) >> 16]);
+
+  if (debug) printf("%08x\n", c);
+  return c;
+}
+
+// Render float RGB to LEDs
+static inline uint32_t render_rgb_lut(color_rgb_float rgb, const output_lut *lut,
+                                      float saturation, uint8_t has_white) {
+  float r = clamp(rgb.r, 0, 1);
+  float g = clamp(rgb.g, 0, 1);
+  float b = clamp(rgb.b, 0, 1);
+  float w = 0;
+  uint8_t sat = saturation * 255.0;
+
+  if (has_white) {
+    float max = r > g ? (r > b ? r : b) : (g > b ? g : b);
+    float min;
+    if (sat == 0) {
+      r = 0;
+      g = 0;
+      b = 0;
+      min = max;
+    } else {
+      r = (r - max) * saturation + max;
+      g = (g - max) * saturation + max;
+      b = (b - max) * saturation + max;
+      min = r < g ? (r < b ? r : b) : (g < b ? g : b);
+      r -= min;
+      g -= min;
+      b -= min;
+    }
+    w = min * min;
+  } else {
+    // If saturation is not 1, desaturate the color
+    // Moves r/g/b values closer to their average
+    // Not sure if this is the technically correct way but it seems to work?
+    if (sat != 255) {
+      float v = (r + g + b) / 3.0;
+      if (sat == 0) {
+        r = v;
+        b = v;
+        g = v;
+      } else {
+        r = (r - v) * saturation + v;
+        g = (g - v) * saturation + v;
+        b = (b - v) * saturation + v;
+      }
+    }
+  }
+
+  // Brightness, gamma, and color correction are applied by the lookup table
+  uint32_t c = pack_rgbw(lut->r[lut_index(r)],
+                         lut->g[lut_index(g)],
+                         lut->b[lut_index(b)],
+                         lut->w[lut_index(w)]);
+
+  if (debug) printf("%08x\n", c);
+  return c;
+}
+#endif
+
+// Set the number of output lookup tables kept, which should be at least the number of
+// groups so tables are not rebuilt every frame, returns -1 if memory could not be allocated
+int set_output_lut_cache_size(int size) {
+  if (size < OUTPUT_LUT_CACHE_SIZE) size = OUTPUT_LUT_CACHE_SIZE;
+  pthread_mutex_lock(&output_lut_mutex);
+  int result = 0;
+  if (size != output_lut_cache_size) {
+    output_lut *cache = output_lut_default_cache;
+    if (size > OUTPUT_LUT_CACHE_SIZE) cache = calloc(size, sizeof(output_lut));
+    if (cache != NULL) {
+      if (output_lut_cache != output_lut_default_cache) free(output_lut_cache);
+      for (int i = 0; i < OUTPUT_LUT_CACHE_SIZE; i++) output_lut_default_cache[i].valid = 0;
+      output_lut_cache = cache;
+      output_lut_cache_size = size;
+      output_lut_next = 0;
+    } else {
+      result = -1;
+    }
+  }
+  pthread_mutex_unlock(&output_lut_mutex);
+  return result;
+}
+
+// Render float HSV to LEDs with "Rainbow" color transform from FastLED
+uint32_t render_hsv2rgb_rainbow_float(color_hsv_float hsv, color_rgb corr_rgb,
+                                      float saturation, float brightness,
+                                      uint8_t has_white) {
+  uint32_t correction = pack_rgbw(corr_rgb.r, corr_rgb.g, corr_rgb.b, 0);
+  const output_lut *lut = lock_output_lut(correction, brightness, 1.0);
+  uint32_t c = render_hsv2rgb_rainbow_lut(hsv, lut, saturation, has_white);
+  unlock_output_lut();
+  return c;
+}
+
+// Render float RGB to LEDs
+uint32_t render_rgb_float(color_rgb_float rgb, color_rgb corr_rgb,
+                          float saturation, float brightness,
+                          uint8_t has_white) {
+  uint32_t correction = pack_rgbw(corr_rgb.r, corr_rgb.g, corr_rgb.b, 0);
+  const output_lut *lut = lock_output_lut(correction, brightness, 1.0);
+  uint32_t c = render_rgb_lut(rgb, lut, saturation, has_white);
+  unlock_output_lut();
+  return c;
+}
+
+#endif
@@ -0,0 +1,219 @@
+// led-control WS2812B LED Controller Server
+// Copyright 2023 jackw01. Released under the MIT License (see LICENSE for details).
+
+#ifndef __DEFAULT_PATTERNS_H__
+#define __DEFAULT_PATTERNS_H__
+
+#include <math.h>
+#include "animation_utils.h"
+
+// Native versions of the default patterns in animationfunctions.py, without rpi_ws281x
+// so they can also be built and tested on other hosts
+// These must give the same results as the Python versions, so all math is done with
+// doubles in the same order as the NumPy utility functions in vectorfunctions.py
+
+// Modulo with the sign of the divisor like Python's % operator
+static inline double mod_d(double a, double b) {
+  double m = fmod(a, b);
+  if (m != 0 && (b < 0) != (m < 0)) m += b;
+  return m;
+}
+
+static inline double wave_triangle_d(double t) {
+  return fabs(mod_d(t * 2.0, 2.0) - 1.0);
+}
+
+static inline double wave_sine_d(double t) {
+  return cos(t * 6.283) / 2.0 + 0.5;
+}
+
+static inline double wave_cubic_d(double t) {
+  double tri = wave_triangle_d(t);
+  double t2 = 1.0 - tri;
+  return tri > 0.5 ? 1.0 - 4.0 * t2 * t2 * t2 : 4.0 * tri * tri * tri;
+}
+
+static inline double plasma_sines_d(double x, double y, double t,
+                                    double coeff_x, double coeff_y,
+                                    double coeff_x_y, double coeff_dist_xy) {
+  double v = sin((x + t) * coeff_x);
+  v += sin((y + t) * coeff_y);
+  v += sin((x + y + t) * coeff_x_y);
+  v += sin((sqrt(x * x + y * y) + t) * coeff_dist_xy);
+  return v;
+}
+
+static inline double plasma_sines_octave_d(double x, double y, double t,
+                                           int octaves, double lacunarity,
+                                           double persistence) {
+  double vx = x;
+  double vy = y;
+  double freq = 1.0;
+  double amplitude = 1.0;
+  for (int i = 0; i < octaves; i++) {
+    double vx1 = vx;
+    vx += cos(vy * freq + t * freq) * amplitude;
+    vy += sin(vx1 * freq + t * freq) * amplitude;
+    freq *= lacunarity;
+    amplitude *= persistence;
+  }
+  return vx / 2.0;
+}
+
+static inline double fbm_noise_3d_d(double x, double y, double z,
+                                    int octaves, double lacunarity,
+                                    double persistence) {
+  double v = 0;
+  double freq = 1.0;
+  double amplitude = 1.0;
+  for (int i = 0; i < octaves; i++) {
+    v += amplitude * perlin_noise_3d(x * freq, y * freq, z * freq);
+    freq *= lacunarity;
+    amplitude *= persistence;
+  }
+  return v / 2.0;
+}
+
+// Sets c to a color from a palette table of hsv colors
+static inline void palette_color(float c[3], const float *palette, int i) {
+  c[0] = palette[i * 3];
+  c[1] = palette[i * 3 + 1];
+  c[2] = palette[i * 3 + 2];
+}
+
+// Calculates the color of one pixel, returns 1 for hsv, 0 for rgb, or -1 for unknown patterns
+static inline int default_pattern_color(int pattern, float c[3],
+                                        const float *palette, int size,
+                                        double t, double x, double y) {
+  double h, v, wave1, wave2, wave3;
+  switch (pattern) {
+    case 0: // Static Color
+      palette_color(c, palette, 0);
+      return 1;
+    case 1: // Static White
+      c[0] = 0; c[1] = 0; c[2] = 1;
+      return 1;
+    case 2: // Static Gradient 1D
+      palette_color(c, palette, palette_index(x, size));
+      return 1;
+    case 3: // Static Gradient Mirrored 1D
+      palette_color(c, palette, palette_index_mirrored(x, size));
+      return 1;
+    case 100: // Palette Cycle 1D
+      palette_color(c, palette, palette_index(t + x, size));
+      return 1;
+    case 110: // Palette Cycle Mirrored 1D
+      palette_color(c, palette, palette_index_mirrored(t + x, size));
+      return 1;
+    case 112: // Palette Cycle Wipe 1D
+      palette_color(c, palette, palette_index_mirrored(t + x, size));
+      c[2] = mod_d(t + x, 1.0) > 0.5 ? 1.0 : 0.0;
+      return 1;
+    case 114: // Palette Cycle Wipe From Center 1D
+      palette_color(c, palette, palette_index_mirrored(t + x, size));
+      c[2] = (x < 0.5 ? mod_d(t + x, 1.0) : mod_d(t - x, 1.0)) < 0.5 ? 1.0 : 0.0;
+      return 1;
+    case 120: // Palette Cycle Quantized 1D
+      h = mod_d(t + x, 1.0);
+      palette_color(c, palette, palette_index(h - mod_d(h, 1.0 / 6.0), size));
+      return 1;
+    case 130: // Palette Cycle Random 1D
+      h = t + x;
+      palette_color(c, palette, palette_index((h - mod_d(h, 0.2)) / 0.2 * 0.618034, size));
+      return 1;
+    case 140: // Palette Scan Mirrored 1D
+      palette_color(c, palette, palette_index_mirrored(wave_triangle_d(t) + x, size));
+      return 1;
+    case 141: // Palette Bounce Mirrored 1D
+      palette_color(c, palette, palette_index_mirrored(wave_sine_d(t) + x, size));
+      return 1;
+    case 150: // Palette Waves 1D
+      h = (x + t) * 0.1 + x + wave_sine_d(t);
+      palette_color(c, palette, palette_index(wave_triangle_d(h), size));
+      c[2] = wave_sine_d(h + t);
+      return 1;
+    case 160: // Palette Ripples 1D
+    case 161: // Palette Ripples (Fast Cycle) 1D
+      wave1 = wave_sine_d(t / 4 + x);
+      wave2 = wave_sine_d(t / 8 - x);
+      wave3 = wave_sine_d(x + wave1 + wave2);
+      palette_color(c, palette, palette_index(mod_d(wave3, pattern == 160 ? 0.15 : 0.8) + t, size));
+      c[2] = wave1 + wave3;
+      return 1;
+    case 170: // Palette Plasma 2D
+      v = plasma_sines_d(x, y, t, 1.0, 0.5, 0.5, 1.0);
+      palette_color(c, palette, palette_index(wave_triangle_d(v), size));
+      return 1;
+    case 180: // Palette Fractal Plasma 2D
+      v = plasma_sines_octave_d(x, y, t, 7, 2.0, 0.5);
+      palette_color(c, palette, palette_index(wave_triangle_d(v), size));
+      return 1;
+    case 200: // Palette Perlin Noise 2D
+      palette_color(c, palette, palette_index(perlin_noise_3d(x, y, t), size));
+      return 1;
+    case 210: // Palette fBm Noise 2D
+      v = fbm_noise_3d_d(x, y, t * 0.5, 7, 2.0, 0.5);
+      palette_color(c, palette, palette_index(wave_triangle_d(v * 4), size));
+      return 1;
+    case 310: // Hue Cycle 1D
+      c[0] = t + x; c[1] = 1; c[2] = 1;
+      return 1;
+    case 320: // Hue Cycle Quantized 1D
+      h = mod_d(t + x, 1.0);
+      c[0] = h - mod_d(h, 0.1666); c[1] = 1; c[2] = 1;
+      return 1;
+    case 330: // Hue Scan 1D
+      c[0] = wave_triangle_d(t) + x; c[1] = 1; c[2] = 1;
+      return 1;
+    case 331: // Hue Bounce 1D
+      c[0] = wave_sine_d(t) + x; c[1] = 1; c[2] = 1;
+      return 1;
+    case 340: // Hue Waves 1D
+      h = (x + t) * 0.5 + x + wave_sine_d(t);
+      c[0] = h; c[1] = 1; c[2] = wave_sine_d(h + t);
+      return 1;
+    case 350: // Hue Ripples 1D
+      wave1 = wave_sine_d(t / 4 + x);
+      wave2 = wave_sine_d(t / 8 - x);
+      wave3 = wave_sine_d(x + wave1 + wave2);
+      c[0] = mod_d(wave3, 0.15) + t; c[1] = 1; c[2] = wave1 + wave3;
+      return 1;
+    case 400: // RGB Sines 1D
+      c[0] = wave_sine_d(t + x);
+      c[1] = wave_sine_d((t + x) * 1.2);
+      c[2] = wave_sine_d((t + x) * 1.4);
+      return 0;
+    case 410: // RGB Cubics 1D
+      c[0] = wave_cubic_d(t + x);
+      c[1] = wave_cubic_d((t + x) * 1.2);
+      c[2] = wave_cubic_d((t + x) * 1.4);
+      return 0;
+    case 420: // RGB Ripples 1D
+      for (int i = 0; i < 3; i++) {
+        v = x + wave_sine_d(t + 0.05 * i) + wave_sine_d(x + 0.666 * t + 0.05 * i);
+        c[i] = 0.01 / (wave_triangle_d(v) + 0.01);
+      }
+      return 0;
+    case 430: // RGB Plasma (Spectrum Sines) 2D
+      v = plasma_sines_d(x, y, t, 1.0, 0.5, 0.5, 1.0);
+      c[0] = wave_sine_d(v);
+      c[1] = wave_sine_d(v + 0.333);
+      c[2] = wave_sine_d(v + 0.666);
+      return 0;
+    case 440: // RGB Plasma (Fire Sines) 2D
+      v = plasma_sines_d(x, y, t, 1.0, 0.5, 0.5, 1.0);
+      c[0] = 0.9 - wave_sine_d(v);
+      c[1] = wave_sine_d(v + 0.333) - 0.1;
+      c[2] = 0.9 - wave_sine_d(v + 0.666);
+      return 0;
+    case 450: // RGB Fractal Plasma (Fire Sines) 2D
+      v = plasma_sines_octave_d(x, y, t, 7, 2.0, 0.5);
+      c[0] = 1.0 - wave_sine_d(v);
+      c[1] = wave_sine_d(v + 0.333);
+      c[2] = 1.0 - wave_sine_d(v + 0.666);
+      return 0;
+  }
+  return -1;
+}
+
+#endif
@@ -2,16 +2,14 @@
 # Copyright 2023 jackw01. Released under the MIT License (see LICENSE for details).
 
 import math
-import pyfastnoisesimd as fns
+import numpy as np
 
-noise_coords = fns.empty_coords(3)
-noise = fns.Noise()
+def palette_index(t, size):
+    return int(t * (size - 0.1)) & (size - 1)
 
-def float_to_int_1000(t):
-    return int(t * 999.9) % 1000
-
-def float_to_int_1000_mirror(t):
-    return abs(int(t * 1998.9) % 1999 - 999)
+def palette_index_mirrored(t, size):
+    i = int(t * (2 * size - 0.1)) & (2 * size - 1)
+    return size - 1 - min(i, 2 * size - 1 - i)
 
 def wave_pulse(t, duty_cycle):
     return math.ceil(duty_cycle - math.fmod(t, 1.0))
@@ -53,11 +51,66 @@ def plasma_sines_octave(x, y, t, octaves, lacunarity, persistence):
         amplitude *= persistence
     return vx / 2.0
 
+# Perlin noise - port of the reference implementation in animation_utils.h, so noise is
+# the same as in the native driver
+_p = [
+    151, 160, 137, 91, 90, 15, 131, 13, 201, 95, 96, 53, 194, 233, 7,
+    225, 140, 36, 103, 30, 69, 142, 8, 99, 37, 240, 21, 10, 23, 190, 6, 148, 247,
+    120, 234, 75, 0, 26, 197, 62, 94, 252, 219, 203, 117, 35, 11, 32, 57, 177, 33,
+    88, 237, 149, 56, 87, 174, 20, 125, 136, 171, 168, 68, 175, 74, 165, 71, 134,
+    139, 48, 27, 166, 77, 146, 158, 231, 83, 111, 229, 122, 60, 211, 133, 230, 220,
+    105, 92, 41, 55, 46, 245, 40, 244, 102, 143, 54, 65, 25, 63, 161, 1, 216, 80,
+    73, 209, 76, 132, 187, 208, 89, 18, 169, 200, 196, 135, 130, 116, 188, 159, 86,
+    164, 100, 109, 198, 173, 186, 3, 64, 52, 217, 226, 250, 124, 123, 5, 202, 38,
+    147, 118, 126, 255, 82, 85, 212, 207, 206, 59, 227, 47, 16, 58, 17, 182, 189,
+    28, 42, 223, 183, 170, 213, 119, 248, 152, 2, 44, 154, 163, 70, 221, 153, 101,
+    155, 167, 43, 172, 9, 129, 22, 39, 253, 19, 98, 108, 110, 79, 113, 224, 232,
+    178, 185, 112, 104, 218, 246, 97, 228, 251, 34, 242, 193, 238, 210, 144, 12,
+    191, 179, 162, 241, 81, 51, 145, 235, 249, 14, 239, 107, 49, 192, 214, 31, 181,
+    199, 106, 157, 184, 84, 204, 176, 115, 121, 50, 45, 127, 4, 150, 254, 138, 236,
+    205, 93, 222, 114, 67, 29, 24, 72, 243, 141, 128, 195, 78, 66, 215, 61, 156, 180,
+] * 2
+_p_array = np.array(_p, dtype=np.int64)
+
+def fade(t):
+    return t * t * t * (t * (t * 6 - 15) + 10)
+
+def lerp(t, a, b):
+    return a + t * (b - a)
+
+def grad(hash, x, y, z):
+    h = hash & 15
+    u = x if h < 8 else y
+    v = y if h < 4 else (x if h == 12 or h == 14 else z)
+    return (-u if h & 1 else u) + (-v if h & 2 else v)
+
 def perlin_noise_3d(x, y, z):
-    noise_coords[0,:] = x
-    noise_coords[1,:] = y
-    noise_coords[2,:] = z
-    return noise.genFromCoords(noise_coords)[0]
+    fx = math.floor(x)
+    fy = math.floor(y)
+    fz = math.floor(z)
+    X = int(fx) & 255
+    Y = int(fy) & 255
+    Z = int(fz) & 255
+    x -= fx
+    y -= fy
+    z -= fz
+    u = fade(x)
+    v = fade(y)
+    w = fade(z)
+    A = _p[X] + Y
+    AA = _p[A] + Z
+    AB = _p[A + 1] + Z
+    B = _p[X + 1] + Y
+    BA = _p[B] + Z
+    BB = _p[B + 1] + Z
+    return (lerp(w, lerp(v, lerp(u, grad(_p[AA], x, y, z),
+                                    grad(_p[BA], x - 1, y, z)),
+                            lerp(u, grad(_p[AB], x, y - 1, z),
+                                    grad(_p[BB], x - 1, y - 1, z))),
+                    lerp(v, lerp(u, grad(_p[AA + 1], x, y, z - 1),
+                                    grad(_p[BA + 1], x - 1, y, z - 1)),
+                            lerp(u, grad(_p[AB + 1], x, y - 1, z - 1),
+                                    grad(_p[BB + 1], x - 1, y - 1, z - 1)))) + 1.0) / 2.0
 
 def fbm_noise_3d(x, y, z, octaves, lacunarity, persistence):
     v = 0
@@ -69,6 +122,53 @@ def fbm_noise_3d(x, y, z, octaves, lacunarity, persistence):
         amplitude *= persistence
     return v / 2.0
 
+# Array versions of the noise functions for vectorized patterns
+# The 8 corners of every cell, and every octave of fBm noise, are computed in one batch of
+# NumPy operations. Gradients are looked up in a table like in animation_utils.h
+
+_gradients = np.array([
+    (1, 1, 0), (-1, 1, 0), (1, -1, 0), (-1, -1, 0),
+    (1, 0, 1), (-1, 0, 1), (1, 0, -1), (-1, 0, -1),
+    (0, 1, 1), (0, -1, 1), (0, 1, -1), (0, -1, -1),
+    (1, 1, 0), (0, -1, 1), (-1, 1, 0), (0, -1, -1),
+], dtype=np.float64)
+# Gradient for each index into the permutation table, one array per axis
+_grad_x, _grad_y, _grad_z = (np.ascontiguousarray(g) for g in _gradients[_p_array & 15].T)
+
+def perlin_noise_3d_array(x, y, z):
+    x, y, z = np.broadcast_arrays(np.asarray(x, dtype=np.float64),
+                                  np.asarray(y, dtype=np.float64),
+                                  np.asarray(z, dtype=np.float64))
+    shape = x.shape
+    x, y, z = x.ravel(), y.ravel(), z.ravel()
+    fx, fy, fz = np.floor(x), np.floor(y), np.floor(z)
+    X = fx.astype(np.intp) & 255
+    Y = fy.astype(np.intp) & 255
+    Z = fz.astype(np.intp) & 255
+    x, y, z = x - fx, y - fy, z - fz
+    # Permutation table indices of the corners, indexed by [x offset, y offset, z offset]
+    A = _p_array[np.stack((X, X + 1))] + Y
+    AA = _p_array[np.stack((A, A + 1), axis=1)] + Z
+    corners = np.stack((AA, AA + 1), axis=2)
+    g = _grad_x[corners] * np.stack((x, x - 1))[:, None, None]
+    g += _grad_y[corners] * np.stack((y, y - 1))[None, :, None]
+    g += _grad_z[corners] * np.stack((z, z - 1))[None, None, :]
+    g = lerp(fade(z), g[:, :, 0], g[:, :, 1])
+    g = lerp(fade(y), g[:, 0], g[:, 1])
+    return ((lerp(fade(x), g[0], g[1]) + 1.0) / 2.0).reshape(shape)
+
+def fbm_noise_3d_array(x, y, z, octaves, lacunarity, persistence):
+    x, y, z = np.broadcast_arrays(x, y, z)
+    # Multiplied in the same order as fbm_noise_3d, with octaves along the first axis
+    octaves = int(octaves)
+    shape = (-1,) + (1,) * x.ndim
+    freq = np.cumprod([1.0] + [lacunarity] * octaves)[:octaves].reshape(shape)
+    amplitude = np.cumprod([1.0] + [persistence] * octaves)[:octaves].reshape(shape)
+    noise = perlin_noise_3d_array(np.multiply(x, freq),
+                                  np.multiply(y, freq),
+                                  np.multiply(z, freq))
+    return np.sum(noise * amplitude, axis=0) / 2.0
+
 def clamp(x, min, max):
     if x < min:
         return min
@@ -4,9 +4,8 @@
 #ifndef __LED_RENDER_H__
 #define __LED_RENDER_H__
 
-#include <math.h>
-
-const uint8_t debug = 0;
+#include "color_render.h"
+#include "default_patterns.h"
 
 ws2811_channel_t *ws2811_channel_get(ws2811_t *ws, int channelnum) {
   return &ws->channel[channelnum];
@@ -25,273 +24,6 @@ int ws2811_led_set(ws2811_channel_t *channel, int lednum, uint32_t color) {
 
 // Important stuff starts here
 
-// Unpack 24 bit rgb from int
-color_rgb unpack_rgb(uint32_t in) {
-  uint8_t r = in >> 16 & 0xff;
-  uint8_t g = in >> 8 & 0xff;
-  uint8_t b = in & 0xff;
-  return (color_rgb){ r, g, b };
-}
-
-// Pack 32 bit rgbw to int
-uint32_t pack_rgbw(uint8_t r, uint8_t g, uint8_t b, uint8_t w) {
-  return (w << 24) | (r << 16) | (g << 8) | b;
-}
-
-// Scale one 8 bit int by another (a * b / 255)
-uint8_t scale_8(uint8_t a, uint8_t b) {
-  return ((uint16_t)a * (uint16_t)b) >> 8;
-}
-
-// Float clamp
-float clamp(float d, float min, float max) {
-  const float t = d < min ? min : d;
-  return t > max ? max : t;
-}
-
-color_rgb_float blackbody_to_rgb(float kelvin) {
-  // See http://www.tannerhelland.com/4435/convert-temperature-rgb-algorithm-code/
-  // See http://www.zombieprototypes.com/?p=210
-
-  float tmp_internal = kelvin / 100.0;
-  float r_out = 0.0;
-  float g_out = 0.0;
-  float b_out = 0.0;
-
-  if (tmp_internal <= 66) {
-    float xg = tmp_internal - 2.0;
-    r_out = 1.0;
-    g_out = clamp((-155.255 - 0.446 * xg + 104.492 * logf(xg)) / 255.0, 0, 1);
-  } else {
-    float xr = tmp_internal - 55.0;
-    float xg = tmp_internal - 50.0;
-    r_out = clamp((351.977 + 0.114 * xr - 40.254 * logf(xr)) / 255.0, 0, 1);
-    g_out = clamp((325.449 + 0.079 * xg - 28.085 * logf(xg)) / 255.0, 0, 1);
-  }
-
-  if (tmp_internal >= 66) {
-    b_out = 1.0;
-  } else if (tmp_internal <= 19) {
-    b_out = 0.0;
-  } else {
-    float xb = tmp_internal - 10.0;
-    b_out = clamp((-254.769 + 0.827 * xb + 115.680 * logf(xb)) / 255.0, 0, 1);
-  }
-
-  return (color_rgb_float){r_out, g_out, b_out};
-}
-
-color_rgb_float blackbody_correction_rgb(color_rgb_float rgb, float kelvin) {
-  color_rgb_float bb = blackbody_to_rgb(kelvin);
-  return (color_rgb_float){bb.r * rgb.r, bb.g * rgb.g, bb.b * rgb.b};
-}
-
-// Render float HSV to LEDs with "Rainbow" color transform from FastLED
-uint32_t render_hsv2rgb_rainbow_float(color_hsv_float hsv, color_rgb corr_rgb,
-                                      float saturation, float brightness,
-                                      uint8_t has_white) {
-  uint8_t hue = fmod(hsv.hue, 1.0) * 255.0;
-  uint8_t sat = hsv.sat * saturation * 255.0;
-  uint8_t val = (hsv.val * hsv.val) * 255;
-  if (val > 0 && val < 255) val += 1;
-  val = scale_8(val, brightness * 255);
-  uint8_t r, g, b, w;
-
-  w = 0;
-
-  uint8_t offset = hue & 0x1F; // 0..31
-  uint8_t offset8 = offset << 3;
-  uint8_t third = offset8 / 3;
-
-  if (!(hue & 0x80)) {
-    if (!(hue & 0x40)) {
-      // section 0-1
-      if (!(hue & 0x20)) {
-        // case 0: // R -> O
-        r = 255 - third;
-        g = third;
-        b = 0;
-      } else {
-        // case 1: // O -> Y
-        r = 171;
-        g = 85 + third;
-        b = 0;
-      }
-    } else {
-      // section 2-3
-      if (!(hue & 0x20)) {
-        // case 2: // Y -> G
-        r = 171 - third * 2;
-        g = 170 + third;
-        b = 0;
-      } else {
-        // case 3: // G -> A
-        r = 0;
-        g = 255 - third;
-        b = third;
-      }
-    }
-  } else {
-    // section 4-7
-    if (!(hue & 0x40))  {
-      if (!(hue & 0x20)) {
-        // case 4: // A -> B
-        r = 0;
-        uint8_t twothirds = third * 2;
-        g = 171 - twothirds; // K170?
-        b = 85 + twothirds;
-      } else {
-        // case 5: // B -> P
-        r = third;
-        g = 0;
-        b = 255 - third;
-      }
-    } else {
-      if (!(hue & 0x20)) {
-        // case 6: // P -- K
-        r = 85 + third;
-        g = 0;
-        b = 171 - third;
-      } else {
-        // case 7: // K -> R
-        r = 170 + third;
-        g = 0;
-        b = 85 - third;
-      }
-    }
-  }
-
-  // Scale down colors if we're desaturated at all
-  // and add the brightness_floor to r, g, and b.
-  if (has_white) {
-    if (sat != 255) {
-      if (sat == 0) {
-        r = 0;
-        b = 0;
-        g = 0;
-        w = 255;
-      } else {
-        uint8_t desat = 255 - sat;
-        desat = scale_8(desat, desat);
-        r = scale_8(r, sat);
-        g = scale_8(g, sat);
-        b = scale_8(b, sat);
-        w = desat;
-      }
-    }
-  } else {
-    if (sat != 255) {
-      if (sat == 0) {
-        r = 255;
-        b = 255;
-        g = 255;
-      } else {
-        uint8_t desat = 255 - sat;
-        desat = scale_8(desat, desat);
-        r = scale_8(r, sat) + desat;
-        g = scale_8(g, sat) + desat;
-        b = scale_8(b, sat) + desat;
-      }
-    }
-    /*
-    if (gamma != 1) {
-      r = pow((float)r / 255.0, gamma) * 255;
-      g = pow((float)g / 255.0, gamma) * 255;
-      b = pow((float)b / 255.0, gamma) * 255;
-    }
-    */
-  }
-
-  // Now scale everything down if we're at value < 255.
-  if (val != 255) {
-    if (val == 0) {
-      r = 0;
-      g = 0;
-      b = 0;
-      w = 0;
-    } else {
-      r = scale_8(r, val);
-      g = scale_8(g, val);
-      b = scale_8(b, val);
-      w = scale_8(w, val);
-    }
-  }
-
-  r = scale_8(r, corr_rgb.r);
-  g = scale_8(g, corr_rgb.g);
-  b = scale_8(b, corr_rgb.b);
-
-  if (debug) printf("%d %d %d %d\n", r, g, b, w);
-  return pack_rgbw(r, g, b, w);
-}
-
-// Render float RGB to LEDs
-uint32_t render_rgb_float(color_rgb_float rgb, color_rgb corr_rgb,
-                          float saturation, float brightness,
-                          uint8_t has_white) {
-  float r = clamp(rgb.r, 0, 1);
-  float g = clamp(rgb.g, 0, 1);
-  float b = clamp(rgb.b, 0, 1);
-  float w = 0;
-  uint8_t sat = saturation * 255.0;
-
-  if (has_white) {
-    float max = r > g ? (r > b ? r : b) : (g > b ? g : b);
-    float min;
-    if (sat == 0) {
-      r = 0;
-      g = 0;
-      b = 0;
-      min = max;
-    } else {
-      r = (r - max) * saturation + max;
-      g = (g - max) * saturation + max;
-      b = (b - max) * saturation + max;
-      min = r < g ? (r < b ? r : b) : (g < b ? g : b);
-      r -= min;
-      g -= min;
-      b -= min;
-    }
-    w = min * min;
-  } else {
-    // If saturation is not 1, desaturate the color
-    // Moves r/g/b values closer to their average
-    // Not sure if this is the technically correct way but it seems to work?
-    if (sat != 255) {
-      float v = (r + g + b) / 3.0;
-      if (sat == 0) {
-        r = v;
-        b = v;
-        g = v;
-      } else {
-        r = (r - v) * saturation + v;
-        g = (g - v) * saturation + v;
-        b = (b - v) * saturation + v;
-      }
-    }
-  }
-
-  /*
-  if (gamma != 1) {
-    r = pow(r, gamma);
-    g = pow(g, gamma);
-    b = pow(b, gamma);
-  }
-  */
-
-  uint8_t r8 = r * brightness * 255;
-  uint8_t g8 = g * brightness * 255;
-  uint8_t b8 = b * brightness * 255;
-  uint8_t w8 = w * brightness * 255;
-
-  r8 = scale_8(r8, corr_rgb.r);
-  g8 = scale_8(g8, corr_rgb.g);
-  b8 = scale_8(b8, corr_rgb.b);
-
-  if (debug) printf("%d %d %d %d\n", r8, g8, b8, w8);
-  return pack_rgbw(r8, g8, b8, w8);
-}
-
 // Render array of hsv pixels and display
 int ws2811_hsv_render_all_float(ws2811_t *ws, ws2811_channel_t *channel,
                                 color_hsv_float values[], int count,
@@ -299,12 +31,11 @@ int ws2811_hsv_render_all_float(ws2811_t *ws, ws2811_channel_t *channel,
                                 float brightness, float gamma,
                                 uint8_t has_white){
   if (count > channel->count) return -1;
-  color_rgb corr_rgb = unpack_rgb(correction);
+  const output_lut *lut = lock_output_lut(correction, brightness, gamma);
   for (int i = 0; i < count; i++) {
-    channel->leds[i] = render_hsv2rgb_rainbow_float(values[i], corr_rgb,
-                                                    saturation, brightness,
-                                                    has_white);
+    channel->leds[i] = render_hsv2rgb_rainbow_lut(values[i], lut, saturation, has_white);
   }
+  unlock_output_lut();
   ws2811_render(ws);
   return 1;
 }
@@ -316,12 +47,11 @@ void ws2811_hsv_render_range_float(ws2811_channel_t *channel,
                                    float brightness, float gamma,
                                    uint8_t has_white) {
   if (end > channel->count) return;
-  color_rgb corr_rgb = unpack_rgb(correction);
+  const output_lut *lut = lock_output_lut(correction, brightness, gamma);
   for (int i = start; i < end; i++) {
-    channel->leds[i] = render_hsv2rgb_rainbow_float(values[i - start], corr_rgb,
-                                                    saturation, brightness,
-                                                    has_white);
+    channel->leds[i] = render_hsv2rgb_rainbow_lut(values[i - start], lut, saturation, has_white);
   }
+  unlock_output_lut();
 }
 
 // Render array of rgb pixels and display
@@ -331,12 +61,11 @@ int ws2811_rgb_render_all_float(ws2811_t *ws, ws2811_channel_t *channel,
                                 float brightness, float gamma,
                                 uint8_t has_white) {
   if (count > channel->count) return -1;
-  color_rgb corr_rgb = unpack_rgb(correction);
+  const output_lut *lut = lock_output_lut(correction, brightness, gamma);
   for (int i = 0; i < count; i++) {
-    channel->leds[i] = render_rgb_float(values[i], corr_rgb,
-                                        saturation, brightness,
-                                        has_white);
+    channel->leds[i] = render_rgb_lut(values[i], lut, saturation, has_white);
   }
+  unlock_output_lut();
   ws2811_render(ws);
   return 1;
 }
@@ -348,12 +77,103 @@ void ws2811_rgb_render_range_float(ws2811_channel_t *channel,
                                    float brightness, float gamma,
                                    uint8_t has_white) {
   if (end > channel->count) return;
-  color_rgb corr_rgb = unpack_rgb(correction);
+  const output_lut *lut = lock_output_lut(correction, brightness, gamma);
+  for (int i = start; i < end; i++) {
+    channel->leds[i] = render_rgb_lut(values[i - start], lut, saturation, has_white);
+  }
+  unlock_output_lut();
+}
+
+// Render range of hsv pixels directly from a buffer of 3 floats per pixel
+int ws2811_hsv_render_range_buffer(ws2811_channel_t *channel,
+                                   const float *buffer, int buffer_length,
+                                   int start, int end,
+                                   uint32_t correction, float saturation,
+                                   float brightness, float gamma,
+                                   uint8_t has_white) {
+  if (start < 0 || end > channel->count) return -1;
+  if (buffer_length < (end - start) * 3) return -1;
+  const color_hsv_float *values = (const color_hsv_float *)buffer;
+  const output_lut *lut = lock_output_lut(correction, brightness, gamma);
+  for (int i = start; i < end; i++) {
+    channel->leds[i] = render_hsv2rgb_rainbow_lut(values[i - start], lut, saturation, has_white);
+  }
+  unlock_output_lut();
+  return 0;
+}
+
+// Render range of rgb pixels directly from a buffer of 3 floats per pixel
+int ws2811_rgb_render_range_buffer(ws2811_channel_t *channel,
+                                   const float *buffer, int buffer_length,
+                                   int start, int end,
+                                   uint32_t correction, float saturation,
+                                   float brightness, float gamma,
+                                   uint8_t has_white) {
+  if (start < 0 || end > channel->count) return -1;
+  if (buffer_length < (end - start) * 3) return -1;
+  const color_rgb_float *values = (const color_rgb_float *)buffer;
+  const output_lut *lut = lock_output_lut(correction, brightness, gamma);
+  for (int i = start; i < end; i++) {
+    channel->leds[i] = render_rgb_lut(values[i - start], lut, saturation, has_white);
+  }
+  unlock_output_lut();
+  return 0;
+}
+
+// Render range of rgb pixels directly from a buffer of 3 bytes per pixel, used for sACN data
+int ws2811_rgb_render_range_buffer_uint8(ws2811_channel_t *channel,
+                                         const uint8_t *colors, int colors_length,
+                                         int start, int end,
+                                         uint32_t correction, float saturation,
+                                         float brightness, float gamma,
+                                         uint8_t has_white) {
+  if (start < 0 || end > channel->count) return -1;
+  if (colors_length < (end - start) * 3) return -1;
+  const output_lut *lut = lock_output_lut(correction, brightness, gamma);
   for (int i = start; i < end; i++) {
-    channel->leds[i] = render_rgb_float(values[i - start], corr_rgb,
-                                        saturation, brightness,
-                                        has_white);
+    const uint8_t *c = colors + (i - start) * 3;
+    channel->leds[i] = render_rgb_lut((color_rgb_float){c[0] / 255.0f, c[1] / 255.0f, c[2] / 255.0f},
+                                      lut, saturation, has_white);
   }
+  unlock_output_lut();
+  return 0;
+}
+
+// Render a palette lookup table of hsv colors into a table of output colors, so pixels
+// colored from the palette can be rendered by looking up their palette index
+// Called while other threads may be rendering, so the output lookup table is not shared
+int ws2811_hsv_render_palette_table(const float *palette, int palette_length,
+                                    uint32_t *table, int table_length,
+                                    uint32_t correction, float saturation,
+                                    float brightness, float gamma,
+                                    uint8_t has_white) {
+  int size = palette_length / 3;
+  if (table_length < size) return -1;
+  const color_hsv_float *values = (const color_hsv_float *)palette;
+  output_lut *lut = malloc(sizeof(output_lut));
+  if (lut == NULL) return -1;
+  build_output_lut(lut, correction, brightness, gamma);
+  for (int i = 0; i < size; i++) {
+    table[i] = render_hsv2rgb_rainbow_lut(values[i], lut, saturation, has_white);
+  }
+  free(lut);
+  return 0;
+}
+
+// Render range of pixels from a buffer of palette indices and a table of output colors
+// The table size must be a power of 2, indices outside the table wrap
+int ws2811_render_range_indexed(ws2811_channel_t *channel,
+                                const uint32_t *indices, int indices_length,
+                                const uint32_t *table, int table_length,
+                                int start, int end) {
+  if (start < 0 || end > channel->count) return -1;
+  if (indices_length < end - start) return -1;
+  if (table_length < 1 || (table_length & (table_length - 1)) != 0) return -1;
+  uint32_t mask = table_length - 1;
+  for (int i = start; i < end; i++) {
+    channel->leds[i] = table[indices[i - start] & mask];
+  }
+  return 0;
 }
 
 // Render calibration
@@ -372,4 +192,37 @@ int ws2811_rgb_render_calibration(ws2811_t *ws, ws2811_channel_t *channel,
   return 1;
 }
 
+// Render a default pattern for a range of pixels
+// mapping contains 3 doubles (x, y, z) per pixel in the range, palette contains the
+// current palette table as 3 floats per color, and the number of colors must be a power of 2
+int ws2811_render_default_pattern_range(ws2811_channel_t *channel, int pattern,
+                                        const double *mapping, int mapping_length,
+                                        const float *palette, int palette_length,
+                                        int start, int end, double t,
+                                        uint32_t correction, float saturation,
+                                        float brightness, float gamma,
+                                        uint8_t has_white) {
+  if (start < 0 || end > channel->count) return -1;
+  if (mapping_length < (end - start) * 3) return -1;
+  int size = palette_length / 3;
+  if (size < 2 || (size & (size - 1)) != 0) return -1;
+  float c[3];
+  if (default_pattern_color(pattern, c, palette, size, t, 0.0, 0.0) < 0) return -1;
+  const output_lut *lut = lock_output_lut(correction, brightness, gamma);
+  for (int i = start; i < end; i++) {
+    const double *xyz = mapping + (i - start) * 3;
+    if (default_pattern_color(pattern, c, palette, size, t, xyz[0], xyz[1])) {
+      color_hsv_float hsv;
+      hsv.h = c[0]; hsv.s = c[1]; hsv.v = c[2];
+      channel->leds[i] = render_hsv2rgb_rainbow_lut(hsv, lut, saturation, has_white);
+    } else {
+      color_rgb_float rgb;
+      rgb.r = c[0]; rgb.g = c[1]; rgb.b = c[2];
+      channel->leds[i] = render_rgb_lut(rgb, lut, saturation, has_white);
+    }
+  }
+  unlock_output_lut();
+  return 0;
+}
+
 #endif
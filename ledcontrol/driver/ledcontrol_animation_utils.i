@@ -0,0 +1,173 @@
+// led-control WS2812B LED Controller Server
+// Copyright 2023 jackw01. Released under the MIT License (see LICENSE for details).
+
+// SWIG interface file for the animation and color utility functions without rpi_ws281x,
+// used on hosts other than the Raspberry Pi in place of driver_non_raspberry_pi.py
+
+%module ledcontrol_animation_utils
+
+%include "stdint.i"
+
+%typemap(in) color_rgb_float rgb {
+  if (!PySequence_Check($input) || PySequence_Length($input) != 3) {
+    PyErr_SetString(PyExc_TypeError, "Expecting a sequence of 3 floats");
+    SWIG_fail;
+  }
+  int i;
+  for (i = 0; i < 3; i++) {
+    PyObject *o = PySequence_GetItem($input, i);
+    $1.raw[i] = (float)PyFloat_AsDouble(o);
+    Py_DECREF(o);
+  }
+  if (PyErr_Occurred()) SWIG_fail;
+}
+
+%typemap(out) color_rgb_float {
+  $result = PyList_New(3);
+  PyList_SetItem($result, 0, PyFloat_FromDouble($1.r));
+  PyList_SetItem($result, 1, PyFloat_FromDouble($1.g));
+  PyList_SetItem($result, 2, PyFloat_FromDouble($1.b));
+}
+
+%{
+static int is_buffer_format(const char *format, char type) {
+  if (format == NULL) return type == 'B';
+  if (format[0] == '@' || format[0] == '=' || format[0] == '<') format++;
+  return format[0] == type && format[1] == '\0';
+}
+%}
+
+// Any C-contiguous float64 buffer (numpy array, array('d'), memoryview) is read in place
+%typemap(in) (const double *buffer, int buffer_length) (Py_buffer view) {
+  if (PyObject_GetBuffer($input, &view, PyBUF_C_CONTIGUOUS | PyBUF_FORMAT) != 0) {
+    SWIG_fail;
+  }
+  if (view.itemsize != sizeof(double) || !is_buffer_format(view.format, 'd')) {
+    PyBuffer_Release(&view);
+    PyErr_SetString(PyExc_TypeError, "Expecting a C-contiguous buffer of float64s");
+    SWIG_fail;
+  }
+  $1 = (double *)view.buf;
+  $2 = (int)(view.len / sizeof(double));
+}
+
+%typemap(freearg) (const double *buffer, int buffer_length) {
+  if ($1) PyBuffer_Release(&view$argnum);
+}
+
+// Output buffers are written in place
+%typemap(in) (double *buffer, int buffer_length) (Py_buffer view) {
+  if (PyObject_GetBuffer($input, &view, PyBUF_C_CONTIGUOUS | PyBUF_FORMAT | PyBUF_WRITABLE) != 0) {
+    SWIG_fail;
+  }
+  if (view.itemsize != sizeof(double) || !is_buffer_format(view.format, 'd')) {
+    PyBuffer_Release(&view);
+    PyErr_SetString(PyExc_TypeError, "Expecting a writable C-contiguous buffer of float64s");
+    SWIG_fail;
+  }
+  $1 = (double *)view.buf;
+  $2 = (int)(view.len / sizeof(double));
+}
+
+%typemap(freearg) (double *buffer, int buffer_length) {
+  if ($1) PyBuffer_Release(&view$argnum);
+}
+
+// Any C-contiguous float32 buffer is read in place
+%typemap(in) (const float *buffer, int buffer_length) (Py_buffer view) {
+  if (PyObject_GetBuffer($input, &view, PyBUF_C_CONTIGUOUS | PyBUF_FORMAT) != 0) {
+    SWIG_fail;
+  }
+  if (view.itemsize != sizeof(float) || !is_buffer_format(view.format, 'f')) {
+    PyBuffer_Release(&view);
+    PyErr_SetString(PyExc_TypeError, "Expecting a C-contiguous buffer of float32s");
+    SWIG_fail;
+  }
+  $1 = (float *)view.buf;
+  $2 = (int)(view.len / sizeof(float));
+}
+
+%typemap(freearg) (const float *buffer, int buffer_length) {
+  if ($1) PyBuffer_Release(&view$argnum);
+}
+
+%apply (const double *buffer, int buffer_length) { (const double *points, int points_length) };
+%apply (const double *buffer, int buffer_length) { (const double *mapping, int mapping_length) };
+%apply (const float *buffer, int buffer_length) { (const float *palette, int palette_length) };
+%apply (double *buffer, int buffer_length) { (double *out, int out_length) };
+
+// Release the GIL while generating noise for a buffer
+%exception perlin_noise_3d_buffer {
+  Py_BEGIN_ALLOW_THREADS
+  $action
+  Py_END_ALLOW_THREADS
+}
+
+%exception fbm_noise_3d_buffer {
+  Py_BEGIN_ALLOW_THREADS
+  $action
+  Py_END_ALLOW_THREADS
+}
+
+%{
+#include <stdint.h>
+#include "color_types.h"
+#include "color_render.h"
+#include "animation_utils.h"
+#include "default_patterns.h"
+%}
+
+%include "color_types.h"
+%include "color_render.h"
+%include "animation_utils.h"
+
+// Noise for many points at once, used by the vectorized versions in vectorfunctions.py
+// points contains 3 doubles (x, y, z) per point, all math is done with doubles in the same
+// order as the NumPy versions so both give the same results
+%inline %{
+int perlin_noise_3d_buffer(const double *points, int points_length, double *out, int out_length) {
+  if (points_length != out_length * 3) return -1;
+  for (int i = 0; i < out_length; i++) {
+    out[i] = perlin_noise_3d(points[i * 3], points[i * 3 + 1], points[i * 3 + 2]);
+  }
+  return 0;
+}
+
+int fbm_noise_3d_buffer(const double *points, int points_length, double *out, int out_length,
+                        int octaves, double lacunarity, double persistence) {
+  if (points_length != out_length * 3) return -1;
+  for (int i = 0; i < out_length; i++) {
+    const double *xyz = points + i * 3;
+    double v = 0;
+    double freq = 1.0;
+    double amplitude = 1.0;
+    for (int j = 0; j < octaves; j++) {
+      v += amplitude * perlin_noise_3d(xyz[0] * freq, xyz[1] * freq, xyz[2] * freq);
+      freq *= lacunarity;
+      amplitude *= persistence;
+    }
+    out[i] = v / 2.0;
+  }
+  return 0;
+}
+
+// Colors of a default pattern for many pixels before output conversion, used to test the
+// native default patterns against the Python versions in animationfunctions.py
+// Returns 1 for hsv, 0 for rgb, or -1 for unknown patterns and invalid arguments
+int default_pattern_colors_buffer(int pattern, const double *mapping, int mapping_length,
+                                  const float *palette, int palette_length, double t,
+                                  double *out, int out_length) {
+  int size = palette_length / 3;
+  if (mapping_length != out_length || size < 2 || (size & (size - 1)) != 0) return -1;
+  float c[3];
+  int mode = default_pattern_color(pattern, c, palette, size, t, 0.0, 0.0);
+  if (mode < 0) return -1;
+  for (int i = 0; i < out_length / 3; i++) {
+    default_pattern_color(pattern, c, palette, size, t, mapping[i * 3], mapping[i * 3 + 1]);
+    out[i * 3] = c[0];
+    out[i * 3 + 1] = c[1];
+    out[i * 3 + 2] = c[2];
+  }
+  return mode;
+}
+%}
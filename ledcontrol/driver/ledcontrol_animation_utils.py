@@ -0,0 +1,218 @@
+# This file was automatically generated by SWIG (http://www.swig.org).
+# Version 4.0.2
+#
+# Do not make changes to this file unless you know what you are doing--modify
+# the SWIG interface file instead.
+
+from sys import version_info as _swig_python_version_info
+if _swig_python_version_info < (2, 7, 0):
+    raise RuntimeError("Python 2.7 or later required")
+
+# Import the low-level C/C++ module
+if __package__ or "." in __name__:
+    from . import _ledcontrol_animation_utils
+else:
+    import _ledcontrol_animation_utils
+
+try:
+    import builtins as __builtin__
+except ImportError:
+    import __builtin__
+
+def _swig_repr(self):
+    try:
+        strthis = "proxy of " + self.this.__repr__()
+    except __builtin__.Exception:
+        strthis = ""
+    return "<%s.%s; %s >" % (self.__class__.__module__, self.__class__.__name__, strthis,)
+
+
+def _swig_setattr_nondynamic_instance_variable(set):
+    def set_instance_attr(self, name, value):
+        if name == "thisown":
+            self.this.own(value)
+        elif name == "this":
+            set(self, name, value)
+        elif hasattr(self, name) and isinstance(getattr(type(self), name), property):
+            set(self, name, value)
+        else:
+            raise AttributeError("You cannot add instance attributes to %s" % self)
+    return set_instance_attr
+
+
+def _swig_setattr_nondynamic_class_variable(set):
+    def set_class_attr(cls, name, value):
+        if hasattr(cls, name) and not isinstance(getattr(cls, name), property):
+            set(cls, name, value)
+        else:
+            raise AttributeError("You cannot add class attributes to %s" % cls)
+    return set_class_attr
+
+
+def _swig_add_metaclass(metaclass):
+    """Class decorator for adding a metaclass to a SWIG wrapped class - a slimmed down version of six.add_metaclass"""
+    def wrapper(cls):
+        return metaclass(cls.__name__, cls.__bases__, cls.__dict__.copy())
+    return wrapper
+
+
+class _SwigNonDynamicMeta(type):
+    """Meta class to enforce nondynamic attributes (no new attributes) for a class"""
+    __setattr__ = _swig_setattr_nondynamic_class_variable(type.__setattr__)
+
+
+class color_hsv(object):
+    thisown = property(lambda x: x.this.own(), lambda x, v: x.this.own(v), doc="The membership flag")
+    __repr__ = _swig_repr
+    hue = property(_ledcontrol_animation_utils.color_hsv_hue_get, _ledcontrol_animation_utils.color_hsv_hue_set)
+    h = property(_ledcontrol_animation_utils.color_hsv_h_get, _ledcontrol_animation_utils.color_hsv_h_set)
+    saturation = property(_ledcontrol_animation_utils.color_hsv_saturation_get, _ledcontrol_animation_utils.color_hsv_saturation_set)
+    sat = property(_ledcontrol_animation_utils.color_hsv_sat_get, _ledcontrol_animation_utils.color_hsv_sat_set)
+    s = property(_ledcontrol_animation_utils.color_hsv_s_get, _ledcontrol_animation_utils.color_hsv_s_set)
+    value = property(_ledcontrol_animation_utils.color_hsv_value_get, _ledcontrol_animation_utils.color_hsv_value_set)
+    val = property(_ledcontrol_animation_utils.color_hsv_val_get, _ledcontrol_animation_utils.color_hsv_val_set)
+    v = property(_ledcontrol_animation_utils.color_hsv_v_get, _ledcontrol_animation_utils.color_hsv_v_set)
+    raw = property(_ledcontrol_animation_utils.color_hsv_raw_get, _ledcontrol_animation_utils.color_hsv_raw_set)
+
+    def __init__(self):
+        _ledcontrol_animation_utils.color_hsv_swiginit(self, _ledcontrol_animation_utils.new_color_hsv())
+    __swig_destroy__ = _ledcontrol_animation_utils.delete_color_hsv
+
+# Register color_hsv in _ledcontrol_animation_utils:
+_ledcontrol_animation_utils.color_hsv_swigregister(color_hsv)
+
+class color_hsv_float(object):
+    thisown = property(lambda x: x.this.own(), lambda x, v: x.this.own(v), doc="The membership flag")
+    __repr__ = _swig_repr
+    hue = property(_ledcontrol_animation_utils.color_hsv_float_hue_get, _ledcontrol_animation_utils.color_hsv_float_hue_set)
+    h = property(_ledcontrol_animation_utils.color_hsv_float_h_get, _ledcontrol_animation_utils.color_hsv_float_h_set)
+    saturation = property(_ledcontrol_animation_utils.color_hsv_float_saturation_get, _ledcontrol_animation_utils.color_hsv_float_saturation_set)
+    sat = property(_ledcontrol_animation_utils.color_hsv_float_sat_get, _ledcontrol_animation_utils.color_hsv_float_sat_set)
+    s = property(_ledcontrol_animation_utils.color_hsv_float_s_get, _ledcontrol_animation_utils.color_hsv_float_s_set)
+    value = property(_ledcontrol_animation_utils.color_hsv_float_value_get, _ledcontrol_animation_utils.color_hsv_float_value_set)
+    val = property(_ledcontrol_animation_utils.color_hsv_float_val_get, _ledcontrol_animation_utils.color_hsv_float_val_set)
+    v = property(_ledcontrol_animation_utils.color_hsv_float_v_get, _ledcontrol_animation_utils.color_hsv_float_v_set)
+    raw = property(_ledcontrol_animation_utils.color_hsv_float_raw_get, _ledcontrol_animation_utils.color_hsv_float_raw_set)
+
+    def __init__(self):
+        _ledcontrol_animation_utils.color_hsv_float_swiginit(self, _ledcontrol_animation_utils.new_color_hsv_float())
+    __swig_destroy__ = _ledcontrol_animation_utils.delete_color_hsv_float
+
+# Register color_hsv_float in _ledcontrol_animation_utils:
+_ledcontrol_animation_utils.color_hsv_float_swigregister(color_hsv_float)
+
+class color_rgb(object):
+    thisown = property(lambda x: x.this.own(), lambda x, v: x.this.own(v), doc="The membership flag")
+    __repr__ = _swig_repr
+    red = property(_ledcontrol_animation_utils.color_rgb_red_get, _ledcontrol_animation_utils.color_rgb_red_set)
+    r = property(_ledcontrol_animation_utils.color_rgb_r_get, _ledcontrol_animation_utils.color_rgb_r_set)
+    green = property(_ledcontrol_animation_utils.color_rgb_green_get, _ledcontrol_animation_utils.color_rgb_green_set)
+    g = property(_ledcontrol_animation_utils.color_rgb_g_get, _ledcontrol_animation_utils.color_rgb_g_set)
+    blue = property(_ledcontrol_animation_utils.color_rgb_blue_get, _ledcontrol_animation_utils.color_rgb_blue_set)
+    b = property(_ledcontrol_animation_utils.color_rgb_b_get, _ledcontrol_animation_utils.color_rgb_b_set)
+    raw = property(_ledcontrol_animation_utils.color_rgb_raw_get, _ledcontrol_animation_utils.color_rgb_raw_set)
+
+    def __init__(self):
+        _ledcontrol_animation_utils.color_rgb_swiginit(self, _ledcontrol_animation_utils.new_color_rgb())
+    __swig_destroy__ = _ledcontrol_animation_utils.delete_color_rgb
+
+# Register color_rgb in _ledcontrol_animation_utils:
+_ledcontrol_animation_utils.color_rgb_swigregister(color_rgb)
+
+class color_rgb_float(object):
+    thisown = property(lambda x: x.this.own(), lambda x, v: x.this.own(v), doc="The membership flag")
+    __repr__ = _swig_repr
+    red = property(_ledcontrol_animation_utils.color_rgb_float_red_get, _ledcontrol_animation_utils.color_rgb_float_red_set)
+    r = property(_ledcontrol_animation_utils.color_rgb_float_r_get, _ledcontrol_animation_utils.color_rgb_float_r_set)
+    green = property(_ledcontrol_animation_utils.color_rgb_float_green_get, _ledcontrol_animation_utils.color_rgb_float_green_set)
+    g = property(_ledcontrol_animation_utils.color_rgb_float_g_get, _ledcontrol_animation_utils.color_rgb_float_g_set)
+    blue = property(_ledcontrol_animation_utils.color_rgb_float_blue_get, _ledcontrol_animation_utils.color_rgb_float_blue_set)
+    b = property(_ledcontrol_animation_utils.color_rgb_float_b_get, _ledcontrol_animation_utils.color_rgb_float_b_set)
+    raw = property(_ledcontrol_animation_utils.color_rgb_float_raw_get, _ledcontrol_animation_utils.color_rgb_float_raw_set)
+
+    def __init__(self):
+        _ledcontrol_animation_utils.color_rgb_float_swiginit(self, _ledcontrol_animation_utils.new_color_rgb_float())
+    __swig_destroy__ = _ledcontrol_animation_utils.delete_color_rgb_float
+
+# Register color_rgb_float in _ledcontrol_animation_utils:
+_ledcontrol_animation_utils.color_rgb_float_swigregister(color_rgb_float)
+
+
+def unpack_rgb(_in):
+    return _ledcontrol_animation_utils.unpack_rgb(_in)
+
+def pack_rgbw(r, g, b, w):
+    return _ledcontrol_animation_utils.pack_rgbw(r, g, b, w)
+
+def scale_8(a, b):
+    return _ledcontrol_animation_utils.scale_8(a, b)
+
+def clamp(d, min, max):
+    return _ledcontrol_animation_utils.clamp(d, min, max)
+
+def blackbody_to_rgb(kelvin):
+    return _ledcontrol_animation_utils.blackbody_to_rgb(kelvin)
+
+def blackbody_correction_rgb(rgb, kelvin):
+    return _ledcontrol_animation_utils.blackbody_correction_rgb(rgb, kelvin)
+
+def set_output_lut_cache_size(size):
+    return _ledcontrol_animation_utils.set_output_lut_cache_size(size)
+
+def render_hsv2rgb_rainbow_float(hsv, corr_rgb, saturation, brightness, has_white):
+    return _ledcontrol_animation_utils.render_hsv2rgb_rainbow_float(hsv, corr_rgb, saturation, brightness, has_white)
+
+def render_rgb_float(rgb, corr_rgb, saturation, brightness, has_white):
+    return _ledcontrol_animation_utils.render_rgb_float(rgb, corr_rgb, saturation, brightness, has_white)
+
+def palette_index(t, size):
+    return _ledcontrol_animation_utils.palette_index(t, size)
+
+def palette_index_mirrored(t, size):
+    return _ledcontrol_animation_utils.palette_index_mirrored(t, size)
+
+def wave_pulse(t, duty_cycle):
+    return _ledcontrol_animation_utils.wave_pulse(t, duty_cycle)
+
+def wave_triangle(t):
+    return _ledcontrol_animation_utils.wave_triangle(t)
+
+def wave_sine(t):
+    return _ledcontrol_animation_utils.wave_sine(t)
+
+def wave_cubic(t):
+    return _ledcontrol_animation_utils.wave_cubic(t)
+
+def plasma_sines(x, y, t, coeff_x, coeff_y, coeff_x_y, coeff_dist_xy):
+    return _ledcontrol_animation_utils.plasma_sines(x, y, t, coeff_x, coeff_y, coeff_x_y, coeff_dist_xy)
+
+def plasma_sines_octave(x, y, t, octaves, lacunarity, persistence):
+    return _ledcontrol_animation_utils.plasma_sines_octave(x, y, t, octaves, lacunarity, persistence)
+
+def fade(t):
+    return _ledcontrol_animation_utils.fade(t)
+
+def lerp(t, a, b):
+    return _ledcontrol_animation_utils.lerp(t, a, b)
+
+def grad(hash, x, y, z):
+    return _ledcontrol_animation_utils.grad(hash, x, y, z)
+
+def perlin_noise_3d(x, y, z):
+    return _ledcontrol_animation_utils.perlin_noise_3d(x, y, z)
+
+def fbm_noise_3d(x, y, z, octaves, lacunarity, persistence):
+    return _ledcontrol_animation_utils.fbm_noise_3d(x, y, z, octaves, lacunarity, persistence)
+
+def perlin_noise_3d_buffer(points, out):
+    return _ledcontrol_animation_utils.perlin_noise_3d_buffer(points, out)
+
+def fbm_noise_3d_buffer(points, out, octaves, lacunarity, persistence):
+    return _ledcontrol_animation_utils.fbm_noise_3d_buffer(points, out, octaves, lacunarity, persistence)
+
+def default_pattern_colors_buffer(pattern, mapping, palette, t, out):
+    return _ledcontrol_animation_utils.default_pattern_colors_buffer(pattern, mapping, palette, t, out)
+
+cvar = _ledcontrol_animation_utils.cvar
+debug = cvar.debug
+
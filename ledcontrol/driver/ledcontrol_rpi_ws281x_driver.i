@@ -148,12 +148,166 @@ static int convert_iarray_8(PyObject *input, uint8_t *ptr, int size) {
   }
 }
 
+%{
+static int is_buffer_format(const char *format, char type) {
+  if (format == NULL) return type == 'B';
+  if (format[0] == '@' || format[0] == '=' || format[0] == '<') format++;
+  return format[0] == type && format[1] == '\0';
+}
+%}
+
+// Any C-contiguous float32 buffer (numpy array, array('f'), memoryview) is read in place
+%typemap(in) (const float *buffer, int buffer_length) (Py_buffer view) {
+  if (PyObject_GetBuffer($input, &view, PyBUF_C_CONTIGUOUS | PyBUF_FORMAT) != 0) {
+    SWIG_fail;
+  }
+  if (view.itemsize != sizeof(float) || !is_buffer_format(view.format, 'f')) {
+    PyBuffer_Release(&view);
+    PyErr_SetString(PyExc_TypeError, "Expecting a C-contiguous buffer of float32s");
+    SWIG_fail;
+  }
+  $1 = (float *)view.buf;
+  $2 = (int)(view.len / sizeof(float));
+}
+
+%typemap(freearg) (const float *buffer, int buffer_length) {
+  if ($1) PyBuffer_Release(&view$argnum);
+}
+
+%typemap(in) (const double *buffer, int buffer_length) (Py_buffer view) {
+  if (PyObject_GetBuffer($input, &view, PyBUF_C_CONTIGUOUS | PyBUF_FORMAT) != 0) {
+    SWIG_fail;
+  }
+  if (view.itemsize != sizeof(double) || !is_buffer_format(view.format, 'd')) {
+    PyBuffer_Release(&view);
+    PyErr_SetString(PyExc_TypeError, "Expecting a C-contiguous buffer of float64s");
+    SWIG_fail;
+  }
+  $1 = (double *)view.buf;
+  $2 = (int)(view.len / sizeof(double));
+}
+
+%typemap(freearg) (const double *buffer, int buffer_length) {
+  if ($1) PyBuffer_Release(&view$argnum);
+}
+
+%typemap(in) (const uint32_t *buffer, int buffer_length) (Py_buffer view) {
+  if (PyObject_GetBuffer($input, &view, PyBUF_C_CONTIGUOUS | PyBUF_FORMAT) != 0) {
+    SWIG_fail;
+  }
+  if (view.itemsize != sizeof(uint32_t) || !is_buffer_format(view.format, 'I')) {
+    PyBuffer_Release(&view);
+    PyErr_SetString(PyExc_TypeError, "Expecting a C-contiguous buffer of uint32s");
+    SWIG_fail;
+  }
+  $1 = (uint32_t *)view.buf;
+  $2 = (int)(view.len / sizeof(uint32_t));
+}
+
+%typemap(freearg) (const uint32_t *buffer, int buffer_length) {
+  if ($1) PyBuffer_Release(&view$argnum);
+}
+
+%typemap(in) (const uint8_t *buffer, int buffer_length) (Py_buffer view) {
+  if (PyObject_GetBuffer($input, &view, PyBUF_C_CONTIGUOUS | PyBUF_FORMAT) != 0) {
+    SWIG_fail;
+  }
+  if (view.itemsize != sizeof(uint8_t) || !is_buffer_format(view.format, 'B')) {
+    PyBuffer_Release(&view);
+    PyErr_SetString(PyExc_TypeError, "Expecting a C-contiguous buffer of uint8s");
+    SWIG_fail;
+  }
+  $1 = (uint8_t *)view.buf;
+  $2 = (int)view.len;
+}
+
+%typemap(freearg) (const uint8_t *buffer, int buffer_length) {
+  if ($1) PyBuffer_Release(&view$argnum);
+}
+
+// Output buffers are written in place
+%typemap(in) (uint32_t *buffer, int buffer_length) (Py_buffer view) {
+  if (PyObject_GetBuffer($input, &view, PyBUF_C_CONTIGUOUS | PyBUF_FORMAT | PyBUF_WRITABLE) != 0) {
+    SWIG_fail;
+  }
+  if (view.itemsize != sizeof(uint32_t) || !is_buffer_format(view.format, 'I')) {
+    PyBuffer_Release(&view);
+    PyErr_SetString(PyExc_TypeError, "Expecting a writable C-contiguous buffer of uint32s");
+    SWIG_fail;
+  }
+  $1 = (uint32_t *)view.buf;
+  $2 = (int)(view.len / sizeof(uint32_t));
+}
+
+%typemap(freearg) (uint32_t *buffer, int buffer_length) {
+  if ($1) PyBuffer_Release(&view$argnum);
+}
+
+%apply (const double *buffer, int buffer_length) { (const double *mapping, int mapping_length) };
+%apply (const float *buffer, int buffer_length) { (const float *palette, int palette_length) };
+%apply (const uint8_t *buffer, int buffer_length) { (const uint8_t *colors, int colors_length) };
+%apply (const uint32_t *buffer, int buffer_length) { (const uint32_t *indices, int indices_length) };
+%apply (const uint32_t *buffer, int buffer_length) { (const uint32_t *table, int table_length) };
+%apply (uint32_t *buffer, int buffer_length) { (uint32_t *table, int table_length) };
+
+// Release the GIL while converting colors from a buffer
+%exception ws2811_hsv_render_range_buffer {
+  Py_BEGIN_ALLOW_THREADS
+  $action
+  Py_END_ALLOW_THREADS
+}
+
+%exception ws2811_rgb_render_range_buffer {
+  Py_BEGIN_ALLOW_THREADS
+  $action
+  Py_END_ALLOW_THREADS
+}
+
+%exception ws2811_rgb_render_range_buffer_uint8 {
+  Py_BEGIN_ALLOW_THREADS
+  $action
+  Py_END_ALLOW_THREADS
+}
+
+%exception ws2811_hsv_render_palette_table {
+  Py_BEGIN_ALLOW_THREADS
+  $action
+  Py_END_ALLOW_THREADS
+}
+
+%exception ws2811_render_range_indexed {
+  Py_BEGIN_ALLOW_THREADS
+  $action
+  Py_END_ALLOW_THREADS
+}
+
+%exception ws2811_render_default_pattern_range {
+  Py_BEGIN_ALLOW_THREADS
+  $action
+  Py_END_ALLOW_THREADS
+}
+
+// Release the GIL while waiting for DMA so other threads can render the next frame
+%exception ws2811_render {
+  Py_BEGIN_ALLOW_THREADS
+  $action
+  Py_END_ALLOW_THREADS
+}
+
+%exception ws2811_wait {
+  Py_BEGIN_ALLOW_THREADS
+  $action
+  Py_END_ALLOW_THREADS
+}
+
 // Declare functions which will be exported as anything in the ws2811.h header.
 %{
 #include "rpi_ws281x/ws2811.h"
 #include "color_types.h"
+#include "color_render.h"
 #include "led_render.h"
 #include "animation_utils.h"
+#include "default_patterns.h"
 %}
 
 // Process ws2811.h header and export all included functions.
@@ -161,5 +315,6 @@ static int convert_iarray_8(PyObject *input, uint8_t *ptr, int size) {
 
 // Include render utils
 %include "color_types.h"
+%include "color_render.h"
 %include "led_render.h"
 %include "animation_utils.h"
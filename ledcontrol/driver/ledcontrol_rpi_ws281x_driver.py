@@ -457,18 +457,6 @@ color_rgb_float_swigregister = _ledcontrol_rpi_ws281x_driver.color_rgb_float_swi
 color_rgb_float_swigregister(color_rgb_float)
 
 
-def ws2811_channel_get(ws, channelnum):
-    return _ledcontrol_rpi_ws281x_driver.ws2811_channel_get(ws, channelnum)
-ws2811_channel_get = _ledcontrol_rpi_ws281x_driver.ws2811_channel_get
-
-def ws2811_led_get(channel, lednum):
-    return _ledcontrol_rpi_ws281x_driver.ws2811_led_get(channel, lednum)
-ws2811_led_get = _ledcontrol_rpi_ws281x_driver.ws2811_led_get
-
-def ws2811_led_set(channel, lednum, color):
-    return _ledcontrol_rpi_ws281x_driver.ws2811_led_set(channel, lednum, color)
-ws2811_led_set = _ledcontrol_rpi_ws281x_driver.ws2811_led_set
-
 def unpack_rgb(arg1):
     return _ledcontrol_rpi_ws281x_driver.unpack_rgb(arg1)
 unpack_rgb = _ledcontrol_rpi_ws281x_driver.unpack_rgb
@@ -493,6 +481,10 @@ def blackbody_correction_rgb(rgb, kelvin):
     return _ledcontrol_rpi_ws281x_driver.blackbody_correction_rgb(rgb, kelvin)
 blackbody_correction_rgb = _ledcontrol_rpi_ws281x_driver.blackbody_correction_rgb
 
+def set_output_lut_cache_size(size):
+    return _ledcontrol_rpi_ws281x_driver.set_output_lut_cache_size(size)
+set_output_lut_cache_size = _ledcontrol_rpi_ws281x_driver.set_output_lut_cache_size
+
 def render_hsv2rgb_rainbow_float(hsv, corr_rgb, saturation, brightness, has_white):
     return _ledcontrol_rpi_ws281x_driver.render_hsv2rgb_rainbow_float(hsv, corr_rgb, saturation, brightness, has_white)
 render_hsv2rgb_rainbow_float = _ledcontrol_rpi_ws281x_driver.render_hsv2rgb_rainbow_float
@@ -501,6 +493,18 @@ def render_rgb_float(rgb, corr_rgb, saturation, brightness, has_white):
     return _ledcontrol_rpi_ws281x_driver.render_rgb_float(rgb, corr_rgb, saturation, brightness, has_white)
 render_rgb_float = _ledcontrol_rpi_ws281x_driver.render_rgb_float
 
+def ws2811_channel_get(ws, channelnum):
+    return _ledcontrol_rpi_ws281x_driver.ws2811_channel_get(ws, channelnum)
+ws2811_channel_get = _ledcontrol_rpi_ws281x_driver.ws2811_channel_get
+
+def ws2811_led_get(channel, lednum):
+    return _ledcontrol_rpi_ws281x_driver.ws2811_led_get(channel, lednum)
+ws2811_led_get = _ledcontrol_rpi_ws281x_driver.ws2811_led_get
+
+def ws2811_led_set(channel, lednum, color):
+    return _ledcontrol_rpi_ws281x_driver.ws2811_led_set(channel, lednum, color)
+ws2811_led_set = _ledcontrol_rpi_ws281x_driver.ws2811_led_set
+
 def ws2811_hsv_render_all_float(ws, channel, values, count, correction, saturation, brightness, gamma, has_white):
     return _ledcontrol_rpi_ws281x_driver.ws2811_hsv_render_all_float(ws, channel, values, count, correction, saturation, brightness, gamma, has_white)
 ws2811_hsv_render_all_float = _ledcontrol_rpi_ws281x_driver.ws2811_hsv_render_all_float
@@ -517,17 +521,37 @@ def ws2811_rgb_render_range_float(channel, values, start, end, correction, satur
     return _ledcontrol_rpi_ws281x_driver.ws2811_rgb_render_range_float(channel, values, start, end, correction, saturation, brightness, gamma, has_white)
 ws2811_rgb_render_range_float = _ledcontrol_rpi_ws281x_driver.ws2811_rgb_render_range_float
 
+def ws2811_hsv_render_range_buffer(channel, buffer, start, end, correction, saturation, brightness, gamma, has_white):
+    return _ledcontrol_rpi_ws281x_driver.ws2811_hsv_render_range_buffer(channel, buffer, start, end, correction, saturation, brightness, gamma, has_white)
+ws2811_hsv_render_range_buffer = _ledcontrol_rpi_ws281x_driver.ws2811_hsv_render_range_buffer
+
+def ws2811_rgb_render_range_buffer(channel, buffer, start, end, correction, saturation, brightness, gamma, has_white):
+    return _ledcontrol_rpi_ws281x_driver.ws2811_rgb_render_range_buffer(channel, buffer, start, end, correction, saturation, brightness, gamma, has_white)
+ws2811_rgb_render_range_buffer = _ledcontrol_rpi_ws281x_driver.ws2811_rgb_render_range_buffer
+
+def ws2811_rgb_render_range_buffer_uint8(channel, colors, start, end, correction, saturation, brightness, gamma, has_white):
+    return _ledcontrol_rpi_ws281x_driver.ws2811_rgb_render_range_buffer_uint8(channel, colors, start, end, correction, saturation, brightness, gamma, has_white)
+ws2811_rgb_render_range_buffer_uint8 = _ledcontrol_rpi_ws281x_driver.ws2811_rgb_render_range_buffer_uint8
+
+def ws2811_hsv_render_palette_table(palette, table, correction, saturation, brightness, gamma, has_white):
+    return _ledcontrol_rpi_ws281x_driver.ws2811_hsv_render_palette_table(palette, table, correction, saturation, brightness, gamma, has_white)
+ws2811_hsv_render_palette_table = _ledcontrol_rpi_ws281x_driver.ws2811_hsv_render_palette_table
+
+def ws2811_render_range_indexed(channel, indices, table, start, end):
+    return _ledcontrol_rpi_ws281x_driver.ws2811_render_range_indexed(channel, indices, table, start, end)
+ws2811_render_range_indexed = _ledcontrol_rpi_ws281x_driver.ws2811_render_range_indexed
+
 def ws2811_rgb_render_calibration(ws, channel, count, correction, brightness):
     return _ledcontrol_rpi_ws281x_driver.ws2811_rgb_render_calibration(ws, channel, count, correction, brightness)
 ws2811_rgb_render_calibration = _ledcontrol_rpi_ws281x_driver.ws2811_rgb_render_calibration
 
-def float_to_int_1000(t):
-    return _ledcontrol_rpi_ws281x_driver.float_to_int_1000(t)
-float_to_int_1000 = _ledcontrol_rpi_ws281x_driver.float_to_int_1000
+def palette_index(t, size):
+    return _ledcontrol_rpi_ws281x_driver.palette_index(t, size)
+palette_index = _ledcontrol_rpi_ws281x_driver.palette_index
 
-def float_to_int_1000_mirror(t):
-    return _ledcontrol_rpi_ws281x_driver.float_to_int_1000_mirror(t)
-float_to_int_1000_mirror = _ledcontrol_rpi_ws281x_driver.float_to_int_1000_mirror
+def palette_index_mirrored(t, size):
+    return _ledcontrol_rpi_ws281x_driver.palette_index_mirrored(t, size)
+palette_index_mirrored = _ledcontrol_rpi_ws281x_driver.palette_index_mirrored
 
 def wave_pulse(t, duty_cycle):
     return _ledcontrol_rpi_ws281x_driver.wave_pulse(t, duty_cycle)
@@ -572,6 +596,10 @@ perlin_noise_3d = _ledcontrol_rpi_ws281x_driver.perlin_noise_3d
 def fbm_noise_3d(x, y, z, octaves, lacunarity, persistence):
     return _ledcontrol_rpi_ws281x_driver.fbm_noise_3d(x, y, z, octaves, lacunarity, persistence)
 fbm_noise_3d = _ledcontrol_rpi_ws281x_driver.fbm_noise_3d
+
+def ws2811_render_default_pattern_range(channel, pattern, mapping, palette, start, end, t, correction, saturation, brightness, gamma, has_white):
+    return _ledcontrol_rpi_ws281x_driver.ws2811_render_default_pattern_range(channel, pattern, mapping, palette, start, end, t, correction, saturation, brightness, gamma, has_white)
+ws2811_render_default_pattern_range = _ledcontrol_rpi_ws281x_driver.ws2811_render_default_pattern_range
 # This file is compatible with both classic and new-style classes.
 
 cvar = _ledcontrol_rpi_ws281x_driver.cvar
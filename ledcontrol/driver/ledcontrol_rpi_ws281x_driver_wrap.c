@@ -3096,10 +3096,18 @@ static int convert_iarray_8(PyObject *input, uint8_t *ptr, int size) {
 }
 
 
+static int is_buffer_format(const char *format, char type) {
+  if (format == NULL) return type == 'B';
+  if (format[0] == '@' || format[0] == '=' || format[0] == '<') format++;
+  return format[0] == type && format[1] == '\0';
+}
+
+
 #include "rpi_ws281x/ws2811.h"
 #include "color_types.h"
 #include "led_render.h"
 #include "animation_utils.h"
+#include "default_patterns.h"
 
 
 SWIGINTERNINLINE PyObject*
@@ -4571,7 +4579,11 @@ SWIGINTERN PyObject *_wrap_ws2811_render(PyObject *SWIGUNUSEDPARM(self), PyObjec
     SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "ws2811_render" "', argument " "1"" of type '" "ws2811_t *""'"); 
   }
   arg1 = (ws2811_t *)(argp1);
-  result = (ws2811_return_t)ws2811_render(arg1);
+  {
+    Py_BEGIN_ALLOW_THREADS
+    result = (ws2811_return_t)ws2811_render(arg1);
+    Py_END_ALLOW_THREADS
+  }
   resultobj = SWIG_From_int((int)(result));
   return resultobj;
 fail:
@@ -4593,7 +4605,11 @@ SWIGINTERN PyObject *_wrap_ws2811_wait(PyObject *SWIGUNUSEDPARM(self), PyObject
     SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "ws2811_wait" "', argument " "1"" of type '" "ws2811_t *""'"); 
   }
   arg1 = (ws2811_t *)(argp1);
-  result = (ws2811_return_t)ws2811_wait(arg1);
+  {
+    Py_BEGIN_ALLOW_THREADS
+    result = (ws2811_return_t)ws2811_wait(arg1);
+    Py_END_ALLOW_THREADS
+  }
   resultobj = SWIG_From_int((int)(result));
   return resultobj;
 fail:
@@ -6523,108 +6539,6 @@ SWIGINTERN PyObject *Swig_var_debug_get(void) {
 }
 
 
-SWIGINTERN PyObject *_wrap_ws2811_channel_get(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
-  PyObject *resultobj = 0;
-  ws2811_t *arg1 = (ws2811_t *) 0 ;
-  int arg2 ;
-  void *argp1 = 0 ;
-  int res1 = 0 ;
-  int val2 ;
-  int ecode2 = 0 ;
-  PyObject * obj0 = 0 ;
-  PyObject * obj1 = 0 ;
-  ws2811_channel_t *result = 0 ;
-  
-  if (!PyArg_ParseTuple(args,(char *)"OO:ws2811_channel_get",&obj0,&obj1)) SWIG_fail;
-  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_ws2811_t, 0 |  0 );
-  if (!SWIG_IsOK(res1)) {
-    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "ws2811_channel_get" "', argument " "1"" of type '" "ws2811_t *""'"); 
-  }
-  arg1 = (ws2811_t *)(argp1);
-  ecode2 = SWIG_AsVal_int(obj1, &val2);
-  if (!SWIG_IsOK(ecode2)) {
-    SWIG_exception_fail(SWIG_ArgError(ecode2), "in method '" "ws2811_channel_get" "', argument " "2"" of type '" "int""'");
-  } 
-  arg2 = (int)(val2);
-  result = (ws2811_channel_t *)ws2811_channel_get(arg1,arg2);
-  resultobj = SWIG_NewPointerObj(SWIG_as_voidptr(result), SWIGTYPE_p_ws2811_channel_t, 0 |  0 );
-  return resultobj;
-fail:
-  return NULL;
-}
-
-
-SWIGINTERN PyObject *_wrap_ws2811_led_get(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
-  PyObject *resultobj = 0;
-  ws2811_channel_t *arg1 = (ws2811_channel_t *) 0 ;
-  int arg2 ;
-  void *argp1 = 0 ;
-  int res1 = 0 ;
-  int val2 ;
-  int ecode2 = 0 ;
-  PyObject * obj0 = 0 ;
-  PyObject * obj1 = 0 ;
-  uint32_t result;
-  
-  if (!PyArg_ParseTuple(args,(char *)"OO:ws2811_led_get",&obj0,&obj1)) SWIG_fail;
-  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_ws2811_channel_t, 0 |  0 );
-  if (!SWIG_IsOK(res1)) {
-    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "ws2811_led_get" "', argument " "1"" of type '" "ws2811_channel_t *""'"); 
-  }
-  arg1 = (ws2811_channel_t *)(argp1);
-  ecode2 = SWIG_AsVal_int(obj1, &val2);
-  if (!SWIG_IsOK(ecode2)) {
-    SWIG_exception_fail(SWIG_ArgError(ecode2), "in method '" "ws2811_led_get" "', argument " "2"" of type '" "int""'");
-  } 
-  arg2 = (int)(val2);
-  result = (uint32_t)ws2811_led_get(arg1,arg2);
-  resultobj = SWIG_From_unsigned_SS_int((unsigned int)(result));
-  return resultobj;
-fail:
-  return NULL;
-}
-
-
-SWIGINTERN PyObject *_wrap_ws2811_led_set(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
-  PyObject *resultobj = 0;
-  ws2811_channel_t *arg1 = (ws2811_channel_t *) 0 ;
-  int arg2 ;
-  uint32_t arg3 ;
-  void *argp1 = 0 ;
-  int res1 = 0 ;
-  int val2 ;
-  int ecode2 = 0 ;
-  unsigned int val3 ;
-  int ecode3 = 0 ;
-  PyObject * obj0 = 0 ;
-  PyObject * obj1 = 0 ;
-  PyObject * obj2 = 0 ;
-  int result;
-  
-  if (!PyArg_ParseTuple(args,(char *)"OOO:ws2811_led_set",&obj0,&obj1,&obj2)) SWIG_fail;
-  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_ws2811_channel_t, 0 |  0 );
-  if (!SWIG_IsOK(res1)) {
-    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "ws2811_led_set" "', argument " "1"" of type '" "ws2811_channel_t *""'"); 
-  }
-  arg1 = (ws2811_channel_t *)(argp1);
-  ecode2 = SWIG_AsVal_int(obj1, &val2);
-  if (!SWIG_IsOK(ecode2)) {
-    SWIG_exception_fail(SWIG_ArgError(ecode2), "in method '" "ws2811_led_set" "', argument " "2"" of type '" "int""'");
-  } 
-  arg2 = (int)(val2);
-  ecode3 = SWIG_AsVal_unsigned_SS_int(obj2, &val3);
-  if (!SWIG_IsOK(ecode3)) {
-    SWIG_exception_fail(SWIG_ArgError(ecode3), "in method '" "ws2811_led_set" "', argument " "3"" of type '" "uint32_t""'");
-  } 
-  arg3 = (uint32_t)(val3);
-  result = (int)ws2811_led_set(arg1,arg2,arg3);
-  resultobj = SWIG_From_int((int)(result));
-  return resultobj;
-fail:
-  return NULL;
-}
-
-
 SWIGINTERN PyObject *_wrap_unpack_rgb(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
   PyObject *resultobj = 0;
   uint32_t arg1 ;
@@ -6836,6 +6750,28 @@ fail:
 }
 
 
+SWIGINTERN PyObject *_wrap_set_output_lut_cache_size(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  int arg1 ;
+  int val1 ;
+  int ecode1 = 0 ;
+  PyObject * obj0 = 0 ;
+  int result;
+  
+  if (!PyArg_ParseTuple(args,(char *)"O:set_output_lut_cache_size",&obj0)) SWIG_fail;
+  ecode1 = SWIG_AsVal_int(obj0, &val1);
+  if (!SWIG_IsOK(ecode1)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode1), "in method '" "set_output_lut_cache_size" "', argument " "1"" of type '" "int""'");
+  } 
+  arg1 = (int)(val1);
+  result = (int)set_output_lut_cache_size(arg1);
+  resultobj = SWIG_From_int((int)(result));
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
 SWIGINTERN PyObject *_wrap_render_hsv2rgb_rainbow_float(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
   PyObject *resultobj = 0;
   color_hsv_float arg1 ;
@@ -6976,6 +6912,108 @@ fail:
 }
 
 
+SWIGINTERN PyObject *_wrap_ws2811_channel_get(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  ws2811_t *arg1 = (ws2811_t *) 0 ;
+  int arg2 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  int val2 ;
+  int ecode2 = 0 ;
+  PyObject * obj0 = 0 ;
+  PyObject * obj1 = 0 ;
+  ws2811_channel_t *result = 0 ;
+  
+  if (!PyArg_ParseTuple(args,(char *)"OO:ws2811_channel_get",&obj0,&obj1)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_ws2811_t, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "ws2811_channel_get" "', argument " "1"" of type '" "ws2811_t *""'"); 
+  }
+  arg1 = (ws2811_t *)(argp1);
+  ecode2 = SWIG_AsVal_int(obj1, &val2);
+  if (!SWIG_IsOK(ecode2)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode2), "in method '" "ws2811_channel_get" "', argument " "2"" of type '" "int""'");
+  } 
+  arg2 = (int)(val2);
+  result = (ws2811_channel_t *)ws2811_channel_get(arg1,arg2);
+  resultobj = SWIG_NewPointerObj(SWIG_as_voidptr(result), SWIGTYPE_p_ws2811_channel_t, 0 |  0 );
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_ws2811_led_get(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  ws2811_channel_t *arg1 = (ws2811_channel_t *) 0 ;
+  int arg2 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  int val2 ;
+  int ecode2 = 0 ;
+  PyObject * obj0 = 0 ;
+  PyObject * obj1 = 0 ;
+  uint32_t result;
+  
+  if (!PyArg_ParseTuple(args,(char *)"OO:ws2811_led_get",&obj0,&obj1)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_ws2811_channel_t, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "ws2811_led_get" "', argument " "1"" of type '" "ws2811_channel_t *""'"); 
+  }
+  arg1 = (ws2811_channel_t *)(argp1);
+  ecode2 = SWIG_AsVal_int(obj1, &val2);
+  if (!SWIG_IsOK(ecode2)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode2), "in method '" "ws2811_led_get" "', argument " "2"" of type '" "int""'");
+  } 
+  arg2 = (int)(val2);
+  result = (uint32_t)ws2811_led_get(arg1,arg2);
+  resultobj = SWIG_From_unsigned_SS_int((unsigned int)(result));
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_ws2811_led_set(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  ws2811_channel_t *arg1 = (ws2811_channel_t *) 0 ;
+  int arg2 ;
+  uint32_t arg3 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  int val2 ;
+  int ecode2 = 0 ;
+  unsigned int val3 ;
+  int ecode3 = 0 ;
+  PyObject * obj0 = 0 ;
+  PyObject * obj1 = 0 ;
+  PyObject * obj2 = 0 ;
+  int result;
+  
+  if (!PyArg_ParseTuple(args,(char *)"OOO:ws2811_led_set",&obj0,&obj1,&obj2)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_ws2811_channel_t, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "ws2811_led_set" "', argument " "1"" of type '" "ws2811_channel_t *""'"); 
+  }
+  arg1 = (ws2811_channel_t *)(argp1);
+  ecode2 = SWIG_AsVal_int(obj1, &val2);
+  if (!SWIG_IsOK(ecode2)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode2), "in method '" "ws2811_led_set" "', argument " "2"" of type '" "int""'");
+  } 
+  arg2 = (int)(val2);
+  ecode3 = SWIG_AsVal_unsigned_SS_int(obj2, &val3);
+  if (!SWIG_IsOK(ecode3)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode3), "in method '" "ws2811_led_set" "', argument " "3"" of type '" "uint32_t""'");
+  } 
+  arg3 = (uint32_t)(val3);
+  result = (int)ws2811_led_set(arg1,arg2,arg3);
+  resultobj = SWIG_From_int((int)(result));
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
 SWIGINTERN PyObject *_wrap_ws2811_hsv_render_all_float(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
   PyObject *resultobj = 0;
   ws2811_t *arg1 = (ws2811_t *) 0 ;
@@ -7402,31 +7440,558 @@ fail:
 }
 
 
-SWIGINTERN PyObject *_wrap_ws2811_rgb_render_calibration(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+SWIGINTERN PyObject *_wrap_ws2811_hsv_render_range_buffer(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
   PyObject *resultobj = 0;
-  ws2811_t *arg1 = (ws2811_t *) 0 ;
-  ws2811_channel_t *arg2 = (ws2811_channel_t *) 0 ;
+  ws2811_channel_t *arg1 = (ws2811_channel_t *) 0 ;
+  float *arg2 = (float *) 0 ;
   int arg3 ;
-  uint32_t arg4 ;
-  float arg5 ;
+  int arg4 ;
+  int arg5 ;
+  uint32_t arg6 ;
+  float arg7 ;
+  float arg8 ;
+  float arg9 ;
+  uint8_t arg10 ;
   void *argp1 = 0 ;
   int res1 = 0 ;
-  void *argp2 = 0 ;
-  int res2 = 0 ;
-  int val3 ;
-  int ecode3 = 0 ;
-  unsigned int val4 ;
+  Py_buffer view2 ;
+  int val4 ;
   int ecode4 = 0 ;
-  float val5 ;
+  int val5 ;
   int ecode5 = 0 ;
+  unsigned int val6 ;
+  int ecode6 = 0 ;
+  float val7 ;
+  int ecode7 = 0 ;
+  float val8 ;
+  int ecode8 = 0 ;
+  float val9 ;
+  int ecode9 = 0 ;
+  unsigned char val10 ;
+  int ecode10 = 0 ;
   PyObject * obj0 = 0 ;
   PyObject * obj1 = 0 ;
   PyObject * obj2 = 0 ;
   PyObject * obj3 = 0 ;
   PyObject * obj4 = 0 ;
+  PyObject * obj5 = 0 ;
+  PyObject * obj6 = 0 ;
+  PyObject * obj7 = 0 ;
+  PyObject * obj8 = 0 ;
   int result;
   
-  if (!PyArg_ParseTuple(args,(char *)"OOOOO:ws2811_rgb_render_calibration",&obj0,&obj1,&obj2,&obj3,&obj4)) SWIG_fail;
+  if (!PyArg_ParseTuple(args,(char *)"OOOOOOOOO:ws2811_hsv_render_range_buffer",&obj0,&obj1,&obj2,&obj3,&obj4,&obj5,&obj6,&obj7,&obj8)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_ws2811_channel_t, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "ws2811_hsv_render_range_buffer" "', argument " "1"" of type '" "ws2811_channel_t *""'"); 
+  }
+  arg1 = (ws2811_channel_t *)(argp1);
+  {
+    if (PyObject_GetBuffer(obj1, &view2, PyBUF_C_CONTIGUOUS | PyBUF_FORMAT) != 0) {
+      SWIG_fail;
+    }
+    if (view2.itemsize != sizeof(float) || !is_buffer_format(view2.format, 'f')) {
+      PyBuffer_Release(&view2);
+      PyErr_SetString(PyExc_TypeError, "Expecting a C-contiguous buffer of float32s");
+      SWIG_fail;
+    }
+    arg2 = (float *)view2.buf;
+    arg3 = (int)(view2.len / sizeof(float));
+  }
+  ecode4 = SWIG_AsVal_int(obj2, &val4);
+  if (!SWIG_IsOK(ecode4)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode4), "in method '" "ws2811_hsv_render_range_buffer" "', argument " "3"" of type '" "int""'");
+  } 
+  arg4 = (int)(val4);
+  ecode5 = SWIG_AsVal_int(obj3, &val5);
+  if (!SWIG_IsOK(ecode5)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode5), "in method '" "ws2811_hsv_render_range_buffer" "', argument " "4"" of type '" "int""'");
+  } 
+  arg5 = (int)(val5);
+  ecode6 = SWIG_AsVal_unsigned_SS_int(obj4, &val6);
+  if (!SWIG_IsOK(ecode6)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode6), "in method '" "ws2811_hsv_render_range_buffer" "', argument " "5"" of type '" "uint32_t""'");
+  } 
+  arg6 = (uint32_t)(val6);
+  ecode7 = SWIG_AsVal_float(obj5, &val7);
+  if (!SWIG_IsOK(ecode7)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode7), "in method '" "ws2811_hsv_render_range_buffer" "', argument " "6"" of type '" "float""'");
+  } 
+  arg7 = (float)(val7);
+  ecode8 = SWIG_AsVal_float(obj6, &val8);
+  if (!SWIG_IsOK(ecode8)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode8), "in method '" "ws2811_hsv_render_range_buffer" "', argument " "7"" of type '" "float""'");
+  } 
+  arg8 = (float)(val8);
+  ecode9 = SWIG_AsVal_float(obj7, &val9);
+  if (!SWIG_IsOK(ecode9)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode9), "in method '" "ws2811_hsv_render_range_buffer" "', argument " "8"" of type '" "float""'");
+  } 
+  arg9 = (float)(val9);
+  ecode10 = SWIG_AsVal_unsigned_SS_char(obj8, &val10);
+  if (!SWIG_IsOK(ecode10)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode10), "in method '" "ws2811_hsv_render_range_buffer" "', argument " "9"" of type '" "uint8_t""'");
+  } 
+  arg10 = (uint8_t)(val10);
+  {
+    Py_BEGIN_ALLOW_THREADS
+    result = (int)ws2811_hsv_render_range_buffer(arg1,(float const *)arg2,arg3,arg4,arg5,arg6,arg7,arg8,arg9,arg10);
+    Py_END_ALLOW_THREADS
+  }
+  resultobj = SWIG_From_int((int)(result));
+  {
+    if (arg2) PyBuffer_Release(&view2);
+  }
+  return resultobj;
+fail:
+  {
+    if (arg2) PyBuffer_Release(&view2);
+  }
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_ws2811_rgb_render_range_buffer(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  ws2811_channel_t *arg1 = (ws2811_channel_t *) 0 ;
+  float *arg2 = (float *) 0 ;
+  int arg3 ;
+  int arg4 ;
+  int arg5 ;
+  uint32_t arg6 ;
+  float arg7 ;
+  float arg8 ;
+  float arg9 ;
+  uint8_t arg10 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  Py_buffer view2 ;
+  int val4 ;
+  int ecode4 = 0 ;
+  int val5 ;
+  int ecode5 = 0 ;
+  unsigned int val6 ;
+  int ecode6 = 0 ;
+  float val7 ;
+  int ecode7 = 0 ;
+  float val8 ;
+  int ecode8 = 0 ;
+  float val9 ;
+  int ecode9 = 0 ;
+  unsigned char val10 ;
+  int ecode10 = 0 ;
+  PyObject * obj0 = 0 ;
+  PyObject * obj1 = 0 ;
+  PyObject * obj2 = 0 ;
+  PyObject * obj3 = 0 ;
+  PyObject * obj4 = 0 ;
+  PyObject * obj5 = 0 ;
+  PyObject * obj6 = 0 ;
+  PyObject * obj7 = 0 ;
+  PyObject * obj8 = 0 ;
+  int result;
+  
+  if (!PyArg_ParseTuple(args,(char *)"OOOOOOOOO:ws2811_rgb_render_range_buffer",&obj0,&obj1,&obj2,&obj3,&obj4,&obj5,&obj6,&obj7,&obj8)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_ws2811_channel_t, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "ws2811_rgb_render_range_buffer" "', argument " "1"" of type '" "ws2811_channel_t *""'"); 
+  }
+  arg1 = (ws2811_channel_t *)(argp1);
+  {
+    if (PyObject_GetBuffer(obj1, &view2, PyBUF_C_CONTIGUOUS | PyBUF_FORMAT) != 0) {
+      SWIG_fail;
+    }
+    if (view2.itemsize != sizeof(float) || !is_buffer_format(view2.format, 'f')) {
+      PyBuffer_Release(&view2);
+      PyErr_SetString(PyExc_TypeError, "Expecting a C-contiguous buffer of float32s");
+      SWIG_fail;
+    }
+    arg2 = (float *)view2.buf;
+    arg3 = (int)(view2.len / sizeof(float));
+  }
+  ecode4 = SWIG_AsVal_int(obj2, &val4);
+  if (!SWIG_IsOK(ecode4)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode4), "in method '" "ws2811_rgb_render_range_buffer" "', argument " "3"" of type '" "int""'");
+  } 
+  arg4 = (int)(val4);
+  ecode5 = SWIG_AsVal_int(obj3, &val5);
+  if (!SWIG_IsOK(ecode5)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode5), "in method '" "ws2811_rgb_render_range_buffer" "', argument " "4"" of type '" "int""'");
+  } 
+  arg5 = (int)(val5);
+  ecode6 = SWIG_AsVal_unsigned_SS_int(obj4, &val6);
+  if (!SWIG_IsOK(ecode6)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode6), "in method '" "ws2811_rgb_render_range_buffer" "', argument " "5"" of type '" "uint32_t""'");
+  } 
+  arg6 = (uint32_t)(val6);
+  ecode7 = SWIG_AsVal_float(obj5, &val7);
+  if (!SWIG_IsOK(ecode7)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode7), "in method '" "ws2811_rgb_render_range_buffer" "', argument " "6"" of type '" "float""'");
+  } 
+  arg7 = (float)(val7);
+  ecode8 = SWIG_AsVal_float(obj6, &val8);
+  if (!SWIG_IsOK(ecode8)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode8), "in method '" "ws2811_rgb_render_range_buffer" "', argument " "7"" of type '" "float""'");
+  } 
+  arg8 = (float)(val8);
+  ecode9 = SWIG_AsVal_float(obj7, &val9);
+  if (!SWIG_IsOK(ecode9)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode9), "in method '" "ws2811_rgb_render_range_buffer" "', argument " "8"" of type '" "float""'");
+  } 
+  arg9 = (float)(val9);
+  ecode10 = SWIG_AsVal_unsigned_SS_char(obj8, &val10);
+  if (!SWIG_IsOK(ecode10)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode10), "in method '" "ws2811_rgb_render_range_buffer" "', argument " "9"" of type '" "uint8_t""'");
+  } 
+  arg10 = (uint8_t)(val10);
+  {
+    Py_BEGIN_ALLOW_THREADS
+    result = (int)ws2811_rgb_render_range_buffer(arg1,(float const *)arg2,arg3,arg4,arg5,arg6,arg7,arg8,arg9,arg10);
+    Py_END_ALLOW_THREADS
+  }
+  resultobj = SWIG_From_int((int)(result));
+  {
+    if (arg2) PyBuffer_Release(&view2);
+  }
+  return resultobj;
+fail:
+  {
+    if (arg2) PyBuffer_Release(&view2);
+  }
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_ws2811_rgb_render_range_buffer_uint8(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  ws2811_channel_t *arg1 = (ws2811_channel_t *) 0 ;
+  uint8_t *arg2 = (uint8_t *) 0 ;
+  int arg3 ;
+  int arg4 ;
+  int arg5 ;
+  uint32_t arg6 ;
+  float arg7 ;
+  float arg8 ;
+  float arg9 ;
+  uint8_t arg10 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  Py_buffer view2 ;
+  int val4 ;
+  int ecode4 = 0 ;
+  int val5 ;
+  int ecode5 = 0 ;
+  unsigned int val6 ;
+  int ecode6 = 0 ;
+  float val7 ;
+  int ecode7 = 0 ;
+  float val8 ;
+  int ecode8 = 0 ;
+  float val9 ;
+  int ecode9 = 0 ;
+  unsigned char val10 ;
+  int ecode10 = 0 ;
+  PyObject * obj0 = 0 ;
+  PyObject * obj1 = 0 ;
+  PyObject * obj2 = 0 ;
+  PyObject * obj3 = 0 ;
+  PyObject * obj4 = 0 ;
+  PyObject * obj5 = 0 ;
+  PyObject * obj6 = 0 ;
+  PyObject * obj7 = 0 ;
+  PyObject * obj8 = 0 ;
+  int result;
+  
+  if (!PyArg_ParseTuple(args,(char *)"OOOOOOOOO:ws2811_rgb_render_range_buffer_uint8",&obj0,&obj1,&obj2,&obj3,&obj4,&obj5,&obj6,&obj7,&obj8)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_ws2811_channel_t, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "ws2811_rgb_render_range_buffer_uint8" "', argument " "1"" of type '" "ws2811_channel_t *""'"); 
+  }
+  arg1 = (ws2811_channel_t *)(argp1);
+  {
+    if (PyObject_GetBuffer(obj1, &view2, PyBUF_C_CONTIGUOUS | PyBUF_FORMAT) != 0) {
+      SWIG_fail;
+    }
+    if (view2.itemsize != sizeof(uint8_t) || !is_buffer_format(view2.format, 'B')) {
+      PyBuffer_Release(&view2);
+      PyErr_SetString(PyExc_TypeError, "Expecting a C-contiguous buffer of uint8s");
+      SWIG_fail;
+    }
+    arg2 = (uint8_t *)view2.buf;
+    arg3 = (int)view2.len;
+  }
+  ecode4 = SWIG_AsVal_int(obj2, &val4);
+  if (!SWIG_IsOK(ecode4)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode4), "in method '" "ws2811_rgb_render_range_buffer_uint8" "', argument " "3"" of type '" "int""'");
+  } 
+  arg4 = (int)(val4);
+  ecode5 = SWIG_AsVal_int(obj3, &val5);
+  if (!SWIG_IsOK(ecode5)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode5), "in method '" "ws2811_rgb_render_range_buffer_uint8" "', argument " "4"" of type '" "int""'");
+  } 
+  arg5 = (int)(val5);
+  ecode6 = SWIG_AsVal_unsigned_SS_int(obj4, &val6);
+  if (!SWIG_IsOK(ecode6)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode6), "in method '" "ws2811_rgb_render_range_buffer_uint8" "', argument " "5"" of type '" "uint32_t""'");
+  } 
+  arg6 = (uint32_t)(val6);
+  ecode7 = SWIG_AsVal_float(obj5, &val7);
+  if (!SWIG_IsOK(ecode7)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode7), "in method '" "ws2811_rgb_render_range_buffer_uint8" "', argument " "6"" of type '" "float""'");
+  } 
+  arg7 = (float)(val7);
+  ecode8 = SWIG_AsVal_float(obj6, &val8);
+  if (!SWIG_IsOK(ecode8)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode8), "in method '" "ws2811_rgb_render_range_buffer_uint8" "', argument " "7"" of type '" "float""'");
+  } 
+  arg8 = (float)(val8);
+  ecode9 = SWIG_AsVal_float(obj7, &val9);
+  if (!SWIG_IsOK(ecode9)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode9), "in method '" "ws2811_rgb_render_range_buffer_uint8" "', argument " "8"" of type '" "float""'");
+  } 
+  arg9 = (float)(val9);
+  ecode10 = SWIG_AsVal_unsigned_SS_char(obj8, &val10);
+  if (!SWIG_IsOK(ecode10)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode10), "in method '" "ws2811_rgb_render_range_buffer_uint8" "', argument " "9"" of type '" "uint8_t""'");
+  } 
+  arg10 = (uint8_t)(val10);
+  {
+    Py_BEGIN_ALLOW_THREADS
+    result = (int)ws2811_rgb_render_range_buffer_uint8(arg1,(uint8_t const *)arg2,arg3,arg4,arg5,arg6,arg7,arg8,arg9,arg10);
+    Py_END_ALLOW_THREADS
+  }
+  resultobj = SWIG_From_int((int)(result));
+  {
+    if (arg2) PyBuffer_Release(&view2);
+  }
+  return resultobj;
+fail:
+  {
+    if (arg2) PyBuffer_Release(&view2);
+  }
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_ws2811_hsv_render_palette_table(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  float *arg1 = (float *) 0 ;
+  int arg2 ;
+  uint32_t *arg3 = (uint32_t *) 0 ;
+  int arg4 ;
+  uint32_t arg5 ;
+  float arg6 ;
+  float arg7 ;
+  float arg8 ;
+  uint8_t arg9 ;
+  Py_buffer view1 ;
+  Py_buffer view3 ;
+  unsigned int val5 ;
+  int ecode5 = 0 ;
+  float val6 ;
+  int ecode6 = 0 ;
+  float val7 ;
+  int ecode7 = 0 ;
+  float val8 ;
+  int ecode8 = 0 ;
+  unsigned char val9 ;
+  int ecode9 = 0 ;
+  PyObject * obj0 = 0 ;
+  PyObject * obj1 = 0 ;
+  PyObject * obj2 = 0 ;
+  PyObject * obj3 = 0 ;
+  PyObject * obj4 = 0 ;
+  PyObject * obj5 = 0 ;
+  PyObject * obj6 = 0 ;
+  int result;
+  
+  if (!PyArg_ParseTuple(args,(char *)"OOOOOOO:ws2811_hsv_render_palette_table",&obj0,&obj1,&obj2,&obj3,&obj4,&obj5,&obj6)) SWIG_fail;
+  {
+    if (PyObject_GetBuffer(obj0, &view1, PyBUF_C_CONTIGUOUS | PyBUF_FORMAT) != 0) {
+      SWIG_fail;
+    }
+    if (view1.itemsize != sizeof(float) || !is_buffer_format(view1.format, 'f')) {
+      PyBuffer_Release(&view1);
+      PyErr_SetString(PyExc_TypeError, "Expecting a C-contiguous buffer of float32s");
+      SWIG_fail;
+    }
+    arg1 = (float *)view1.buf;
+    arg2 = (int)(view1.len / sizeof(float));
+  }
+  {
+    if (PyObject_GetBuffer(obj1, &view3, PyBUF_C_CONTIGUOUS | PyBUF_FORMAT | PyBUF_WRITABLE) != 0) {
+      SWIG_fail;
+    }
+    if (view3.itemsize != sizeof(uint32_t) || !is_buffer_format(view3.format, 'I')) {
+      PyBuffer_Release(&view3);
+      PyErr_SetString(PyExc_TypeError, "Expecting a writable C-contiguous buffer of uint32s");
+      SWIG_fail;
+    }
+    arg3 = (uint32_t *)view3.buf;
+    arg4 = (int)(view3.len / sizeof(uint32_t));
+  }
+  ecode5 = SWIG_AsVal_unsigned_SS_int(obj2, &val5);
+  if (!SWIG_IsOK(ecode5)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode5), "in method '" "ws2811_hsv_render_palette_table" "', argument " "5"" of type '" "uint32_t""'");
+  } 
+  arg5 = (uint32_t)(val5);
+  ecode6 = SWIG_AsVal_float(obj3, &val6);
+  if (!SWIG_IsOK(ecode6)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode6), "in method '" "ws2811_hsv_render_palette_table" "', argument " "6"" of type '" "float""'");
+  } 
+  arg6 = (float)(val6);
+  ecode7 = SWIG_AsVal_float(obj4, &val7);
+  if (!SWIG_IsOK(ecode7)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode7), "in method '" "ws2811_hsv_render_palette_table" "', argument " "7"" of type '" "float""'");
+  } 
+  arg7 = (float)(val7);
+  ecode8 = SWIG_AsVal_float(obj5, &val8);
+  if (!SWIG_IsOK(ecode8)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode8), "in method '" "ws2811_hsv_render_palette_table" "', argument " "8"" of type '" "float""'");
+  } 
+  arg8 = (float)(val8);
+  ecode9 = SWIG_AsVal_unsigned_SS_char(obj6, &val9);
+  if (!SWIG_IsOK(ecode9)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode9), "in method '" "ws2811_hsv_render_palette_table" "', argument " "9"" of type '" "uint8_t""'");
+  } 
+  arg9 = (uint8_t)(val9);
+  {
+    Py_BEGIN_ALLOW_THREADS
+    result = (int)ws2811_hsv_render_palette_table((float const *)arg1,arg2,arg3,arg4,arg5,arg6,arg7,arg8,arg9);
+    Py_END_ALLOW_THREADS
+  }
+  resultobj = SWIG_From_int((int)(result));
+  {
+    if (arg1) PyBuffer_Release(&view1);
+  }
+  {
+    if (arg3) PyBuffer_Release(&view3);
+  }
+  return resultobj;
+fail:
+  {
+    if (arg1) PyBuffer_Release(&view1);
+  }
+  {
+    if (arg3) PyBuffer_Release(&view3);
+  }
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_ws2811_render_range_indexed(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  ws2811_channel_t *arg1 = (ws2811_channel_t *) 0 ;
+  uint32_t *arg2 = (uint32_t *) 0 ;
+  int arg3 ;
+  uint32_t *arg4 = (uint32_t *) 0 ;
+  int arg5 ;
+  int arg6 ;
+  int arg7 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  Py_buffer view2 ;
+  Py_buffer view4 ;
+  int val6 ;
+  int ecode6 = 0 ;
+  int val7 ;
+  int ecode7 = 0 ;
+  PyObject * obj0 = 0 ;
+  PyObject * obj1 = 0 ;
+  PyObject * obj2 = 0 ;
+  PyObject * obj3 = 0 ;
+  PyObject * obj4 = 0 ;
+  int result;
+  
+  if (!PyArg_ParseTuple(args,(char *)"OOOOO:ws2811_render_range_indexed",&obj0,&obj1,&obj2,&obj3,&obj4)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_ws2811_channel_t, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "ws2811_render_range_indexed" "', argument " "1"" of type '" "ws2811_channel_t *""'"); 
+  }
+  arg1 = (ws2811_channel_t *)(argp1);
+  {
+    if (PyObject_GetBuffer(obj1, &view2, PyBUF_C_CONTIGUOUS | PyBUF_FORMAT) != 0) {
+      SWIG_fail;
+    }
+    if (view2.itemsize != sizeof(uint32_t) || !is_buffer_format(view2.format, 'I')) {
+      PyBuffer_Release(&view2);
+      PyErr_SetString(PyExc_TypeError, "Expecting a C-contiguous buffer of uint32s");
+      SWIG_fail;
+    }
+    arg2 = (uint32_t *)view2.buf;
+    arg3 = (int)(view2.len / sizeof(uint32_t));
+  }
+  {
+    if (PyObject_GetBuffer(obj2, &view4, PyBUF_C_CONTIGUOUS | PyBUF_FORMAT) != 0) {
+      SWIG_fail;
+    }
+    if (view4.itemsize != sizeof(uint32_t) || !is_buffer_format(view4.format, 'I')) {
+      PyBuffer_Release(&view4);
+      PyErr_SetString(PyExc_TypeError, "Expecting a C-contiguous buffer of uint32s");
+      SWIG_fail;
+    }
+    arg4 = (uint32_t *)view4.buf;
+    arg5 = (int)(view4.len / sizeof(uint32_t));
+  }
+  ecode6 = SWIG_AsVal_int(obj3, &val6);
+  if (!SWIG_IsOK(ecode6)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode6), "in method '" "ws2811_render_range_indexed" "', argument " "6"" of type '" "int""'");
+  } 
+  arg6 = (int)(val6);
+  ecode7 = SWIG_AsVal_int(obj4, &val7);
+  if (!SWIG_IsOK(ecode7)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode7), "in method '" "ws2811_render_range_indexed" "', argument " "7"" of type '" "int""'");
+  } 
+  arg7 = (int)(val7);
+  {
+    Py_BEGIN_ALLOW_THREADS
+    result = (int)ws2811_render_range_indexed(arg1,(uint32_t const *)arg2,arg3,(uint32_t const *)arg4,arg5,arg6,arg7);
+    Py_END_ALLOW_THREADS
+  }
+  resultobj = SWIG_From_int((int)(result));
+  {
+    if (arg2) PyBuffer_Release(&view2);
+  }
+  {
+    if (arg4) PyBuffer_Release(&view4);
+  }
+  return resultobj;
+fail:
+  {
+    if (arg2) PyBuffer_Release(&view2);
+  }
+  {
+    if (arg4) PyBuffer_Release(&view4);
+  }
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_ws2811_rgb_render_calibration(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  ws2811_t *arg1 = (ws2811_t *) 0 ;
+  ws2811_channel_t *arg2 = (ws2811_channel_t *) 0 ;
+  int arg3 ;
+  uint32_t arg4 ;
+  float arg5 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  void *argp2 = 0 ;
+  int res2 = 0 ;
+  int val3 ;
+  int ecode3 = 0 ;
+  unsigned int val4 ;
+  int ecode4 = 0 ;
+  float val5 ;
+  int ecode5 = 0 ;
+  PyObject * obj0 = 0 ;
+  PyObject * obj1 = 0 ;
+  PyObject * obj2 = 0 ;
+  PyObject * obj3 = 0 ;
+  PyObject * obj4 = 0 ;
+  int result;
+  
+  if (!PyArg_ParseTuple(args,(char *)"OOOOO:ws2811_rgb_render_calibration",&obj0,&obj1,&obj2,&obj3,&obj4)) SWIG_fail;
   res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_ws2811_t, 0 |  0 );
   if (!SWIG_IsOK(res1)) {
     SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "ws2811_rgb_render_calibration" "', argument " "1"" of type '" "ws2811_t *""'"); 
@@ -7460,21 +8025,30 @@ fail:
 }
 
 
-SWIGINTERN PyObject *_wrap_float_to_int_1000(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+SWIGINTERN PyObject *_wrap_palette_index(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
   PyObject *resultobj = 0;
-  float arg1 ;
-  float val1 ;
+  double arg1 ;
+  int arg2 ;
+  double val1 ;
   int ecode1 = 0 ;
+  int val2 ;
+  int ecode2 = 0 ;
   PyObject * obj0 = 0 ;
+  PyObject * obj1 = 0 ;
   int result;
   
-  if (!PyArg_ParseTuple(args,(char *)"O:float_to_int_1000",&obj0)) SWIG_fail;
-  ecode1 = SWIG_AsVal_float(obj0, &val1);
+  if (!PyArg_ParseTuple(args,(char *)"OO:palette_index",&obj0,&obj1)) SWIG_fail;
+  ecode1 = SWIG_AsVal_double(obj0, &val1);
   if (!SWIG_IsOK(ecode1)) {
-    SWIG_exception_fail(SWIG_ArgError(ecode1), "in method '" "float_to_int_1000" "', argument " "1"" of type '" "float""'");
+    SWIG_exception_fail(SWIG_ArgError(ecode1), "in method '" "palette_index" "', argument " "1"" of type '" "double""'");
   } 
-  arg1 = (float)(val1);
-  result = (int)float_to_int_1000(arg1);
+  arg1 = (double)(val1);
+  ecode2 = SWIG_AsVal_int(obj1, &val2);
+  if (!SWIG_IsOK(ecode2)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode2), "in method '" "palette_index" "', argument " "2"" of type '" "int""'");
+  } 
+  arg2 = (int)(val2);
+  result = (int)palette_index(arg1,arg2);
   resultobj = SWIG_From_int((int)(result));
   return resultobj;
 fail:
@@ -7482,21 +8056,30 @@ fail:
 }
 
 
-SWIGINTERN PyObject *_wrap_float_to_int_1000_mirror(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+SWIGINTERN PyObject *_wrap_palette_index_mirrored(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
   PyObject *resultobj = 0;
-  float arg1 ;
-  float val1 ;
+  double arg1 ;
+  int arg2 ;
+  double val1 ;
   int ecode1 = 0 ;
+  int val2 ;
+  int ecode2 = 0 ;
   PyObject * obj0 = 0 ;
+  PyObject * obj1 = 0 ;
   int result;
   
-  if (!PyArg_ParseTuple(args,(char *)"O:float_to_int_1000_mirror",&obj0)) SWIG_fail;
-  ecode1 = SWIG_AsVal_float(obj0, &val1);
+  if (!PyArg_ParseTuple(args,(char *)"OO:palette_index_mirrored",&obj0,&obj1)) SWIG_fail;
+  ecode1 = SWIG_AsVal_double(obj0, &val1);
   if (!SWIG_IsOK(ecode1)) {
-    SWIG_exception_fail(SWIG_ArgError(ecode1), "in method '" "float_to_int_1000_mirror" "', argument " "1"" of type '" "float""'");
+    SWIG_exception_fail(SWIG_ArgError(ecode1), "in method '" "palette_index_mirrored" "', argument " "1"" of type '" "double""'");
   } 
-  arg1 = (float)(val1);
-  result = (int)float_to_int_1000_mirror(arg1);
+  arg1 = (double)(val1);
+  ecode2 = SWIG_AsVal_int(obj1, &val2);
+  if (!SWIG_IsOK(ecode2)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode2), "in method '" "palette_index_mirrored" "', argument " "2"" of type '" "int""'");
+  } 
+  arg2 = (int)(val2);
+  result = (int)palette_index_mirrored(arg1,arg2);
   resultobj = SWIG_From_int((int)(result));
   return resultobj;
 fail:
@@ -7989,6 +8572,157 @@ fail:
 }
 
 
+SWIGINTERN PyObject *_wrap_ws2811_render_default_pattern_range(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  ws2811_channel_t *arg1 = (ws2811_channel_t *) 0 ;
+  int arg2 ;
+  double *arg3 = (double *) 0 ;
+  int arg4 ;
+  float *arg5 = (float *) 0 ;
+  int arg6 ;
+  int arg7 ;
+  int arg8 ;
+  double arg9 ;
+  uint32_t arg10 ;
+  float arg11 ;
+  float arg12 ;
+  float arg13 ;
+  uint8_t arg14 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  int val2 ;
+  int ecode2 = 0 ;
+  Py_buffer view3 ;
+  Py_buffer view5 ;
+  int val7 ;
+  int ecode7 = 0 ;
+  int val8 ;
+  int ecode8 = 0 ;
+  double val9 ;
+  int ecode9 = 0 ;
+  unsigned int val10 ;
+  int ecode10 = 0 ;
+  float val11 ;
+  int ecode11 = 0 ;
+  float val12 ;
+  int ecode12 = 0 ;
+  float val13 ;
+  int ecode13 = 0 ;
+  unsigned char val14 ;
+  int ecode14 = 0 ;
+  PyObject * obj0 = 0 ;
+  PyObject * obj1 = 0 ;
+  PyObject * obj2 = 0 ;
+  PyObject * obj3 = 0 ;
+  PyObject * obj4 = 0 ;
+  PyObject * obj5 = 0 ;
+  PyObject * obj6 = 0 ;
+  PyObject * obj7 = 0 ;
+  PyObject * obj8 = 0 ;
+  PyObject * obj9 = 0 ;
+  PyObject * obj10 = 0 ;
+  PyObject * obj11 = 0 ;
+  int result;
+  
+  if (!PyArg_ParseTuple(args,(char *)"OOOOOOOOOOOO:ws2811_render_default_pattern_range",&obj0,&obj1,&obj2,&obj3,&obj4,&obj5,&obj6,&obj7,&obj8,&obj9,&obj10,&obj11)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_ws2811_channel_t, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "ws2811_render_default_pattern_range" "', argument " "1"" of type '" "ws2811_channel_t *""'"); 
+  }
+  arg1 = (ws2811_channel_t *)(argp1);
+  ecode2 = SWIG_AsVal_int(obj1, &val2);
+  if (!SWIG_IsOK(ecode2)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode2), "in method '" "ws2811_render_default_pattern_range" "', argument " "2"" of type '" "int""'");
+  } 
+  arg2 = (int)(val2);
+  {
+    if (PyObject_GetBuffer(obj2, &view3, PyBUF_C_CONTIGUOUS | PyBUF_FORMAT) != 0) {
+      SWIG_fail;
+    }
+    if (view3.itemsize != sizeof(double) || !is_buffer_format(view3.format, 'd')) {
+      PyBuffer_Release(&view3);
+      PyErr_SetString(PyExc_TypeError, "Expecting a C-contiguous buffer of float64s");
+      SWIG_fail;
+    }
+    arg3 = (double *)view3.buf;
+    arg4 = (int)(view3.len / sizeof(double));
+  }
+  {
+    if (PyObject_GetBuffer(obj3, &view5, PyBUF_C_CONTIGUOUS | PyBUF_FORMAT) != 0) {
+      SWIG_fail;
+    }
+    if (view5.itemsize != sizeof(float) || !is_buffer_format(view5.format, 'f')) {
+      PyBuffer_Release(&view5);
+      PyErr_SetString(PyExc_TypeError, "Expecting a C-contiguous buffer of float32s");
+      SWIG_fail;
+    }
+    arg5 = (float *)view5.buf;
+    arg6 = (int)(view5.len / sizeof(float));
+  }
+  ecode7 = SWIG_AsVal_int(obj4, &val7);
+  if (!SWIG_IsOK(ecode7)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode7), "in method '" "ws2811_render_default_pattern_range" "', argument " "7"" of type '" "int""'");
+  } 
+  arg7 = (int)(val7);
+  ecode8 = SWIG_AsVal_int(obj5, &val8);
+  if (!SWIG_IsOK(ecode8)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode8), "in method '" "ws2811_render_default_pattern_range" "', argument " "8"" of type '" "int""'");
+  } 
+  arg8 = (int)(val8);
+  ecode9 = SWIG_AsVal_double(obj6, &val9);
+  if (!SWIG_IsOK(ecode9)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode9), "in method '" "ws2811_render_default_pattern_range" "', argument " "9"" of type '" "double""'");
+  } 
+  arg9 = (double)(val9);
+  ecode10 = SWIG_AsVal_unsigned_SS_int(obj7, &val10);
+  if (!SWIG_IsOK(ecode10)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode10), "in method '" "ws2811_render_default_pattern_range" "', argument " "10"" of type '" "uint32_t""'");
+  } 
+  arg10 = (uint32_t)(val10);
+  ecode11 = SWIG_AsVal_float(obj8, &val11);
+  if (!SWIG_IsOK(ecode11)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode11), "in method '" "ws2811_render_default_pattern_range" "', argument " "11"" of type '" "float""'");
+  } 
+  arg11 = (float)(val11);
+  ecode12 = SWIG_AsVal_float(obj9, &val12);
+  if (!SWIG_IsOK(ecode12)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode12), "in method '" "ws2811_render_default_pattern_range" "', argument " "12"" of type '" "float""'");
+  } 
+  arg12 = (float)(val12);
+  ecode13 = SWIG_AsVal_float(obj10, &val13);
+  if (!SWIG_IsOK(ecode13)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode13), "in method '" "ws2811_render_default_pattern_range" "', argument " "13"" of type '" "float""'");
+  } 
+  arg13 = (float)(val13);
+  ecode14 = SWIG_AsVal_unsigned_SS_char(obj11, &val14);
+  if (!SWIG_IsOK(ecode14)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode14), "in method '" "ws2811_render_default_pattern_range" "', argument " "14"" of type '" "uint8_t""'");
+  } 
+  arg14 = (uint8_t)(val14);
+  {
+    Py_BEGIN_ALLOW_THREADS
+    result = (int)ws2811_render_default_pattern_range(arg1,arg2,(double const *)arg3,arg4,(float const *)arg5,arg6,arg7,arg8,arg9,arg10,arg11,arg12,arg13,arg14);
+    Py_END_ALLOW_THREADS
+  }
+  resultobj = SWIG_From_int((int)(result));
+  {
+    if (arg3) PyBuffer_Release(&view3);
+  }
+  {
+    if (arg5) PyBuffer_Release(&view5);
+  }
+  return resultobj;
+fail:
+  {
+    if (arg3) PyBuffer_Release(&view3);
+  }
+  {
+    if (arg5) PyBuffer_Release(&view5);
+  }
+  return NULL;
+}
+
+
 static PyMethodDef SwigMethods[] = {
 	 { "SWIG_PyInstanceMethod_New", SWIG_PyInstanceMethod_New, METH_O, NULL},
 	 { "ws2811_channel_t_gpionum_set", _wrap_ws2811_channel_t_gpionum_set, METH_VARARGS, NULL},
@@ -8113,24 +8847,30 @@ static PyMethodDef SwigMethods[] = {
 	 { "new_color_rgb_float", _wrap_new_color_rgb_float, METH_VARARGS, NULL},
 	 { "delete_color_rgb_float", _wrap_delete_color_rgb_float, METH_VARARGS, NULL},
 	 { "color_rgb_float_swigregister", color_rgb_float_swigregister, METH_VARARGS, NULL},
-	 { "ws2811_channel_get", _wrap_ws2811_channel_get, METH_VARARGS, NULL},
-	 { "ws2811_led_get", _wrap_ws2811_led_get, METH_VARARGS, NULL},
-	 { "ws2811_led_set", _wrap_ws2811_led_set, METH_VARARGS, NULL},
 	 { "unpack_rgb", _wrap_unpack_rgb, METH_VARARGS, NULL},
 	 { "pack_rgbw", _wrap_pack_rgbw, METH_VARARGS, NULL},
 	 { "scale_8", _wrap_scale_8, METH_VARARGS, NULL},
 	 { "clamp", _wrap_clamp, METH_VARARGS, NULL},
 	 { "blackbody_to_rgb", _wrap_blackbody_to_rgb, METH_VARARGS, NULL},
 	 { "blackbody_correction_rgb", _wrap_blackbody_correction_rgb, METH_VARARGS, NULL},
+	 { "set_output_lut_cache_size", _wrap_set_output_lut_cache_size, METH_VARARGS, NULL},
 	 { "render_hsv2rgb_rainbow_float", _wrap_render_hsv2rgb_rainbow_float, METH_VARARGS, NULL},
 	 { "render_rgb_float", _wrap_render_rgb_float, METH_VARARGS, NULL},
+	 { "ws2811_channel_get", _wrap_ws2811_channel_get, METH_VARARGS, NULL},
+	 { "ws2811_led_get", _wrap_ws2811_led_get, METH_VARARGS, NULL},
+	 { "ws2811_led_set", _wrap_ws2811_led_set, METH_VARARGS, NULL},
 	 { "ws2811_hsv_render_all_float", _wrap_ws2811_hsv_render_all_float, METH_VARARGS, NULL},
 	 { "ws2811_hsv_render_range_float", _wrap_ws2811_hsv_render_range_float, METH_VARARGS, NULL},
 	 { "ws2811_rgb_render_all_float", _wrap_ws2811_rgb_render_all_float, METH_VARARGS, NULL},
 	 { "ws2811_rgb_render_range_float", _wrap_ws2811_rgb_render_range_float, METH_VARARGS, NULL},
+	 { "ws2811_hsv_render_range_buffer", _wrap_ws2811_hsv_render_range_buffer, METH_VARARGS, NULL},
+	 { "ws2811_rgb_render_range_buffer", _wrap_ws2811_rgb_render_range_buffer, METH_VARARGS, NULL},
+	 { "ws2811_rgb_render_range_buffer_uint8", _wrap_ws2811_rgb_render_range_buffer_uint8, METH_VARARGS, NULL},
+	 { "ws2811_hsv_render_palette_table", _wrap_ws2811_hsv_render_palette_table, METH_VARARGS, NULL},
+	 { "ws2811_render_range_indexed", _wrap_ws2811_render_range_indexed, METH_VARARGS, NULL},
 	 { "ws2811_rgb_render_calibration", _wrap_ws2811_rgb_render_calibration, METH_VARARGS, NULL},
-	 { "float_to_int_1000", _wrap_float_to_int_1000, METH_VARARGS, NULL},
-	 { "float_to_int_1000_mirror", _wrap_float_to_int_1000_mirror, METH_VARARGS, NULL},
+	 { "palette_index", _wrap_palette_index, METH_VARARGS, NULL},
+	 { "palette_index_mirrored", _wrap_palette_index_mirrored, METH_VARARGS, NULL},
 	 { "wave_pulse", _wrap_wave_pulse, METH_VARARGS, NULL},
 	 { "wave_triangle", _wrap_wave_triangle, METH_VARARGS, NULL},
 	 { "wave_sine", _wrap_wave_sine, METH_VARARGS, NULL},
@@ -8142,6 +8882,7 @@ static PyMethodDef SwigMethods[] = {
 	 { "grad", _wrap_grad, METH_VARARGS, NULL},
 	 { "perlin_noise_3d", _wrap_perlin_noise_3d, METH_VARARGS, NULL},
 	 { "fbm_noise_3d", _wrap_fbm_noise_3d, METH_VARARGS, NULL},
+	 { "ws2811_render_default_pattern_range", _wrap_ws2811_render_default_pattern_range, METH_VARARGS, NULL},
 	 { NULL, NULL, 0, NULL }
 };
 
@@ -1,71 +1,196 @@
 # led-control WS2812B LED Controller Server
 # Copyright 2022 jackw01. Released under the MIT License (see LICENSE for details).
 
-import time, os
-from threading import Event, Thread
+import math
+import os
+import time
+import traceback
+import numpy as np
+from threading import Event, Lock, Thread
+
+rate_window = 1.0 # Seconds of frames used to calculate the current rate
+error_interval = 10.0 # Seconds between error messages
 
 class IntervalTimer:
-    'Repeat function call at a regular interval'
+    '''
+    Repeat function call at a regular interval
+    Each call is scheduled at an absolute deadline, one interval after the previous deadline, so
+    timing errors don't add up. If a call takes longer than the interval, the deadlines that were
+    missed are skipped, or with frame_skip disabled, the schedule restarts after the late call.
+    The last spin_time seconds before each deadline are busy-waited for more precise timing.
+    Timing of the last history calls is kept so statistics can be read any number of times.
+    '''
 
-    def __init__(self, interval, function, *args, **kwargs):
+    def __init__(self, interval, function, spin_time=0.0, frame_skip=True,
+                 realtime_priority=0, cpu=None, history=1000):
         self._interval = interval
         self._function = function
-        self._args = args
-        self._kwargs = kwargs
+        self._spin_time = spin_time
+        self._frame_skip = frame_skip
+        self._realtime_priority = realtime_priority
+        self._cpu = cpu
         self._count = 0
-        self._last_perf_avg_count = -1
-        self._wait_time = 0
+        self._skipped = 0
+        self._errors = 0
+        self._last_error_time = None
         self.last_start = time.perf_counter()
-        self._last_measurement_c = 0
-        self._last_measurement_t = 0
-        self._perf_avg = 0
+        # Start time, latency after the deadline, execution time, and time since the previous
+        # call if it was on schedule (not idle or skipped) for every call, as a ring buffer
+        self._frames = np.zeros((history, 4), dtype=np.float64)
+        self._frames_lock = Lock()
         self._event = Event()
+        self._trigger = Event()
+        self._get_next_run = None
         self._thread = Thread(target=self.target, daemon=True)
-        self._is_windows = (os.name == 'nt')
 
     def start(self):
         'Starts the timer thread'
         self._thread.start()
 
     def target(self):
-        'Waits until ready and executes target function'
-        while not self._event.wait(self._wait_time):
+        'Waits until each deadline and executes target function'
+        self._set_scheduling()
+        deadline = time.perf_counter()
+        on_schedule = False
+        while True:
+            next_run = self._get_next_run() if self._get_next_run is not None else 0
+            if next_run > deadline:
+                # Sleep without waking up every interval until the next run or until triggered,
+                # but run no more often than once per interval
+                timeout = None
+                if next_run != math.inf:
+                    timeout = next_run - time.perf_counter() - self._spin_time
+                if self._trigger.wait(timeout):
+                    next_run = time.perf_counter()
+                deadline = max(next_run, self.last_start + self._interval)
+                on_schedule = False
+            self._trigger.clear()
+            if self._wait_until(deadline):
+                break
+
             current_start = time.perf_counter()
-            self._function(*self._args, **self._kwargs)
-            self._count += 1
-            cycle_time = time.perf_counter() - current_start
-            self._perf_avg += cycle_time
-
-            # Calculate wait for next iteration
-            # Needed because of timer resolution on windows or something like that???
-            if self._is_windows:
-                self._wait_time = self._interval - (current_start - self.last_start)
-            else:
-                self._wait_time = self._interval - cycle_time
+            period = current_start - self.last_start if on_schedule else math.nan
             self.last_start = current_start
-            if (self._wait_time < 0):
-                self._wait_time = 0
+            try:
+                self._function()
+            except Exception as e:
+                # Keep running, the next call may succeed
+                self._report(e)
+            end = time.perf_counter()
+            with self._frames_lock:
+                self._frames[self._count % len(self._frames)] = (current_start,
+                                                                 current_start - deadline,
+                                                                 end - current_start,
+                                                                 period)
+                self._count += 1
+
+            # Calculate the next deadline
+            deadline += self._interval
+            on_schedule = True
+            if end > deadline:
+                on_schedule = False
+                if self._frame_skip:
+                    missed = math.ceil((end - deadline) / self._interval)
+                    deadline += missed * self._interval
+                    self._skipped += missed
+                else:
+                    deadline = end
+
+    def _report(self, e):
+        'Prints errors at most once every error_interval seconds'
+        self._errors += 1
+        now = time.monotonic()
+        if self._last_error_time is None or now - self._last_error_time >= error_interval:
+            more = f' ({self._errors - 1} more errors)' if self._errors > 1 else ''
+            trace = ''.join(traceback.format_exception(type(e), e, e.__traceback__))
+            print(f'Error in timer function{more}:\n{trace}', end='')
+            self._errors = 0
+            self._last_error_time = now
+
+    def _wait_until(self, deadline):
+        'Sleeps until the deadline, returns True if the timer was stopped'
+        remaining = deadline - time.perf_counter() - self._spin_time
+        if remaining > 0 and self._event.wait(remaining):
+            return True
+        while time.perf_counter() < deadline:
+            pass
+        return self._event.is_set()
+
+    def _set_scheduling(self):
+        'Applies realtime priority and CPU affinity to the timer thread, Linux only'
+        try:
+            if self._cpu is not None:
+                os.sched_setaffinity(0, {self._cpu})
+            if self._realtime_priority > 0:
+                os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(self._realtime_priority))
+        except (AttributeError, OSError) as e:
+            print(f'Could not set timer thread scheduling: {e!r}')
+
+    def set_next_run_check(self, get_next_run):
+        '''
+        Sets a function that returns the time.perf_counter() time the function needs to run next,
+        or math.inf if it doesn't need to run again until trigger is called. Checked before
+        waiting for each run, times before the next deadline run on the usual schedule.
+        '''
+        self._get_next_run = get_next_run
+
+    def trigger(self):
+        'Runs the function as soon as the interval allows if it is waiting for its next run'
+        self._trigger.set()
 
     def get_count(self):
         'Returns cycle count'
         return self._count
 
+    def _get_frames(self):
+        'Returns a copy of the recorded timing for the most recent calls'
+        with self._frames_lock:
+            count = self._count
+            frames = self._frames.copy()
+        if count < len(frames):
+            return frames[:count]
+        return np.roll(frames, -(count % len(frames)), axis=0)
+
+    def _get_recent_frames(self):
+        'Returns timing for the calls in the last rate_window seconds'
+        frames = self._get_frames()
+        return frames[frames[:, 0] >= time.perf_counter() - rate_window]
+
     def get_perf_avg(self):
-        'Returns average function execution time and clears accumulator'
-        average = self._perf_avg / (self._count - self._last_perf_avg_count)
-        self._perf_avg = 0
-        self._last_perf_avg_count = self._count
-        return average
+        'Returns average function execution time over the last second'
+        frames = self._get_recent_frames()
+        return float(np.mean(frames[:, 2])) if len(frames) else 0.0
 
     def get_rate(self):
-        'Returns current rate in cycles per second'
-        result = ((self._count - self._last_measurement_c) /
-                  (self.last_start - self._last_measurement_t))
-        self._last_measurement_c = self._count
-        self._last_measurement_t = self.last_start
-        return result
+        'Returns current rate in cycles per second, measured over the last second'
+        frames = self._get_recent_frames()
+        if len(frames) < 2:
+            return 0.0 # Idle
+        return float((len(frames) - 1) / (frames[-1, 0] - frames[0, 0]))
+
+    def get_stats(self):
+        '''
+        Returns statistics for the most recent calls: percentiles of latency after the deadline
+        and execution time, and jitter as the standard deviation and 99th percentile deviation of
+        the time between calls from the interval, all in ms
+        '''
+        frames = self._get_frames() * 1000
+        stats = {'count': self._count, 'skipped': self._skipped, 'fps': self.get_rate()}
+        for i, name in ((1, 'latency'), (2, 'execution')):
+            values = frames[:, i]
+            stats[name] = {f'p{p}_ms': float(np.percentile(values, p)) if len(values) else 0.0
+                           for p in (50, 95, 99)}
+            stats[name]['max_ms'] = float(values.max()) if len(values) else 0.0
+        periods = frames[:, 3][~np.isnan(frames[:, 3])]
+        deviations = np.abs(periods - self._interval * 1000)
+        stats['jitter'] = {
+            'std_ms': float(np.std(periods)) if len(periods) else 0.0,
+            'p99_ms': float(np.percentile(deviations, 99)) if len(periods) else 0.0,
+        }
+        return stats
 
     def stop(self):
         'Stops the timer thread'
         self._event.set()
+        self._trigger.set()
         self._thread.join()
@@ -2,15 +2,13 @@
 # Copyright 2021 jackw01. Released under the MIT License (see LICENSE for details).
 
 import atexit
-import serial
 import numpy as np
-import itertools
-import socket
-import traceback
 from enum import Enum
 
 import ledcontrol.animationfunctions as animfunctions
 import ledcontrol.driver as driver
+import ledcontrol.remoteprotocol as remoteprotocol
+from ledcontrol.remotesender import RemoteSender
 import ledcontrol.utils as utils
 
 class TargetMode(str, Enum):
@@ -24,7 +22,10 @@ class LEDController:
                  led_pin,
                  led_data_rate,
                  led_dma_channel,
-                 led_pixel_order):
+                 led_pixel_order,
+                 led_gamma=1.0):
+        self._count = led_count
+
         if driver.is_raspberrypi():
             # This is bad but it's the only way
             px_order = driver.WS2811_STRIP_GRB
@@ -54,7 +55,7 @@ class LEDController:
                 px_order = driver.SK6812_STRIP_BGRW
 
             self._has_white = 1 if 'W' in led_pixel_order else 0
-            self._count = led_count
+            self._gamma = led_gamma
 
             # Create ws2811_t structure and fill in parameters
             self._leds = driver.new_ws2811_t()
@@ -69,6 +70,7 @@ class LEDController:
 
             # Initialize the channel in use
             self._channel = driver.ws2811_channel_get(self._leds, 0) # default
+            # Gamma is applied by the output lookup tables in the driver instead of the library
             driver.ws2811_channel_t_gamma_set(self._channel, list(range(256)))
             driver.ws2811_channel_t_count_set(self._channel, led_count)
             driver.ws2811_channel_t_gpionum_set(self._channel, led_pin)
@@ -89,14 +91,15 @@ class LEDController:
                 str_resp = driver.ws2811_get_return_t_str(resp)
                 raise RuntimeError('ws2811_init failed with code {0} ({1})'.format(resp, str_resp))
 
-        # Used for scaling values sent for remote rendering
-        self._where_hue = np.zeros((led_count * 3,), dtype=bool)
-        self._where_hue[0::3] = True
-
-        self._targets_serial = {}
-        self._targets_udp = {}
+        # Buffers for rendering are allocated once and reused for every frame
+        self._data = np.zeros((led_count * 3,), dtype=np.float32)
+        self._data_uint8 = np.zeros((led_count * 3,), dtype=np.uint8)
 
-        self._udp_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        # Protocol state, sender thread, and packets for the current frame
+        # for each (render_mode, render_target)
+        self._remote_targets = {}
+        self._remote_senders = {}
+        self._remote_packets = {}
 
     def _cleanup(self):
         # Clean up memory used by the library when not needed anymore
@@ -108,38 +111,88 @@ class LEDController:
     def set_range(self, pixels, start, end,
                   correction, saturation, brightness, color_mode,
                   render_mode, render_target):
+        # uint8 colors, such as sACN data, are always RGB and are output without conversion
+        is_uint8 = isinstance(pixels, np.ndarray) and pixels.dtype == np.uint8
         if render_mode == TargetMode.local:
-            if driver.is_raspberrypi():
+            if driver.is_raspberrypi() and is_uint8:
+                driver.ws2811_rgb_render_range_buffer_uint8(self._channel,
+                                                            np.ascontiguousarray(pixels),
+                                                            start, end,
+                                                            correction, saturation, brightness,
+                                                            self._gamma,
+                                                            self._has_white)
+            elif driver.is_raspberrypi():
+                # Colors are read in place by the driver if they are already float32
+                if (not isinstance(pixels, np.ndarray)
+                        or pixels.dtype != np.float32
+                        or not pixels.flags.c_contiguous):
+                    data = self._data[0:(end - start) * 3]
+                    data.reshape(-1, 3)[:] = pixels
+                    pixels = data
                 if color_mode == animfunctions.ColorMode.hsv:
-                    driver.ws2811_hsv_render_range_float(self._channel, pixels,
-                                                         start, end,
-                                                         correction, saturation,  brightness, 1.0,
-                                                         self._has_white)
+                    driver.ws2811_hsv_render_range_buffer(self._channel, pixels,
+                                                          start, end,
+                                                          correction, saturation, brightness,
+                                                          self._gamma,
+                                                          self._has_white)
                 else:
-                    driver.ws2811_rgb_render_range_float(self._channel, pixels,
-                                                         start, end,
-                                                         correction, saturation,  brightness, 1.0,
-                                                         self._has_white)
+                    driver.ws2811_rgb_render_range_buffer(self._channel, pixels,
+                                                          start, end,
+                                                          correction, saturation, brightness,
+                                                          self._gamma,
+                                                          self._has_white)
         else:
-            data = np.fromiter(itertools.chain.from_iterable(pixels), np.float32)
-            if color_mode == animfunctions.ColorMode.hsv:
-                np.fmod(data, 1.0, where=self._where_hue[0:(end - start) * 3], out=data)
-                data = data * 255.0
+            count = (end - start) * 3
+            if is_uint8:
+                colors = np.ascontiguousarray(pixels).reshape(-1)
             else:
-                data = data * 255.0
-                data = np.clip(data, 0.0, 255.0)
-            data = data.astype(np.uint8)
-            packet = (b'\x00'
-                      + (b'\x02' if color_mode == animfunctions.ColorMode.hsv else b'\x01')
-                      + int((end - start) * 3 + 13).to_bytes(2, 'big')
-                      + correction.to_bytes(3, 'big')
-                      + int(saturation * 255).to_bytes(1, 'big')
-                      + int(brightness * 255).to_bytes(1, 'big')
-                      + start.to_bytes(2, 'big')
-                      + end.to_bytes(2, 'big')
-                      + data.tobytes())
-            self._send(packet, render_mode, render_target)
-            self._send(b'\x00\x03\x00\x05\x00', render_mode, render_target)
+                colors = remoteprotocol.colors_to_uint8(pixels,
+                                                        color_mode == animfunctions.ColorMode.hsv,
+                                                        self._data[0:count],
+                                                        self._data_uint8[0:count])
+            target = self._get_remote_target(render_mode, render_target)
+            target.handle_replies(self._get_remote_sender(render_mode, render_target).get_replies())
+            # Packets are sent together when the frame is rendered
+            packets = self._remote_packets.setdefault((render_mode, render_target), [])
+            packets.extend(target.range_packets(colors,
+                                                color_mode == animfunctions.ColorMode.hsv,
+                                                correction, saturation, brightness,
+                                                start, end))
+
+    def set_group_count(self, count):
+        'Keep an output lookup table in the driver for each group, and one for clearing LEDs'
+        if driver.is_raspberrypi():
+            driver.set_output_lut_cache_size(count + 1)
+
+    def render_palette_table(self, palette, correction, saturation, brightness):
+        '''
+        Convert a palette table of hsv colors to output colors, local output only
+        Returns None if palette tables are not supported
+        '''
+        if driver.is_raspberrypi():
+            table = np.zeros(len(palette), dtype=np.uint32)
+            driver.ws2811_hsv_render_palette_table(palette, table,
+                                                   correction, saturation, brightness,
+                                                   self._gamma,
+                                                   self._has_white)
+            return table
+        return None
+
+    def set_range_indexed(self, indices, table, start, end):
+        'Set a range of LEDs to colors from a table returned by render_palette_table'
+        if driver.is_raspberrypi():
+            driver.ws2811_render_range_indexed(self._channel, indices, table, start, end)
+
+    def render_default_pattern(self, function, mapping, palette, start, end, time,
+                               correction, saturation, brightness):
+        'Render a default pattern with its native version in the driver, local output only'
+        if driver.is_raspberrypi():
+            driver.ws2811_render_default_pattern_range(self._channel, function,
+                                                       mapping, palette,
+                                                       start, end, time,
+                                                       correction, saturation, brightness,
+                                                       self._gamma,
+                                                       self._has_white)
 
     def show_calibration_color(self, count, correction, brightness,
                                render_mode, render_target):
@@ -152,26 +205,35 @@ class LEDController:
             packet = (b'\x00\x00\x00\x08'
                       + correction.to_bytes(3, 'big')
                       + int(brightness * 255).to_bytes(1, 'big'))
-            self._send(packet, render_mode, render_target)
+            self._send([packet], render_mode, render_target)
 
     def render(self):
         # send global render command if output mode is raspberry pi
         if driver.is_raspberrypi():
             driver.ws2811_render(self._leds)
-
-    def _send(self, packet, mode, target):
-        try:
-            if mode == TargetMode.serial:
-                if target not in self._targets_serial:
-                    self._targets_serial[target] = serial.Serial(target,
-                                                                 115200,
-                                                                 timeout=0.01,
-                                                                 write_timeout=0)
-                self._targets_serial[target].write(packet)
-            elif mode == TargetMode.udp:
-                if target not in self._targets_udp:
-                    self._targets_udp[target] = (socket.gethostbyname(target), 8888)
-                self._udp_socket.sendto(packet, self._targets_udp[target])
-        except Exception as e:
-            msg = traceback.format_exception(type(e), e, e.__traceback__)
-            print(f'Error during remote rendering: {msg}')
+        # Remote targets get everything for the frame with one write LEDs command at the end
+        for (mode, target), packets in self._remote_packets.items():
+            if packets:
+                packets.append(self._get_remote_target(mode, target).end_frame())
+                self._send(packets, mode, target)
+                packets.clear()
+
+    def _get_remote_target(self, mode, target):
+        key = (mode, target)
+        if key not in self._remote_targets:
+            self._remote_targets[key] = remoteprotocol.RemoteTarget(self._count)
+        return self._remote_targets[key]
+
+    def _get_remote_sender(self, mode, target):
+        key = (mode, target)
+        if key not in self._remote_senders:
+            self._remote_senders[key] = RemoteSender(mode, target)
+        return self._remote_senders[key]
+
+    def _send(self, packets, mode, target):
+        'Queues packets for a remote target as one serial write or as few datagrams as possible'
+        if mode == TargetMode.serial:
+            items = [b''.join(packets)]
+        else:
+            items = self._get_remote_target(mode, target).datagrams(packets)
+        self._get_remote_sender(mode, target).send(items)
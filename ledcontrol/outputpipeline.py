@@ -0,0 +1,162 @@
+# led-control WS2812B LED Controller Server
+# Copyright 2023 jackw01. Released under the MIT License (see LICENSE for details).
+
+import queue
+import traceback
+import numpy as np
+from threading import Lock, Thread
+
+class _Frame:
+    'Copies of the colors and arguments passed to an LEDController during one frame'
+
+    def __init__(self, led_count):
+        self.pixels = np.zeros((max(led_count, 1), 3), dtype=np.float32)
+        self.pixels_uint8 = np.zeros((max(led_count, 1), 3), dtype=np.uint8)
+        self.indices = np.zeros(max(led_count, 1), dtype=np.uint32)
+        self.calls = []
+        self.render = False
+        self._offset = 0
+        self._uint8_offset = 0
+        self._index_offset = 0
+
+    def clear(self):
+        self.calls.clear()
+        self.render = False
+        self._offset = 0
+        self._uint8_offset = 0
+        self._index_offset = 0
+
+    def store(self, pixels):
+        'Copies colors into the frame and returns a view of the copy'
+        if isinstance(pixels, np.ndarray) and pixels.dtype == np.uint8:
+            return self.store_uint8(pixels)
+        count = len(pixels)
+        if self._offset + count > len(self.pixels): # Groups may overlap
+            self.pixels = np.concatenate((self.pixels, np.zeros_like(self.pixels)))
+            return self.store(pixels)
+        view = self.pixels[self._offset:self._offset + count]
+        if count > 0:
+            view[:] = pixels
+        self._offset += count
+        return view
+
+    def store_uint8(self, pixels):
+        'Copies uint8 colors into a separate buffer, so they are output without conversion'
+        count = len(pixels)
+        if self._uint8_offset + count > len(self.pixels_uint8):
+            self.pixels_uint8 = np.concatenate((self.pixels_uint8,
+                                                np.zeros_like(self.pixels_uint8)))
+            return self.store_uint8(pixels)
+        view = self.pixels_uint8[self._uint8_offset:self._uint8_offset + count]
+        if count > 0:
+            view[:] = pixels
+        self._uint8_offset += count
+        return view
+
+    def store_indices(self, indices):
+        'Copies palette table indices into the frame and returns a view of the copy'
+        count = len(indices)
+        if self._index_offset + count > len(self.indices):
+            self.indices = np.concatenate((self.indices, np.zeros_like(self.indices)))
+            return self.store_indices(indices)
+        view = self.indices[self._index_offset:self._index_offset + count]
+        if count > 0:
+            view[:] = indices
+        self._index_offset += count
+        return view
+
+class OutputPipeline:
+    '''
+    Wraps an LEDController and sends frames to it in a separate thread, so the next frame
+    can be rendered while the previous frame is being sent to the LEDs
+    '''
+
+    def __init__(self, led_controller, led_count, buffers):
+        self._led_controller = led_controller
+        self._free = queue.Queue()
+        self._ready = queue.Queue()
+        for i in range(max(buffers, 2)):
+            self._free.put(_Frame(led_count))
+        self._current = None
+        self._lock = Lock()
+        self._thread = Thread(target=self._target, daemon=True)
+        self._thread.start()
+
+    def _get_frame(self):
+        'Returns the frame being recorded, waits until a buffer is free if needed'
+        if self._current is None:
+            self._current = self._free.get()
+        return self._current
+
+    def _submit(self, render):
+        frame = self._get_frame()
+        frame.render = render
+        self._current = None
+        self._ready.put(frame)
+
+    def set_range(self, pixels, start, end,
+                  correction, saturation, brightness, color_mode,
+                  render_mode, render_target):
+        with self._lock:
+            frame = self._get_frame()
+            frame.calls.append((self._led_controller.set_range,
+                                (frame.store(pixels), start, end,
+                                 correction, saturation, brightness, color_mode,
+                                 render_mode, render_target)))
+
+    def set_group_count(self, count):
+        self._led_controller.set_group_count(count)
+
+    def render_palette_table(self, palette, correction, saturation, brightness):
+        return self._led_controller.render_palette_table(palette, correction,
+                                                         saturation, brightness)
+
+    def set_range_indexed(self, indices, table, start, end):
+        # Tables are replaced instead of modified, so they are not copied
+        with self._lock:
+            frame = self._get_frame()
+            frame.calls.append((self._led_controller.set_range_indexed,
+                                (frame.store_indices(indices), table, start, end)))
+
+    def render_default_pattern(self, function, mapping, palette, start, end, time,
+                               correction, saturation, brightness):
+        # Mapping and palette arrays are replaced instead of modified, so they are not copied
+        with self._lock:
+            self._get_frame().calls.append((self._led_controller.render_default_pattern,
+                                            (function, mapping, palette, start, end, time,
+                                             correction, saturation, brightness)))
+
+    def show_calibration_color(self, count, correction, brightness,
+                               render_mode, render_target):
+        # Calibration colors are displayed without a call to render
+        with self._lock:
+            self._get_frame().calls.append((self._led_controller.show_calibration_color,
+                                            (count, correction, brightness,
+                                             render_mode, render_target)))
+            self._submit(False)
+
+    def render(self):
+        with self._lock:
+            self._submit(True)
+
+    def stop(self):
+        'Waits for all frames to be sent and stops the output thread'
+        self._ready.put(None)
+        self._thread.join()
+
+    def _target(self):
+        'Sends frames to the LEDController in the order they were rendered'
+        while True:
+            frame = self._ready.get()
+            if frame is None:
+                break
+            try:
+                for function, args in frame.calls:
+                    function(*args)
+                if frame.render:
+                    self._led_controller.render()
+            except Exception as e:
+                msg = traceback.format_exception(type(e), e, e.__traceback__)
+                print(f'Error during LED output: {msg}')
+            frame.clear()
+            self._free.put(frame)
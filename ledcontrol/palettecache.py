@@ -0,0 +1,96 @@
+# led-control WS2812B LED Controller Server
+# Copyright 2023 jackw01. Released under the MIT License (see LICENSE for details).
+
+import collections
+import queue
+from threading import Lock, Thread
+
+# Approximate memory used by each color in the palette tables of per-pixel patterns
+# (a list entry pointing to a tuple of 3 floats)
+table_color_bytes = 8 + 64 + 3 * 24
+
+class PaletteCache:
+    '''
+    Least recently used cache of palette lookup tables with a limit on total memory usage
+    Tables are calculated when they are first needed, or ahead of time in a background thread
+    '''
+
+    def __init__(self, calculate, max_bytes):
+        self._calculate = calculate
+        self._max_bytes = max_bytes
+        self._entries = collections.OrderedDict() # [array, list of tuples or None] for each key
+        self._bytes = 0
+        self._generation = 0 # Incremented when tables are invalidated
+        self._lock = Lock()
+        self._queue = None
+        self._thread = None
+
+    def _entry_bytes(self, entry):
+        array, table = entry
+        return array.nbytes + (0 if table is None else len(table) * table_color_bytes)
+
+    def _evict(self):
+        'Removes least recently used tables until memory usage is under the limit'
+        # The most recently used table is always kept
+        while self._bytes > self._max_bytes and len(self._entries) > 1:
+            self._bytes -= self._entry_bytes(self._entries.popitem(last=False)[1])
+
+    def get_array(self, key):
+        'Returns the lookup table for a palette as an array of shape (size, 3)'
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key][0]
+            generation = self._generation
+
+        array = self._calculate(key)
+        with self._lock:
+            # Don't store tables for palettes that were changed while calculating
+            if generation == self._generation and key not in self._entries:
+                entry = [array, None]
+                self._entries[key] = entry
+                self._bytes += self._entry_bytes(entry)
+                self._evict()
+        return array
+
+    def get_table(self, key):
+        'Returns the lookup table for a palette as a list of tuples'
+        array = self.get_array(key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] is not None:
+                return entry[1]
+
+        table = list(map(tuple, array.tolist()))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] is array and entry[1] is None:
+                entry[1] = table
+                self._bytes += len(table) * table_color_bytes
+                self._evict()
+        return table
+
+    def prewarm(self, keys):
+        'Calculates tables for palettes in a background thread, most recently used last'
+        if self._thread is None:
+            self._queue = queue.Queue()
+            self._thread = Thread(target=self._target, daemon=True)
+            self._thread.start()
+        for key in keys:
+            self._queue.put(key)
+
+    def _target(self):
+        while True:
+            key = self._queue.get()
+            try:
+                self.get_array(key)
+            except Exception:
+                pass # Errors are reported when the palette is used
+
+    def invalidate(self, key):
+        'Removes the tables for a palette'
+        with self._lock:
+            self._generation += 1
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._bytes -= self._entry_bytes(entry)
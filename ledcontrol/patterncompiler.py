@@ -0,0 +1,428 @@
+# led-control WS2812B LED Controller Server
+# Copyright 2023 jackw01. Released under the MIT License (see LICENSE for details).
+
+# Translates per-pixel pattern functions into equivalent vectorized pattern functions.
+# Only a subset of Python is supported: assignments, arithmetic, comparisons, the
+# pattern utility functions, and if statements or expressions, which become where().
+# Both sides of every condition are evaluated, so the translated function computes
+# the same values as the original as long as all expressions are free of side effects.
+
+import ast
+import copy
+import sys
+
+class UnsupportedPattern(Exception):
+    'Raised when a pattern uses a construct that cannot be translated'
+    pass
+
+arg_names = ['t', 'dt', 'x', 'y', 'z', 'prev_state']
+
+# Functions that take and return single values and work on arrays without changes
+value_functions = [
+    'abs', 'clamp', 'fract', 'impulse_exp',
+    'wave_pulse', 'wave_triangle', 'wave_sine', 'wave_cubic',
+    'plasma_sines', 'plasma_sines_octave', 'perlin_noise_3d', 'fbm_noise_3d',
+]
+palette_functions = ['palette', 'palette_mirrored']
+math_names = [
+    'pi', 'e', 'tau', 'inf', 'nan',
+    'sin', 'cos', 'tan', 'asin', 'acos', 'atan', 'atan2',
+    'sinh', 'cosh', 'tanh', 'asinh', 'acosh', 'atanh',
+    'sqrt', 'exp', 'expm1', 'pow', 'hypot', 'log', 'log2', 'log10', 'log1p',
+    'floor', 'ceil', 'trunc', 'fabs', 'fmod', 'copysign', 'degrees', 'radians',
+    'isnan', 'isinf', 'isfinite',
+]
+color_modes = ['hsv', 'rgb', 'palette_index']
+
+# Kinds of values tracked during translation
+VALUE = 'value' # Scalar or array with one value per LED
+COLOR = 'color' # Array with three channels per LED
+TUPLE = 'tuple' # Tuple of values
+MODE = 'mode' # Color mode constant
+
+def _name(id):
+    return ast.Name(id=id, ctx=ast.Load())
+
+def _call(func, *args):
+    return ast.Call(func=func, args=list(args), keywords=[])
+
+def _where(cond, a, b):
+    return _call(_name('where'), cond, a, b)
+
+def _channel(node, i):
+    return ast.Subscript(value=node,
+                         slice=ast.Tuple(elts=[ast.Constant(value=Ellipsis), ast.Constant(value=i)],
+                                         ctx=ast.Load()),
+                         ctx=ast.Load())
+
+def _contains_return(stmts):
+    return any(isinstance(n, ast.Return) for s in stmts for n in ast.walk(s))
+
+class _Translator:
+    def __init__(self, source_names):
+        self._source_names = source_names
+        self._counter = 0
+        self.statements = []
+
+    def fresh(self, base):
+        'Returns a variable name that does not appear in the source'
+        while True:
+            self._counter += 1
+            name = f'{base}_{self._counter}_'
+            if name not in self._source_names:
+                return name
+
+    def assign(self, base, node):
+        'Appends an assignment to a new variable and returns a node that loads it'
+        name = self.fresh(base)
+        self.statements.append(ast.Assign(targets=[ast.Name(id=name, ctx=ast.Store())],
+                                          value=node))
+        return _name(name)
+
+    # Statements
+
+    def block(self, stmts, env):
+        '''
+        Translates a list of statements.
+        Returns ('return', channels, mode) if every path returns, otherwise ('env', env).
+        '''
+        for i, stmt in enumerate(stmts):
+            if isinstance(stmt, ast.Assign):
+                if len(stmt.targets) != 1 or not isinstance(stmt.targets[0], ast.Name):
+                    raise UnsupportedPattern('assignment to non-variable')
+                name = stmt.targets[0].id
+                env[name] = self.variable(name, stmt.value, env)
+            elif isinstance(stmt, ast.Pass):
+                pass
+            elif isinstance(stmt, ast.Expr) and isinstance(stmt.value, ast.Constant):
+                pass # Docstring or other constant expression
+            elif isinstance(stmt, ast.Return):
+                channels, mode = self.result(stmt.value, env)
+                return 'return', channels, mode
+            elif isinstance(stmt, ast.If):
+                cond = self.assign('cond', self.condition(stmt.test, env))
+                if _contains_return(stmt.body) or _contains_return(stmt.orelse):
+                    # Evaluate the rest of the function for both outcomes and merge the results
+                    rest = stmts[i + 1:]
+                    r1 = self.block(stmt.body + rest, dict(env))
+                    r2 = self.block(stmt.orelse + rest, dict(env))
+                    if r1[0] != 'return' or r2[0] != 'return':
+                        raise UnsupportedPattern('pattern does not always return')
+                    if r1[2] != r2[2]:
+                        raise UnsupportedPattern('color mode depends on a condition')
+                    channels = [self.assign('c', _where(cond, a, b))
+                                for a, b in zip(r1[1], r2[1])]
+                    return 'return', channels, r1[2]
+                else:
+                    env1 = self.block(stmt.body, dict(env))[1]
+                    env2 = self.block(stmt.orelse, dict(env))[1]
+                    env = self.merge(cond, env, env1, env2)
+            else:
+                raise UnsupportedPattern(f'{type(stmt).__name__} statement')
+        return 'env', env
+
+    def variable(self, base, value, env):
+        'Evaluates an expression into new variables, returns (kind, node or list of nodes)'
+        if isinstance(value, ast.Tuple):
+            return TUPLE, [self.assign(base, self.value(e, env)) for e in value.elts]
+        node, kind = self.expression(value, env)
+        if kind == MODE:
+            raise UnsupportedPattern('color mode stored in variable')
+        elif kind == TUPLE:
+            return kind, node.elts
+        return kind, self.assign(base, node)
+
+    def merge(self, cond, env, env1, env2):
+        'Merges variables assigned in the branches of an if statement'
+        merged = dict(env)
+        for name in set(env1) | set(env2):
+            v1, v2 = env1.get(name), env2.get(name)
+            if v1 is v2:
+                continue
+            if v1 is None or v2 is None:
+                raise UnsupportedPattern(f'variable {name} is only assigned in one branch')
+            c1, c2 = self.channels(v1), self.channels(v2)
+            if len(c1) != len(c2):
+                raise UnsupportedPattern(f'variable {name} has different types in each branch')
+            if v1[0] == VALUE:
+                merged[name] = (VALUE, self.assign(name, _where(cond, c1[0], c2[0])))
+            else:
+                merged[name] = (TUPLE, [self.assign(name, _where(cond, a, b))
+                                          for a, b in zip(c1, c2)])
+        return merged
+
+    def channels(self, variable):
+        'Returns a list of nodes for each channel of a variable'
+        kind, node = variable
+        if kind == VALUE:
+            return [node]
+        elif kind == COLOR:
+            return [_channel(node, i) for i in range(3)]
+        else:
+            return node
+
+    def result(self, value, env):
+        'Translates the value of a return statement'
+        if not isinstance(value, ast.Tuple) or len(value.elts) != 2:
+            raise UnsupportedPattern('return value must be a color and a color mode')
+        color, mode = value.elts
+        if not isinstance(mode, ast.Name) or mode.id not in color_modes or mode.id in env:
+            raise UnsupportedPattern('return value must be a color and a color mode')
+        kind, node = self.variable('color', color, env)
+        if mode.id == 'palette_index':
+            if kind != VALUE:
+                raise UnsupportedPattern('palette index must be a single value')
+            return [node], mode.id
+        if kind == VALUE:
+            raise UnsupportedPattern('return value must be a color and a color mode')
+        channels = self.channels((kind, node))
+        if len(channels) != 3:
+            raise UnsupportedPattern('color must have three channels')
+        return channels, mode.id
+
+    # Expressions
+
+    def value(self, node, env):
+        'Translates an expression that must evaluate to a single value per LED'
+        node, kind = self.expression(node, env)
+        if kind != VALUE:
+            raise UnsupportedPattern('arithmetic on colors or tuples')
+        return node
+
+    def condition(self, node, env):
+        'Translates a boolean expression'
+        if isinstance(node, ast.BoolOp):
+            func = 'logical_and' if isinstance(node.op, ast.And) else 'logical_or'
+            result = self.condition(node.values[0], env)
+            for v in node.values[1:]:
+                result = _call(_name(func), result, self.condition(v, env))
+            return result
+        elif isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+            return _call(_name('logical_not'), self.condition(node.operand, env))
+        else:
+            return self.value(node, env)
+
+    def expression(self, node, env):
+        'Translates an expression, returns (node, kind)'
+        if isinstance(node, ast.Constant):
+            if type(node.value) not in (int, float, bool):
+                raise UnsupportedPattern(f'{type(node.value).__name__} constant')
+            return node, VALUE
+
+        elif isinstance(node, ast.Name):
+            if node.id in env:
+                kind, value = env[node.id]
+                if kind == TUPLE:
+                    return ast.Tuple(elts=value, ctx=ast.Load()), TUPLE
+                return value, kind
+            elif node.id in arg_names:
+                return node, COLOR if node.id == 'prev_state' else VALUE
+            elif node.id in color_modes:
+                return node, MODE
+            raise UnsupportedPattern(f'name {node.id}')
+
+        elif isinstance(node, ast.BinOp):
+            return ast.BinOp(left=self.value(node.left, env),
+                             op=node.op,
+                             right=self.value(node.right, env)), VALUE
+
+        elif isinstance(node, ast.UnaryOp):
+            if isinstance(node.op, ast.Not):
+                return self.condition(node, env), VALUE
+            return ast.UnaryOp(op=node.op, operand=self.value(node.operand, env)), VALUE
+
+        elif isinstance(node, ast.Compare):
+            # Chained comparisons become logical_and of each comparison
+            operands = [self.value(node.left, env)] + [self.value(c, env) for c in node.comparators]
+            result = None
+            for op, a, b in zip(node.ops, operands, operands[1:]):
+                if type(op) not in (ast.Lt, ast.LtE, ast.Gt, ast.GtE, ast.Eq, ast.NotEq):
+                    raise UnsupportedPattern(f'{type(op).__name__} comparison')
+                c = ast.Compare(left=a, ops=[op], comparators=[b])
+                result = c if result is None else _call(_name('logical_and'), result, c)
+            return result, VALUE
+
+        elif isinstance(node, ast.BoolOp):
+            # Only allowed when used as a condition, since and/or return one of their operands
+            if all(isinstance(v, (ast.Compare, ast.BoolOp)) or
+                   (isinstance(v, ast.UnaryOp) and isinstance(v.op, ast.Not))
+                   for v in node.values):
+                return self.condition(node, env), VALUE
+            raise UnsupportedPattern('and/or with non-boolean values')
+
+        elif isinstance(node, ast.IfExp):
+            cond = self.condition(node.test, env)
+            a, kind_a = self.expression(node.body, env)
+            b, kind_b = self.expression(node.orelse, env)
+            if kind_a != VALUE or kind_b != VALUE:
+                raise UnsupportedPattern('conditional expression with colors or tuples')
+            return _where(cond, a, b), VALUE
+
+        elif isinstance(node, ast.Subscript):
+            index = node.slice
+            if not (isinstance(index, ast.Constant) and type(index.value) is int):
+                raise UnsupportedPattern('subscript with non-constant index')
+            value, kind = self.expression(node.value, env)
+            if kind == COLOR:
+                if not -3 <= index.value < 3:
+                    raise UnsupportedPattern('color channel out of range')
+                return _channel(value, index.value % 3), VALUE
+            elif kind == TUPLE:
+                return value.elts[index.value], VALUE
+            raise UnsupportedPattern('subscript of a single value')
+
+        elif isinstance(node, ast.Attribute):
+            if isinstance(node.value, ast.Name) and node.value.id == 'math' and 'math' not in env:
+                if node.attr in math_names:
+                    return node, VALUE
+            raise UnsupportedPattern('attribute access')
+
+        elif isinstance(node, ast.Call):
+            return self.call(node, env)
+
+        raise UnsupportedPattern(f'{type(node).__name__} expression')
+
+    def call(self, node, env):
+        'Translates a function call'
+        if node.keywords:
+            raise UnsupportedPattern('keyword arguments')
+        func = node.func
+
+        if isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name):
+            module = func.value.id
+            if module == 'math' and func.attr in math_names and module not in env:
+                return _call(func, *[self.value(a, env) for a in node.args]), VALUE
+            if module == 'random' and module not in env:
+                # Generate one random value per LED
+                size = _call(_name('len'), _name('x'))
+                if func.attr == 'random' and len(node.args) == 0:
+                    return _call(func, size), VALUE
+                if func.attr == 'uniform' and len(node.args) == 2:
+                    return _call(func, *[self.value(a, env) for a in node.args], size), VALUE
+            raise UnsupportedPattern(f'function {module}.{func.attr}')
+
+        if not isinstance(func, ast.Name) or func.id in env:
+            raise UnsupportedPattern('call of non-function')
+
+        args = [self.value(a, env) for a in node.args]
+        if func.id in value_functions:
+            return _call(func, *args), VALUE
+        elif func.id in palette_functions:
+            if len(args) != 1:
+                raise UnsupportedPattern(f'{func.id} takes one argument')
+            return _call(func, *args), COLOR
+        elif func.id == 'float' and len(args) == 1:
+            return args[0], VALUE
+        elif func.id == 'int' and len(args) == 1:
+            return _call(ast.Attribute(value=_name('math'), attr='trunc', ctx=ast.Load()),
+                         args[0]), VALUE
+        elif func.id == 'pow' and len(args) == 2:
+            return ast.BinOp(left=args[0], op=ast.Pow(), right=args[1]), VALUE
+        raise UnsupportedPattern(f'function {func.id}')
+
+def vectorize(source):
+    '''
+    Translates the per-pixel pattern function in source to a vectorized pattern function.
+    Returns an ast.Module defining pattern_vectorized, raises UnsupportedPattern if the
+    pattern cannot be translated.
+    '''
+    if sys.version_info < (3, 9):
+        raise UnsupportedPattern('translation requires Python 3.9 or newer')
+    try:
+        tree = ast.parse(source)
+    except SyntaxError:
+        raise UnsupportedPattern('syntax error')
+    functions = [s for s in tree.body if isinstance(s, ast.FunctionDef) and s.name == 'pattern']
+    if len(tree.body) != 1 or len(functions) != 1:
+        raise UnsupportedPattern('source must only define the pattern function')
+    function = functions[0]
+    if function.decorator_list or [a.arg for a in function.args.args] != arg_names:
+        raise UnsupportedPattern('pattern function has a different signature')
+
+    source_names = {n.id for n in ast.walk(tree) if isinstance(n, ast.Name)}
+    translator = _Translator(source_names)
+    result = translator.block(copy.deepcopy(function.body), {})
+    if result[0] != 'return':
+        raise UnsupportedPattern('pattern does not always return')
+    channels, mode = result[1], result[2]
+    color = channels[0] if len(channels) == 1 else ast.Tuple(elts=channels, ctx=ast.Load())
+    translator.statements.append(ast.Return(value=ast.Tuple(elts=[color, _name(mode)],
+                                                            ctx=ast.Load())))
+
+    function.name = 'pattern_vectorized'
+    function.body = translator.statements
+    return ast.fix_missing_locations(tree)
+
+def _pattern_function(tree):
+    'Returns the pattern function definition in a module, or None'
+    functions = {s.name: s for s in tree.body if isinstance(s, ast.FunctionDef)}
+    return functions.get('pattern_vectorized', functions.get('pattern'))
+
+def _returns(node):
+    'Yields the return statements of a function, excluding nested functions'
+    for child in ast.iter_child_nodes(node):
+        if isinstance(child, ast.Return):
+            yield child
+        elif not isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda)):
+            yield from _returns(child)
+
+def analyze(source):
+    '''
+    Determines which inputs a pattern function reads and whether its output can change
+    from frame to frame. Returns a dict of properties. Properties that cannot be determined
+    are set to the value that assumes the pattern reads everything.
+    '''
+    info = {
+        'mode': None, # Color mode name if every return statement uses the same color mode
+        'uses_t': True,
+        'uses_dt': True,
+        'uses_prev_state': True,
+        'uses_yz': True,
+        'uses_random': True,
+        'deterministic': False,
+        'time_invariant': False, # Output only changes when settings change
+        'one_dimensional': False, # Output only depends on x
+    }
+    try:
+        tree = ast.parse(source)
+    except SyntaxError:
+        return info
+    function = _pattern_function(tree)
+    if function is None or function.args.vararg or len(function.args.args) != len(arg_names):
+        return info
+
+    nodes = list(ast.walk(tree))
+    loaded = {n.id for n in ast.walk(function)
+              if isinstance(n, ast.Name) and isinstance(n.ctx, ast.Load)}
+    stored = {n.id for n in nodes if isinstance(n, ast.Name) and not isinstance(n.ctx, ast.Load)}
+    args = dict(zip(arg_names, [a.arg for a in function.args.args]))
+
+    modes = set()
+    for r in _returns(function):
+        if (isinstance(r.value, ast.Tuple) and len(r.value.elts) == 2
+            and isinstance(r.value.elts[1], ast.Name) and r.value.elts[1].id in color_modes):
+            modes.add(r.value.elts[1].id)
+        else:
+            modes.add(None)
+    if len(modes) == 1 and None not in modes and not stored & set(color_modes):
+        info['mode'] = modes.pop()
+
+    info['uses_t'] = args['t'] in loaded
+    info['uses_dt'] = args['dt'] in loaded
+    info['uses_prev_state'] = args['prev_state'] in loaded
+    info['uses_yz'] = args['y'] in loaded or args['z'] in loaded
+    info['uses_random'] = any(isinstance(n, ast.Name) and n.id == 'random' for n in nodes)
+
+    # Patterns can only keep state between frames by modifying objects or global variables
+    modifies_state = any(
+        isinstance(n, (ast.Global, ast.Nonlocal))
+        or isinstance(n, (ast.Subscript, ast.Attribute)) and not isinstance(n.ctx, ast.Load)
+        or isinstance(n, ast.Call) and isinstance(n.func, ast.Attribute)
+        and not (isinstance(n.func.value, ast.Name) and n.func.value.id in ('math', 'random'))
+        for n in nodes)
+    info['deterministic'] = not info['uses_random'] and not modifies_state
+    info['time_invariant'] = (info['deterministic'] and not info['uses_t']
+                              and not info['uses_dt'] and not info['uses_prev_state'])
+    info['one_dimensional'] = (info['deterministic'] and not info['uses_yz']
+                               and not info['uses_prev_state'])
+    return info
@@ -0,0 +1,315 @@
+# led-control WS2812B LED Controller Server
+# Copyright 2023 jackw01. Released under the MIT License (see LICENSE for details).
+
+import collections
+from enum import IntEnum
+import numpy as np
+
+# Protocol for remote rendering targets, see firmware/backend.c for the receiving side
+# Version 1 sends 3 bytes for every LED in a range every frame. Version 2 only sends LEDs
+# that changed since a frame the receiver has acknowledged, and runs of the same color are
+# sent once. Version 3 splits packets that are too large for one UDP datagram into fragments,
+# which are only used once a commit command confirms that all of them have arrived.
+# Version 4 accepts several commands in one UDP datagram, so each frame is usually one datagram.
+# Delta packets for every range in a frame share one frame ID, and the write LEDs command at the
+# end of the frame tells the receiver how many of them to expect before acknowledging the frame.
+# Receivers that do not reply to the hello command are sent version 1 packets.
+
+class CmdType(IntEnum):
+    'Must match CmdType in firmware/backend.h'
+    calibration = 0
+    render_rgb = 1
+    render_hsv = 2
+    write_leds = 3
+    hello = 4
+    render_delta = 5
+    ack = 6
+    fragment = 7
+    commit = 8
+
+packet_start = 0
+protocol_version = 4 # Highest version supported by the host
+delta_history = 4 # Number of sent frames kept for delta encoding
+keyframe_interval = 120 # Delta packets between keyframes, in case frames were lost without notice
+hello_interval = 60 # Packets between hello commands while waiting for a reply
+hello_attempts = 5 # Hello commands sent before the receiver is assumed to only support version 1
+min_run = 3 # Shortest run of LEDs with the same color that is sent as one color
+max_count = 0x7fff # Most LEDs in one span
+
+delta_header_size = 18
+delta_flag_hsv = 0x01
+delta_flag_keyframe = 0x02
+delta_flag_continue = 0x04 # Packet adds a range to the frame started by an earlier packet
+
+# Largest UDP datagram sent, below the usual 1472 byte limit without IP fragmentation
+udp_max_packet = 1400
+fragment_header_size = 9
+fragment_interval = 0.0005 # Seconds between fragments, so the receiver's buffers don't overflow
+
+write_leds_packet = bytes((packet_start, CmdType.write_leds, 0, 5, 0))
+write_leds_frame_size = 9
+
+def colors_to_uint8(pixels, hsv, data, out):
+    '''
+    Converts colors to 1 byte per channel for sending to a remote target
+    data is a float32 buffer and out is a uint8 buffer with 3 values per LED
+    '''
+    data.reshape(-1, 3)[:] = pixels
+    if hsv:
+        hue = data[0::3]
+        np.fmod(hue, 1.0, out=hue)
+        data *= 255.0
+    else:
+        data *= 255.0
+        np.clip(data, 0.0, 255.0, out=data)
+    np.copyto(out, data, casting='unsafe')
+    return out
+
+def encode_delta(colors, base):
+    '''
+    Encodes the LEDs in colors that differ from base, both uint8 arrays of shape (count, 3)
+    Each span of changed LEDs is sent as a 2 byte count of unchanged LEDs to skip, a 2 byte
+    count of LEDs with the high bit set for runs, and the colors, or one color for runs
+    '''
+    count = len(colors)
+    changed = np.any(colors != base, axis=1)
+    if count == 0 or not changed.any():
+        return b''
+
+    # Runs of the same color with at least one changed LED are sent as one color
+    run_starts = np.ones(count, dtype=bool)
+    run_starts[1:] = np.any(colors[1:] != colors[:-1], axis=1)
+    run_start_indices = np.flatnonzero(run_starts)
+    run_lengths = np.diff(np.append(run_start_indices, count))
+    run_changed = np.logical_or.reduceat(changed, run_start_indices)
+    is_run = ((run_lengths >= min_run) & run_changed)[np.cumsum(run_starts) - 1]
+
+    # 0 for unchanged LEDs, 1 for LEDs sent as they are, 2 for LEDs in runs
+    kind = np.where(is_run, 2, changed.astype(np.int8))
+    # Sending a single unchanged LED between two changed LEDs is smaller than starting a new span
+    if count > 2:
+        gaps = (kind[1:-1] == 0) & (kind[:-2] == 1) & (kind[2:] == 1)
+        kind[1:-1][gaps] = 1
+
+    span_starts = np.ones(count, dtype=bool)
+    span_starts[1:] = kind[1:] != kind[:-1]
+    span_starts |= (kind == 2) & run_starts
+    span_starts[::max_count] = True
+    span_start_indices = np.flatnonzero(span_starts)
+    span_ends = np.append(span_start_indices[1:], count)
+    sent = kind[span_start_indices] != 0
+    starts = span_start_indices[sent]
+    ends = span_ends[sent]
+    runs = kind[starts] == 2
+
+    skips = starts - np.concatenate(([0], ends[:-1]))
+    counts = (ends - starts) | (runs.astype(np.int64) << 15)
+    headers = np.stack((skips >> 8, skips, counts >> 8, counts), axis=1).astype(np.uint8)
+
+    # Colors of LEDs sent as they are and the first LED of each run
+    emit = kind == 1
+    emit[starts[runs]] = True
+    emitted_before = np.cumsum(emit) - emit
+    return np.insert(colors[emit].ravel(),
+                     np.repeat(emitted_before[starts] * 3, 4),
+                     headers.ravel()).tobytes()
+
+def decode_delta(data, out):
+    'Applies changes encoded by encode_delta to out, a uint8 array of shape (count, 3)'
+    pos = 0
+    led = 0
+    while pos + 4 <= len(data):
+        led += data[pos] << 8 | data[pos + 1]
+        count = data[pos + 2] << 8 | data[pos + 3]
+        pos += 4
+        # LEDs past the end of out are skipped like on receivers with fewer LEDs
+        if count & 0x8000:
+            count &= max_count
+            out[led:led + count] = np.frombuffer(data, dtype=np.uint8, count=3, offset=pos)
+            pos += 3
+        else:
+            span = out[led:led + count]
+            span[:] = np.frombuffer(data, dtype=np.uint8,
+                                    count=len(span) * 3, offset=pos).reshape(-1, 3)
+            pos += count * 3
+        led += count
+
+def _newer(a, b):
+    'Compares 16 bit frame IDs that wrap around'
+    return 0 < ((a - b) & 0xffff) < 0x8000
+
+class RemoteTarget:
+    '''
+    Protocol state for one serial or UDP target
+    Keeps copies of recent frames so changes can be sent relative to the most recent frame
+    the receiver has acknowledged, and falls back to keyframes if frames are lost
+    Ranges are added to the current frame with range_packets, and end_frame finishes it
+    '''
+
+    def __init__(self, led_count):
+        self.version = 1
+        self._led_count = led_count
+        self._hellos_sent = 0
+        self._packets_since_hello = 0
+        self._history = delta_history
+        self._frames = collections.OrderedDict() # frame ID: array of shape (led_count, 3)
+        self._frame_id = 0
+        self._frame = None # Frame being sent, with all ranges sent so far
+        self._frame_base_id = 0
+        self._frame_flags = 0
+        self._frame_parts = 0
+        self._acked = None
+        self._since_keyframe = 0
+        self._fragment_id = 0
+        self._replies = bytearray()
+
+    def range_packets(self, colors, hsv, correction, saturation, brightness, start, end):
+        'Returns a list of packets to send for a range of LEDs, colors is a uint8 array'
+        packets = []
+        if self.version < protocol_version and self._hellos_sent < hello_attempts:
+            if self._packets_since_hello == 0:
+                packets.append(bytes((packet_start, CmdType.hello, 0, 5, protocol_version)))
+                self._hellos_sent += 1
+            self._packets_since_hello = (self._packets_since_hello + 1) % hello_interval
+
+        if self.version >= 2:
+            packets.append(self._delta_packet(colors, hsv, correction, saturation, brightness,
+                                              start, end))
+        else:
+            packets.append(bytes((packet_start,
+                                  CmdType.render_hsv if hsv else CmdType.render_rgb))
+                           + int(13 + len(colors)).to_bytes(2, 'big')
+                           + correction.to_bytes(3, 'big')
+                           + bytes((int(saturation * 255), int(brightness * 255)))
+                           + start.to_bytes(2, 'big')
+                           + end.to_bytes(2, 'big')
+                           + colors.tobytes())
+        return packets
+
+    def _delta_packet(self, colors, hsv, correction, saturation, brightness, start, end):
+        if self._frame is None:
+            self._start_frame()
+        colors = colors.reshape(-1, 3)
+        flags = self._frame_flags | (delta_flag_hsv if hsv else 0)
+        if self._frame_parts > 0:
+            flags |= delta_flag_continue
+        # Ranges are encoded relative to the frame as the receiver has it after earlier ranges
+        data = encode_delta(colors, self._frame[start:end])
+        self._frame[start:end] = colors
+        self._frame_parts += 1
+
+        return (bytes((packet_start, CmdType.render_delta))
+                + int(delta_header_size + len(data)).to_bytes(2, 'big')
+                + correction.to_bytes(3, 'big')
+                + bytes((int(saturation * 255), int(brightness * 255)))
+                + start.to_bytes(2, 'big')
+                + end.to_bytes(2, 'big')
+                + bytes((flags,))
+                + self._frame_id.to_bytes(2, 'big')
+                + self._frame_base_id.to_bytes(2, 'big')
+                + data)
+
+    def _start_frame(self):
+        self._frame_id = (self._frame_id + 1) & 0xffff
+        self._frame_base_id = self._acked
+        self._frame_flags = 0
+        self._frame_parts = 0
+        # The receiver stores each frame in place of the one history frames before it
+        if (self._frame_base_id not in self._frames
+                or (self._frame_id - self._frame_base_id) & 0xffff >= self._history
+                or self._since_keyframe >= keyframe_interval):
+            # Keyframes are encoded relative to a frame of all zeros
+            self._frame = np.zeros((self._led_count, 3), dtype=np.uint8)
+            self._frame_base_id = 0
+            self._frame_flags = delta_flag_keyframe
+            self._since_keyframe = 0
+        else:
+            self._frame = self._frames[self._frame_base_id].copy()
+            self._since_keyframe += 1
+
+    def end_frame(self):
+        '''
+        Returns the write LEDs packet that ends the current frame
+        If delta packets were sent, the frame is kept for encoding later frames, and the packet
+        has the frame ID and number of delta packets so the receiver can acknowledge the frame
+        '''
+        if self._frame is None:
+            return write_leds_packet
+        self._frames[self._frame_id] = self._frame
+        while len(self._frames) > self._history:
+            self._frames.popitem(last=False)
+        self._frame = None
+        return (bytes((packet_start, CmdType.write_leds, 0, write_leds_frame_size, 0))
+                + self._frame_id.to_bytes(2, 'big')
+                + self._frame_parts.to_bytes(2, 'big'))
+
+    def datagrams(self, packets):
+        '''
+        Returns a list of UDP datagrams to send a list of packets with
+        Packets are combined into as few datagrams as possible, and packets that are too large
+        are split into fragments followed by a commit command
+        '''
+        if self.version < 3:
+            return list(packets)
+        datagrams = []
+        current = b''
+        for packet in packets:
+            if len(packet) > udp_max_packet:
+                fragments = self._fragments(packet)
+                datagrams.extend(([current] if current else []) + fragments[:-1])
+                current = fragments[-1]
+            elif self.version >= 4 and len(current) + len(packet) <= udp_max_packet:
+                current += packet
+            else:
+                if current:
+                    datagrams.append(current)
+                current = packet
+        if current:
+            datagrams.append(current)
+        return datagrams
+
+    def _fragments(self, packet):
+        self._fragment_id = (self._fragment_id + 1) & 0xffff
+        size = udp_max_packet - fragment_header_size
+        fragments = []
+        for index, offset in enumerate(range(0, len(packet), size)):
+            chunk = packet[offset:offset + size]
+            fragments.append(bytes((packet_start, CmdType.fragment))
+                             + int(fragment_header_size + len(chunk)).to_bytes(2, 'big')
+                             + self._fragment_id.to_bytes(2, 'big')
+                             + bytes((index,))
+                             + offset.to_bytes(2, 'big')
+                             + chunk)
+        fragments.append(bytes((packet_start, CmdType.commit, 0, 7))
+                         + self._fragment_id.to_bytes(2, 'big')
+                         + bytes((len(fragments),)))
+        return fragments
+
+    def handle_replies(self, data):
+        'Reads hello replies and acknowledgements sent by the receiver'
+        self._replies += data
+        while True:
+            # The receiver may also print text, which never contains the start byte
+            i = self._replies.find(packet_start)
+            if i < 0:
+                self._replies.clear()
+                return
+            del self._replies[:i]
+            if len(self._replies) < 4:
+                return
+            length = self._replies[2] << 8 | self._replies[3]
+            if self._replies[1] not in (CmdType.hello, CmdType.ack) or length != 6:
+                del self._replies[:1]
+                continue
+            if len(self._replies) < length:
+                return
+            reply = bytes(self._replies[:length])
+            del self._replies[:length]
+            if reply[1] == CmdType.hello:
+                self.version = min(reply[4], protocol_version)
+                self._history = max(min(reply[5], delta_history), 1)
+            else:
+                frame_id = reply[4] << 8 | reply[5]
+                if frame_id in self._frames and (self._acked is None
+                                                 or _newer(frame_id, self._acked)):
+                    self._acked = frame_id
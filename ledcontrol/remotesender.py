@@ -0,0 +1,128 @@
+# led-control WS2812B LED Controller Server
+# Copyright 2023 jackw01. Released under the MIT License (see LICENSE for details).
+
+import collections
+import serial
+import socket
+import time
+from threading import Condition, Thread
+
+import ledcontrol.remoteprotocol as remoteprotocol
+
+udp_port = 8888
+serial_baud_rate = 115200
+serial_write_timeout = 1.0 # Seconds before a serial device that stopped reading is closed
+queue_size = 2 # Frames waiting to be sent before the oldest one is dropped
+poll_interval = 0.02 # Seconds between checks for replies while no frames are sent
+retry_interval = 1.0 # Seconds before reconnecting after an error
+error_interval = 10.0 # Seconds between error messages for one target
+
+class RemoteSender:
+    '''
+    Sends frames to one serial or UDP target in a separate thread, so a slow or disconnected
+    target never delays rendering. If frames are queued faster than they can be sent, the
+    oldest frames are dropped.
+    '''
+
+    def __init__(self, mode, name):
+        self._mode = mode
+        self._name = name
+        self._queue = collections.deque(maxlen=queue_size)
+        self._condition = Condition()
+        self._replies = collections.deque()
+        self._port = None
+        self._socket = None
+        self._retry_time = 0
+        self._errors = 0
+        self._last_error_time = None
+        self.dropped = 0
+        self._thread = Thread(target=self._target, daemon=True)
+        self._thread.start()
+
+    def send(self, items):
+        'Queues a frame, a list of serial writes or UDP datagrams'
+        with self._condition:
+            if len(self._queue) == self._queue.maxlen:
+                self.dropped += 1
+            self._queue.append(items)
+            self._condition.notify()
+
+    def get_replies(self):
+        'Returns all data received from the target since the last call'
+        data = bytearray()
+        while self._replies:
+            data += self._replies.popleft()
+        return data
+
+    def _target(self):
+        while True:
+            with self._condition:
+                if not self._queue:
+                    self._condition.wait(poll_interval)
+                items = self._queue.popleft() if self._queue else None
+            try:
+                if self._connect():
+                    if items is not None:
+                        self._write(items)
+                    self._read()
+            except Exception as e:
+                self._close()
+                self._retry_time = time.monotonic() + retry_interval
+                self._report(e)
+
+    def _connect(self):
+        'Opens the serial port or UDP socket if needed, returns False while waiting to retry'
+        if self._port is not None or self._socket is not None:
+            return True
+        if time.monotonic() < self._retry_time:
+            return False
+        if self._mode == 'serial':
+            self._port = serial.Serial(self._name, serial_baud_rate,
+                                       timeout=0, write_timeout=serial_write_timeout)
+        else:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            sock.connect((socket.gethostbyname(self._name), udp_port))
+            sock.setblocking(False)
+            self._socket = sock
+        return True
+
+    def _write(self, items):
+        for i, item in enumerate(items):
+            if self._port is not None:
+                self._port.write(item)
+            else:
+                if i > 0:
+                    time.sleep(remoteprotocol.fragment_interval)
+                self._socket.send(item)
+
+    def _read(self):
+        if self._port is not None:
+            if self._port.in_waiting > 0:
+                self._replies.append(self._port.read(self._port.in_waiting))
+        else:
+            while True:
+                try:
+                    self._replies.append(self._socket.recv(1024))
+                except BlockingIOError:
+                    break
+
+    def _close(self):
+        try:
+            if self._port is not None:
+                self._port.close()
+            if self._socket is not None:
+                self._socket.close()
+        except Exception:
+            pass
+        self._port = None
+        self._socket = None
+
+    def _report(self, e):
+        'Prints errors at most once every error_interval seconds'
+        self._errors += 1
+        now = time.monotonic()
+        if self._last_error_time is None or now - self._last_error_time >= error_interval:
+            more = f' ({self._errors - 1} more errors)' if self._errors > 1 else ''
+            print(f'Error during remote rendering to {self._name}: {e!r}{more}')
+            self._errors = 0
+            self._last_error_time = now
@@ -0,0 +1,157 @@
+# led-control WS2812B LED Controller Server
+# Copyright 2023 jackw01. Released under the MIT License (see LICENSE for details).
+
+import copy
+import traceback
+import multiprocessing
+import numpy as np
+from threading import Lock
+
+import ledcontrol.animationfunctions as animfunctions
+import ledcontrol.vectorfunctions as vectorfunctions
+
+min_range_size = 256 # Groups are only split into ranges of at least this many LEDs
+
+def _worker(connection, frame, led_count, mapped, wavetable_args, palette_args):
+    'Renders ranges of LEDs into the shared frame buffer when requested'
+    # Imported here to avoid a circular import
+    from ledcontrol.animationcontroller import AnimationController
+
+    # Forked processes start with the same random state
+    vectorfunctions.random = np.random.default_rng()
+
+    controller = AnimationController(None, 0, led_count, mapped.__getitem__,
+                                     False, True, 1.0, *wavetable_args,
+                                     palette_size=palette_args[0],
+                                     palette_memory=palette_args[1])
+    frame_array = np.frombuffer(frame, dtype=np.float32).reshape(-1, 3)
+    controller.set_state_array(frame_array)
+
+    while True:
+        message = connection.recv()
+        if message[0] == 'render':
+            results = []
+            for group, time_1, delta_t_1, range_start, range_end in message[1]:
+                try:
+                    # Colors are written directly into the frame buffer
+                    state, mode = controller.render_group(group, time_1, delta_t_1,
+                                                          range_start, range_end)
+                    results.append((group, mode.name))
+                except Exception as e:
+                    results.append((group, traceback.format_exception(type(e), e, e.__traceback__)))
+            connection.send(results)
+        elif message[0] == 'function':
+            controller.set_pattern_function(message[1], message[2])
+        elif message[0] == 'palette':
+            controller.set_palette(message[1], message[2])
+            controller.calculate_palette_table(message[1])
+        elif message[0] == 'groups':
+            controller.set_group_settings(message[1])
+        elif message[0] == 'stop':
+            break
+
+class RenderPool:
+    '''
+    Renders groups of LEDs in worker processes, large groups are split into multiple ranges
+    Workers write colors into a frame buffer in shared memory
+    '''
+
+    def __init__(self, processes, led_count, mapped, wavetable_args, palette_args):
+        self._frame = multiprocessing.RawArray('f', led_count * 3)
+        self.frame = np.frombuffer(self._frame, dtype=np.float32).reshape(-1, 3)
+        self._connections = []
+        self._processes = []
+        for i in range(processes):
+            connection, worker_connection = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=_worker,
+                                              args=(worker_connection,
+                                                    self._frame,
+                                                    led_count,
+                                                    mapped,
+                                                    wavetable_args,
+                                                    palette_args),
+                                              daemon=True)
+            process.start()
+            # Only the worker keeps its end open, so recv raises EOFError if the worker dies
+            worker_connection.close()
+            self._connections.append(connection)
+            self._processes.append(process)
+
+        # Messages are sent from the render thread so they are never sent during a render
+        self._pending = []
+        self._lock = Lock()
+        self._results = {}
+        self._ranges = {}
+
+    def send(self, *message):
+        'Send a message to all workers before the next frame is rendered'
+        with self._lock:
+            self._pending.append(message)
+
+    def set_pattern_function(self, key, source):
+        'Compile a pattern function in all workers'
+        self.send('function', key, source)
+
+    def set_palette(self, key, palette):
+        'Update a palette in all workers'
+        self.send('palette', key, copy.deepcopy(palette))
+
+    def set_group_settings(self, groups):
+        'Update group settings in all workers'
+        self.send('groups', copy.deepcopy(groups))
+
+    def render(self, jobs):
+        'Render a list of (group, time, delta time, range start, range end) in the workers'
+        with self._lock:
+            pending, self._pending = self._pending, []
+        for message in pending:
+            for connection in self._connections:
+                connection.send(message)
+
+        # Split ranges and give each worker the same number of LEDs
+        work = [[] for c in self._connections]
+        counts = [0 for c in self._connections]
+        self._ranges = {}
+        for group, time_1, delta_t_1, range_start, range_end in jobs:
+            self._ranges[group] = (range_start, range_end)
+            size = max(min_range_size, -(-(range_end - range_start) // len(work)))
+            for start in range(range_start, range_end, size):
+                i = counts.index(min(counts))
+                end = min(start + size, range_end)
+                work[i].append((group, time_1, delta_t_1, start, end))
+                counts[i] += end - start
+
+        for connection, w in zip(self._connections, work):
+            if len(w) > 0:
+                connection.send(('render', w))
+        self._results = {group: 'hsv' for group in self._ranges} # For empty ranges
+        for connection, w in zip(self._connections, work):
+            if len(w) > 0:
+                for group, result in connection.recv():
+                    # Keep errors from any range of a group
+                    if not isinstance(self._results[group], list):
+                        self._results[group] = result
+
+    def get_result(self, group):
+        'Get the colors and color mode for a group from the last render'
+        result = self._results[group]
+        if isinstance(result, list): # Error message
+            raise Exception(''.join(result))
+        range_start, range_end = self._ranges[group]
+        return self.frame[range_start:range_end], animfunctions.ColorMode[result]
+
+    def stop(self):
+        'Stop all workers'
+        for connection in self._connections:
+            connection.send(('stop',))
+        for process in self._processes:
+            process.join()
+
+    def terminate(self):
+        'Stop all workers without waiting for them to finish, used after a worker has failed'
+        for process in self._processes:
+            process.terminate()
+        for process in self._processes:
+            process.join(1.0)
+        for connection in self._connections:
+            connection.close()
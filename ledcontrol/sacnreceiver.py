@@ -0,0 +1,197 @@
+# led-control WS2812B LED Controller Server
+# Copyright 2023 jackw01. Released under the MIT License (see LICENSE for details).
+
+import socket
+import time
+import numpy as np
+from threading import Lock, Thread
+
+port = 5568
+leds_per_universe = 170 # 510 of the 512 channels in a universe are used for RGB LEDs
+data_loss_timeout = 2.5 # Seconds before a source's priority is forgotten
+
+# E1.31 packet layout, see ANSI E1.31-2018
+_root_header = b'\x00\x10\x00\x00ASC-E1.17\x00\x00\x00'
+_vector_root_data = 0x00000004
+_vector_root_extended = 0x00000008
+_vector_data = 0x00000002
+_vector_sync = 0x00000001
+_option_preview = 0x80
+_option_terminated = 0x40
+_data_offset = 126
+_sync_length = 49
+
+def _multicast_address(universe):
+    return f'239.255.{universe >> 8}.{universe & 0xff}'
+
+class LatencyHistogram:
+    'Counts latencies in logarithmic bins from 0.1 ms to 1 s'
+
+    def __init__(self, bins_per_decade=10):
+        self._edges = np.logspace(-4, 0, 4 * bins_per_decade + 1)
+        self._counts = np.zeros(len(self._edges) + 1, dtype=np.int64)
+        self._max = 0.0
+
+    def add(self, seconds):
+        self._counts[np.searchsorted(self._edges, seconds)] += 1
+        self._max = max(self._max, seconds)
+
+    def get_stats(self):
+        'Returns the count, approximate percentiles, and bins with upper limits in ms'
+        counts = self._counts.copy()
+        total = int(counts.sum())
+        uppers = np.append(self._edges, self._max if self._max > self._edges[-1] else np.inf) * 1000
+        stats = {'count': total, 'max_ms': self._max * 1000}
+        cumulative = np.cumsum(counts)
+        for p in (50, 95, 99):
+            i = int(np.searchsorted(cumulative, total * p / 100)) if total else 0
+            stats[f'p{p}_ms'] = float(min(uppers[i], self._max * 1000)) if total else 0.0
+        stats['bins'] = [[float(u), int(c)] for u, c in zip(uppers, counts) if c]
+        return stats
+
+class SACNReceiver:
+    '''
+    Receives E1.31 sACN data for a range of universes into a uint8 buffer of shape (led_count, 3)
+    Universes are mapped to consecutive ranges of 170 LEDs. A frame is complete when all universes
+    have been received, when a universe is received again before that, or when a sync packet
+    arrives if a sync universe is set. Only the latest complete frame is kept.
+    '''
+
+    def __init__(self, led_count, first_universe, universe_count, sync_universe=0, on_frame=None):
+        self._universes = range(first_universe, min(first_universe + universe_count, 64000))
+        self._sync_universe = sync_universe
+        self._on_frame = on_frame
+        self._incoming = np.zeros(led_count * 3, dtype=np.uint8)
+        self._frame = np.zeros(led_count * 3, dtype=np.uint8)
+        self._frame_time = None # Time the last packet of the latest frame was received
+        self._received = set()
+        self._sequences = {} # (CID, universe): last sequence number
+        self._priorities = {} # Universe: {CID: (priority, time last received)}
+        self._lock = Lock()
+        self._socket = None
+        self._thread = None
+        self._stopped = False
+        self.packet_count = 0
+        self.frame_count = 0
+
+    def start(self):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind(('', port))
+        # Sources may send to the multicast address of each universe or directly to this host
+        universes = list(self._universes)
+        if self._sync_universe:
+            universes.append(self._sync_universe)
+        for universe in universes:
+            try:
+                sock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP,
+                                socket.inet_aton(_multicast_address(universe))
+                                + socket.inet_aton('0.0.0.0'))
+            except OSError:
+                pass
+        self._socket = sock
+        self._thread = Thread(target=self._target, args=(sock,), daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        'Stops receiving and waits for the receive thread to exit'
+        if self._socket is not None:
+            self._stopped = True
+            # Closing the socket does not wake up recv_into, but shutting it down does
+            try:
+                self._socket.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass # Unconnected UDP sockets report an error, but are still shut down
+            self._thread.join()
+            self._socket.close()
+            self._socket = None
+            self._thread = None
+
+    def get_frame(self, out):
+        '''
+        Copies the latest complete frame into out, a uint8 array of shape (led_count, 3)
+        Returns the time its last packet was received, or None if there is no new frame
+        '''
+        with self._lock:
+            frame_time = self._frame_time
+            if frame_time is not None:
+                out.reshape(-1)[:] = self._frame
+                self._frame_time = None
+        return frame_time
+
+    def _target(self, sock):
+        data = bytearray(1144) # Longest E1.31 packet
+        view = memoryview(data)
+        while not self._stopped:
+            try:
+                length = sock.recv_into(data)
+            except OSError:
+                return
+            if self._stopped:
+                return
+            self.handle_packet(view[:length], time.perf_counter())
+
+    def handle_packet(self, packet, receive_time):
+        'Handles one E1.31 packet, packet is a bytes-like object'
+        if len(packet) < 22 or packet[0:16] != _root_header:
+            return
+        root_vector = int.from_bytes(packet[18:22], 'big')
+        if root_vector == _vector_root_extended:
+            if (self._sync_universe and len(packet) >= _sync_length
+                    and int.from_bytes(packet[40:44], 'big') == _vector_sync
+                    and int.from_bytes(packet[45:47], 'big') == self._sync_universe):
+                self._complete_frame(receive_time)
+            return
+        if (root_vector != _vector_root_data or len(packet) < _data_offset
+                or int.from_bytes(packet[40:44], 'big') != _vector_data):
+            return
+
+        universe = int.from_bytes(packet[113:115], 'big')
+        options = packet[112]
+        if universe not in self._universes or options & _option_preview or packet[125] != 0:
+            return
+        # Each source is identified by its CID, and keeps its own sequence numbers and priority
+        cid = bytes(packet[22:38])
+        sources = self._priorities.setdefault(universe, {})
+        if options & _option_terminated:
+            self._sequences.pop((cid, universe), None)
+            sources.pop(cid, None)
+            return
+
+        # Packets up to 20 sequence numbers older than the last one from a source are out of order
+        sequence = packet[111]
+        last_sequence = self._sequences.get((cid, universe))
+        if last_sequence is not None and 0 <= (last_sequence - sequence) & 0xff < 20:
+            return
+        self._sequences[(cid, universe)] = sequence
+
+        # Only sources with the highest priority are used, sources are forgotten after a timeout
+        priority = packet[108]
+        sources[cid] = (priority, receive_time)
+        for other_priority, other_time in sources.values():
+            if other_priority > priority and receive_time - other_time < data_loss_timeout:
+                return
+        self.packet_count += 1
+
+        # A universe received twice means the source started the next frame
+        if universe in self._received and not self._sync_universe:
+            self._complete_frame(receive_time)
+        offset = (universe - self._universes.start) * leds_per_universe * 3
+        count = min(len(packet) - _data_offset, leds_per_universe * 3, len(self._incoming) - offset)
+        if count > 0:
+            self._incoming[offset:offset + count] = np.frombuffer(packet, dtype=np.uint8,
+                                                                  count=count, offset=_data_offset)
+        self._received.add(universe)
+        if len(self._received) == len(self._universes) and not self._sync_universe:
+            self._complete_frame(receive_time)
+
+    def _complete_frame(self, receive_time):
+        if not self._received:
+            return
+        self._received.clear()
+        with self._lock:
+            self._frame[:] = self._incoming
+            self._frame_time = receive_time
+        self.frame_count += 1
+        if self._on_frame is not None:
+            self._on_frame()
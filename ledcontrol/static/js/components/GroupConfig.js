@@ -29,6 +29,11 @@ export default {
         items[`groups[${this.name}].range_end`] = this.group.range_end;
         store.setMultiple(items);
       }
+    },
+    setFps(event) {
+      if (this.group.fps >= 0) {
+        store.set(`groups[${this.name}].fps`, this.group.fps);
+      }
     }
   },
   template: `
@@ -95,5 +100,20 @@ export default {
         @change="setBounds"
       >
     </div>
+    <div class="input-row input-row-bottom-margin">
+      <span class="label select-label">Refresh Rate (FPS):</span>
+      <input
+        class="input-inline"
+        type="number"
+        min="0"
+        max="1000"
+        step="1"
+        autocomplete="off"
+        placeholder="0"
+        v-model="group.fps"
+        @change="setFps"
+      >
+      <span class="label select-label"> (0 for every frame)</span>
+    </div>
   `,
 };
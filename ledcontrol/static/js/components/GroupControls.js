@@ -67,6 +67,7 @@ export default {
       if (result.errors.length === 0) {
         this.sourceStatusClass = 'status-success';
         this.sourceStatus = 'Pattern compiled successfully';
+        if (result.path) this.sourceStatus += ` (${result.path})`;
       } else if (result.errors.length > 0) {
         this.sourceStatusClass = 'status-error';
         this.sourceStatus = result.errors.join(', ');
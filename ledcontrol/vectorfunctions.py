@@ -0,0 +1,139 @@
+# led-control WS2812B LED Controller Server
+# Copyright 2023 jackw01. Released under the MIT License (see LICENSE for details).
+
+# NumPy implementations of the pattern utility functions for vectorized patterns.
+# Every function accepts scalars or arrays and broadcasts like a NumPy ufunc, and
+# is numerically equivalent to the scalar version in the driver or utils module.
+
+import types
+import numpy as np
+
+import ledcontrol.driver as driver
+import ledcontrol.driver.driver_non_raspberry_pi as driver_non_raspberry_pi
+
+def palette_index(t, size):
+    return (np.asarray(t) * (size - 0.1)).astype(np.int64) & (size - 1)
+
+def palette_index_mirrored(t, size):
+    i = (np.asarray(t) * (2 * size - 0.1)).astype(np.int64) & (2 * size - 1)
+    return size - 1 - np.minimum(i, 2 * size - 1 - i)
+
+# Waveforms for pattern generation.
+# All have a period of 1 time unit and range from 0-1.
+
+def wave_pulse(t, duty_cycle):
+    return np.ceil(duty_cycle - np.fmod(t, 1.0))
+
+def wave_triangle(t):
+    return np.abs(np.mod(np.multiply(t, 2.0), 2.0) - 1.0)
+
+def wave_sine(t):
+    return np.cos(np.multiply(t, 6.283)) / 2.0 + 0.5
+
+def wave_cubic(t):
+    tri = wave_triangle(t)
+    t2 = 1.0 - tri
+    return np.where(tri > 0.5, 1.0 - 4.0 * t2 * t2 * t2, 4.0 * tri * tri * tri)
+
+# Sum of sines for creating RGB plasma shader effects
+# See https://www.bidouille.org/prog/plasma
+def plasma_sines(x, y, t, coeff_x, coeff_y, coeff_x_y, coeff_dist_x_y):
+    v = np.sin((x + t) * coeff_x)
+    v = v + np.sin((y + t) * coeff_y)
+    v = v + np.sin((x + y + t) * coeff_x_y)
+    v = v + np.sin((np.sqrt(np.multiply(x, x) + np.multiply(y, y)) + t) * coeff_dist_x_y)
+    return v
+
+# Sum of sine octaves for more advanced plasma shaders
+def plasma_sines_octave(x, y, t, octaves, lacunarity, persistence):
+    vx = x
+    vy = y
+    freq = 1.0
+    amplitude = 1.0
+    for i in range(int(octaves)):
+        vx1 = vx
+        vx = vx + np.cos(np.multiply(vy, freq) + t * freq) * amplitude
+        vy = vy + np.sin(np.multiply(vx1, freq) + t * freq) * amplitude
+        freq *= lacunarity
+        amplitude *= persistence
+    return np.divide(vx, 2.0)
+
+# Perlin and fBm noise
+# Native buffer versions if the driver has them, otherwise the NumPy port of the reference
+# implementation in animation_utils.h, so noise is the same as in per-pixel patterns
+if hasattr(driver, 'perlin_noise_3d_buffer'):
+    def _noise_points(x, y, z):
+        x, y, z = np.broadcast_arrays(x, y, z)
+        points = np.empty(x.shape + (3,))
+        points[..., 0] = x
+        points[..., 1] = y
+        points[..., 2] = z
+        return points, np.empty(x.shape)
+
+    def perlin_noise_3d(x, y, z):
+        points, out = _noise_points(x, y, z)
+        driver.perlin_noise_3d_buffer(points, out)
+        return out
+
+    def fbm_noise_3d(x, y, z, octaves, lacunarity, persistence):
+        points, out = _noise_points(x, y, z)
+        driver.fbm_noise_3d_buffer(points, out, int(octaves), lacunarity, persistence)
+        return out
+
+else:
+    perlin_noise_3d = driver_non_raspberry_pi.perlin_noise_3d_array
+    fbm_noise_3d = driver_non_raspberry_pi.fbm_noise_3d_array
+
+# Misc shaping functions
+
+def clamp(x, min, max):
+    return np.clip(x, min, max)
+
+def impulse_exp(t):
+    return t * np.exp(np.subtract(1, t))
+
+def fract(x):
+    return x - np.floor(x)
+
+# Replacement for the math module with the same names backed by NumPy ufuncs
+math = types.SimpleNamespace(
+    pi=np.pi, e=np.e, tau=2 * np.pi, inf=np.inf, nan=np.nan,
+    sin=np.sin, cos=np.cos, tan=np.tan,
+    asin=np.arcsin, acos=np.arccos, atan=np.arctan, atan2=np.arctan2,
+    sinh=np.sinh, cosh=np.cosh, tanh=np.tanh,
+    asinh=np.arcsinh, acosh=np.arccosh, atanh=np.arctanh,
+    sqrt=np.sqrt, exp=np.exp, expm1=np.expm1, pow=np.power, hypot=np.hypot,
+    log=np.log, log2=np.log2, log10=np.log10, log1p=np.log1p,
+    floor=np.floor, ceil=np.ceil, trunc=np.trunc, fabs=np.fabs, fmod=np.fmod,
+    copysign=np.copysign, degrees=np.degrees, radians=np.radians,
+    isnan=np.isnan, isinf=np.isinf, isfinite=np.isfinite,
+)
+
+# Replacement for the random module, methods accept a size argument to return arrays
+random = np.random.default_rng()
+
+# Results
+
+def broadcast_values(values, count):
+    'Converts the palette indices returned by a vectorized pattern to a (count,) float64 array'
+    return np.broadcast_to(np.asarray(values, dtype=np.float64), (count,))
+
+def broadcast_colors(colors, count, out=None):
+    '''
+    Converts the color returned by a vectorized pattern to a (count, 3) float32 array
+    If out is given, the colors are written into it instead of a new array
+    '''
+    if out is None:
+        out = np.empty((count, 3), dtype=np.float32)
+    if isinstance(colors, (tuple, list)):
+        # Tuple of per-channel arrays or scalars
+        if len(colors) != 3:
+            raise ValueError('colors must have three channels')
+        # Channels may be views of out, for example when a pattern reorders prev_state
+        if any(isinstance(c, np.ndarray) and np.may_share_memory(c, out) for c in colors):
+            colors = [np.array(c) for c in colors]
+        for i in range(3):
+            out[:, i] = colors[i]
+    else:
+        out[:] = colors
+    return out
@@ -0,0 +1,118 @@
+# led-control WS2812B LED Controller Server
+# Copyright 2023 jackw01. Released under the MIT License (see LICENSE for details).
+
+import collections
+import numpy as np
+from threading import Lock
+
+import ledcontrol.animationfunctions as animfunctions
+
+class Wavetable:
+    '''
+    Stores the colors of a group of LEDs for a number of evenly spaced frames
+    across one period of a pattern that repeats every time unit
+    '''
+
+    def __init__(self, frames, count, dtype, interpolate):
+        self._frames = frames
+        self._count = count
+        self._dtype = dtype
+        self._interpolate = interpolate
+        self._table = np.zeros((frames, count, 3), dtype=dtype)
+        self._filled = np.zeros(frames, dtype=bool)
+        self._mode = None
+
+    def nbytes(self):
+        'Returns size of the table in bytes'
+        return self._table.nbytes
+
+    def lookup(self, t, render, out):
+        '''
+        Writes colors at time t into out and returns out and the color mode. Frames that
+        have not been stored yet are rendered with render(t), which returns a (count, 3)
+        array and a color mode.
+        '''
+        position = (t % 1.0) * self._frames
+        if self._interpolate:
+            i = int(position) % self._frames
+            j = (i + 1) % self._frames
+            f = position - int(position)
+            a, b = self._frame(i, render), self._frame(j, render)
+            np.subtract(b, a, out=out)
+            if self._mode == animfunctions.ColorMode.hsv:
+                # Interpolate hue along the shortest path
+                out[:, 0] -= np.round(out[:, 0])
+            out *= f
+            out += a
+        else:
+            out[:] = self._frame(round(position) % self._frames, render)
+        return out, self._mode
+
+    def _frame(self, i, render):
+        'Returns a stored frame as a float32 array, rendering it if needed'
+        if not self._filled[i]:
+            colors, self._mode = render(i / self._frames)
+            self._table[i] = self._encode(colors)
+            self._filled[i] = True
+        return self._decode(self._table[i])
+
+    def _encode(self, colors):
+        if self._dtype != np.uint8:
+            return colors
+        # Hue wraps around, other values are clamped to 0-1 like they are when rendered
+        result = np.clip(colors, 0, 1) * 255
+        if self._mode == animfunctions.ColorMode.hsv:
+            result[:, 0] = (colors[:, 0] % 1.0) * 256
+        return np.round(result).astype(np.int64) % 256
+
+    def _decode(self, values):
+        if self._dtype != np.uint8:
+            return values
+        result = values.astype(np.float32) / 255
+        if self._mode == animfunctions.ColorMode.hsv:
+            result[:, 0] = values[:, 0] / np.float32(256)
+        return result
+
+class WavetableCache:
+    '''
+    Least recently used cache of wavetables with a limit on total memory usage
+    Wavetables are looked up by the animation thread and invalidated by the web server
+    thread when settings change, so the cache is guarded by a lock
+    '''
+
+    def __init__(self, frames, max_bytes, dtype=np.float32, interpolate=True):
+        self._frames = frames
+        self._max_bytes = max_bytes
+        self._dtype = dtype
+        self._interpolate = interpolate
+        self._tables = collections.OrderedDict()
+        self._bytes = 0
+        self._lock = Lock()
+
+    def get(self, key, count):
+        'Returns the wavetable for a key, or None if it is too large to store'
+        with self._lock:
+            if key in self._tables:
+                self._tables.move_to_end(key)
+                return self._tables[key]
+
+            size = self._frames * count * 3 * np.dtype(self._dtype).itemsize
+            if size > self._max_bytes:
+                return None
+            while self._bytes + size > self._max_bytes:
+                self._bytes -= self._tables.popitem(last=False)[1].nbytes()
+            self._tables[key] = Wavetable(self._frames, count, self._dtype, self._interpolate)
+            self._bytes += size
+            return self._tables[key]
+
+    def invalidate(self, index, value):
+        'Removes all wavetables with a key containing value at index'
+        with self._lock:
+            for key in [k for k in self._tables if k[index] == value]:
+                self._bytes -= self._tables.pop(key).nbytes()
+
+    def clear(self):
+        'Removes all wavetables'
+        with self._lock:
+            self._tables.clear()
+            self._bytes = 0
@@ -1,15 +1,18 @@
+import numpy as np
 from PIL import Image
 from colorsys import hsv_to_rgb
 from ledcontrol.animationcontroller import AnimationController
 import ledcontrol.animationfunctions as animfunctions
 import ledcontrol.colorpalettes as colorpalettes
 import ledcontrol.pixelmappings as pixelmappings
+import ledcontrol.vectorfunctions as vectorfunctions
 import ledcontrol.driver as driver
 import ledcontrol.utils as utils
 
 controller = AnimationController(None, 0, 256, pixelmappings.line(256), False, True, 1.0)
 
-controller._current_palette_table = controller._palette_tables[0]
+controller._current_palette_table = controller.get_palette_table(0)
+controller._current_palette_array = controller.get_palette_array(0)
 
 s = 100 # LED strip length
 t = 400 # Time units
@@ -29,15 +32,29 @@ for k, pattern_dict in animfunctions.default.items():
     f.write(f'## {pattern_dict["name"]}\n')
 
     prev = [(0, 0, 0) for i in range(s)]
+    prev_array = np.zeros((s, 3), dtype=np.float32)
+    xs = np.arange(s) / s
+    zeros = np.zeros(s)
 
     frames = []
 
     for i in range(img.size[0]):
         frame = Image.new('RGB', (s, 1), 'black')
         frame_pixels = frame.load()
+        t_i = (pattern_dict['primary_speed'] / 0.2) * i / s
+        if controller.get_pattern_info(k)['vectorized']:
+            c, mode = pattern(t_i, 1.0 / s, xs, zeros, zeros, prev_array)
+            prev_array = vectorfunctions.broadcast_colors(c, s)
+            results = [(tuple(prev_array[j].tolist()), mode) for j in range(s)]
+        else:
+            results = []
+            for j in range(s):
+                p = pattern(t_i, 1.0 / s, j / s, 0, 0, prev[j])
+                prev[j] = p[0]
+                results.append(p)
+
         for j in range(img.size[1]):
-            p = pattern((pattern_dict['primary_speed'] / 0.2) * i / s, 1.0 / s, j / s, 0, 0, prev[j])
-            prev[j] = p[0]
+            p = results[j]
             if p[1] == animfunctions.ColorMode.hsv:
                 c = tuple([int(x * 255) for x in hsv_to_rgb(*p[0])])
                 pixels[i, j] = c
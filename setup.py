@@ -34,13 +34,12 @@ def is_raspberrypi():
 requirements = [
     'Flask==2.2.2',
     'RestrictedPython>=5.2',
-    'sacn>=1.8.1',
     'HAP-python==4.4.0',
     'pyopenssl==22.1.0',
     'numpy>=1.21.0',
     'pyserial>=3.5',
     'Werkzeug==2.2.2',
-] + (['bjoern>=3.2.1'] if sys.platform.startswith('linux') else []) + (['pyfastnoisesimd>=0.4.2'] if not is_raspberrypi() else [])
+] + (['bjoern>=3.2.1'] if sys.platform.startswith('linux') else [])
 
 extensions = [
     Extension('_ledcontrol_rpi_ws281x_driver',
@@ -50,6 +49,15 @@ extensions = [
               libraries=['ws2811'])
 ]
 
+# Animation and color utility functions without rpi_ws281x, for other Linux hosts
+# If the build fails, the Python versions in driver_non_raspberry_pi.py are used
+host_extensions = [
+    Extension('_ledcontrol_animation_utils',
+              sources=['ledcontrol/driver/ledcontrol_animation_utils_wrap.c'],
+              include_dirs=['ledcontrol/driver'],
+              optional=True)
+]
+
 setup(
     name='led-control',
     version='2.0.0',
@@ -63,11 +71,13 @@ setup(
     zip_safe=False,
     install_requires=requirements,
     setup_requires=requirements,
-    ext_modules=extensions if is_raspberrypi() else [],
+    ext_modules=extensions if is_raspberrypi() else (host_extensions
+                                                     if sys.platform.startswith('linux') else []),
     include_package_data=True,
     entry_points={
         'console_scripts': [
-            'ledcontrol=ledcontrol:main'
+            'ledcontrol=ledcontrol:main',
+            'ledcontrol-bench=ledcontrol.benchmark:main',
         ]
     },
     cmdclass={
@@ -0,0 +1,48 @@
+# led-control WS2812B LED Controller Server
+# Copyright 2023 jackw01. Released under the MIT License (see LICENSE for details).
+
+import importlib
+import sys
+from pathlib import Path
+
+import pytest
+from setuptools import Distribution, Extension
+
+driver_dir = Path(__file__).resolve().parent.parent / 'ledcontrol' / 'driver'
+
+def pytest_addoption(parser):
+    parser.addoption('--run-speed', action='store_true',
+                     help='Run speed comparisons, which depend on machine load')
+
+def pytest_configure(config):
+    config.addinivalue_line('markers', 'speed: speed comparison, skipped without --run-speed')
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption('--run-speed'):
+        return
+    skip = pytest.mark.skip(reason='Speed comparison, run with --run-speed')
+    for item in items:
+        if 'speed' in item.keywords:
+            item.add_marker(skip)
+
+@pytest.fixture(scope='session')
+def animation_utils(tmp_path_factory):
+    'The native animation utility module, built from the driver sources if it is not installed'
+    try:
+        return importlib.import_module('_ledcontrol_animation_utils')
+    except ImportError:
+        pass
+    build_dir = tmp_path_factory.mktemp('build')
+    extension = Extension('_ledcontrol_animation_utils',
+                          sources=[str(driver_dir / 'ledcontrol_animation_utils_wrap.c')],
+                          include_dirs=[str(driver_dir)])
+    distribution = Distribution({'ext_modules': [extension]})
+    command = distribution.get_command_obj('build_ext')
+    command.build_lib = str(build_dir)
+    command.build_temp = str(build_dir / 'temp')
+    try:
+        distribution.run_command('build_ext')
+    except Exception as e:
+        pytest.skip(f'Native animation utility module could not be built: {e}')
+    sys.path.insert(0, str(build_dir))
+    return importlib.import_module('_ledcontrol_animation_utils')
@@ -0,0 +1,79 @@
+# led-control WS2812B LED Controller Server
+# Copyright 2023 jackw01. Released under the MIT License (see LICENSE for details).
+
+import timeit
+import numpy as np
+import pytest
+
+import ledcontrol.driver.driver_non_raspberry_pi as python_driver
+
+# Values the functions are tested at, including negative and large inputs
+points = np.random.default_rng(0).uniform(-50, 50, (200, 3))
+points[:10] = [(0, 0, 0), (0.3, 0.2, 1.1), (1, 1, 1), (-1, -0.5, 0.25), (255.5, 256.5, 257.5),
+               (0.999, 0.001, 0.5), (-0.001, 3, -3), (12.34, -56.78, 9.1), (0.5, 0.5, 0.5),
+               (2, 3, 4)]
+
+# The native functions use float32, so only rounding differences are allowed
+tolerance = 1e-4
+
+def assert_close(native, python):
+    assert np.allclose(native, python, rtol=0, atol=tolerance), f'{native} != {python}'
+
+@pytest.mark.parametrize('function, args', [
+    ('wave_pulse', lambda x, y, z: (x, abs(y) / 50)),
+    ('wave_triangle', lambda x, y, z: (x,)),
+    ('wave_sine', lambda x, y, z: (x,)),
+    ('wave_cubic', lambda x, y, z: (x,)),
+    ('plasma_sines', lambda x, y, z: (x / 10, y / 10, z, 1.0, 2.5, 0.5, 3.0)),
+    ('plasma_sines_octave', lambda x, y, z: (x / 10, y / 10, z, 4, 1.5, 0.75)),
+    ('perlin_noise_3d', lambda x, y, z: (x, y, z)),
+    ('fbm_noise_3d', lambda x, y, z: (x, y, z, 3, 2.0, 0.5)),
+    ('clamp', lambda x, y, z: (x, -10, 10)),
+    ('blackbody_to_rgb', lambda x, y, z: (abs(x) * 200 + 1000,)),
+    ('blackbody_correction_rgb', lambda x, y, z: ((0.5, 0.25, 1.0), abs(x) * 200 + 1000)),
+])
+def test_function_matches_python(animation_utils, function, args):
+    for x, y, z in points:
+        native = getattr(animation_utils, function)(*args(x, y, z))
+        python = getattr(python_driver, function)(*args(x, y, z))
+        assert_close(native, python)
+
+@pytest.mark.parametrize('function', ['palette_index', 'palette_index_mirrored'])
+def test_palette_index_matches_python(animation_utils, function):
+    for t in np.linspace(-2, 2, 1001):
+        for size in (16, 256):
+            assert getattr(animation_utils, function)(t, size) == \
+                getattr(python_driver, function)(t, size)
+
+def test_perlin_noise_reference_value(animation_utils):
+    assert animation_utils.perlin_noise_3d(0.3, 0.2, 1.1) == pytest.approx(0.2775, abs=1e-4)
+    assert python_driver.perlin_noise_3d(0.3, 0.2, 1.1) == pytest.approx(0.2775, abs=1e-4)
+
+def test_noise_arrays_match_native(animation_utils):
+    x, y, z = points.T
+    out = np.empty(len(points))
+    animation_utils.perlin_noise_3d_buffer(np.ascontiguousarray(points), out)
+    assert_close(out, python_driver.perlin_noise_3d_array(x, y, z))
+    animation_utils.fbm_noise_3d_buffer(np.ascontiguousarray(points), out, 3, 2.0, 0.5)
+    assert_close(out, python_driver.fbm_noise_3d_array(x, y, z, 3, 2.0, 0.5))
+    # Array versions give the same result as the scalar versions
+    assert_close(python_driver.perlin_noise_3d_array(x, y, z),
+                 [python_driver.perlin_noise_3d(*p) for p in points])
+
+# Wall clock timing is unreliable on loaded machines, so this only runs with --run-speed
+@pytest.mark.speed
+@pytest.mark.parametrize('function, args', [
+    ('wave_sine', (0.3,)),
+    ('plasma_sines_octave', (0.3, 0.2, 1.1, 4, 1.5, 0.75)),
+    ('perlin_noise_3d', (0.3, 0.2, 1.1)),
+    ('fbm_noise_3d', (0.3, 0.2, 1.1, 3, 2.0, 0.5)),
+    ('blackbody_to_rgb', (3000,)),
+])
+def test_native_is_faster(animation_utils, function, args):
+    native = getattr(animation_utils, function)
+    python = getattr(python_driver, function)
+    native_time = min(timeit.repeat(lambda: native(*args), number=2000, repeat=5))
+    python_time = min(timeit.repeat(lambda: python(*args), number=2000, repeat=5))
+    print(f'{function}: native {native_time * 500:.3f} us, python {python_time * 500:.3f} us, '
+          f'{python_time / native_time:.1f}x')
+    assert native_time < python_time
@@ -0,0 +1,53 @@
+# led-control WS2812B LED Controller Server
+# Copyright 2023 jackw01. Released under the MIT License (see LICENSE for details).
+
+import numpy as np
+import pytest
+
+import ledcontrol.animationfunctions as animfunctions
+import ledcontrol.pixelmappings as pixelmappings
+from ledcontrol.animationcontroller import AnimationController
+
+led_count = 500
+
+@pytest.fixture(scope='module')
+def controller():
+    # Random 3D points, so 2D patterns are tested with x and y
+    points = np.random.default_rng(0).random((led_count, 3)) * 4
+    return AnimationController(None, 0, led_count, pixelmappings.from_array(points.tolist()),
+                               False, True, 1.0)
+
+native_patterns = [k for k, v in animfunctions.default.items()
+                   if 'prev_state' not in v['source'].split('):', 1)[1]]
+
+@pytest.mark.parametrize('pattern', native_patterns)
+@pytest.mark.parametrize('palette', [0, 50])
+@pytest.mark.parametrize('scale', [1.0, 0.37])
+def test_native_matches_python(animation_utils, controller, pattern, palette, scale):
+    controller.update_settings({'groups': {'main': {'function': pattern,
+                                                    'palette': palette,
+                                                    'scale': scale}}})
+    assert controller.get_pattern_info(pattern)['native']
+    mapping = np.ascontiguousarray(controller.get_mapping_array('main'))
+    palette_array = np.ascontiguousarray(controller.get_palette_array(palette), dtype=np.float32)
+    for t in (0.0, 0.4321, 17.77, 9876.54321):
+        state, mode = controller.render_group('main', t, 0.016, 0, led_count)
+        expected_mode = 0 if mode == animfunctions.ColorMode.rgb else 1
+        out = np.zeros((led_count, 3), dtype=np.float64)
+        assert animation_utils.default_pattern_colors_buffer(pattern, mapping, palette_array,
+                                                             t, out) == expected_mode
+        # Palette colors are looked up by index, so a value on the edge between two palette
+        # entries may round differently in a few pixels
+        mismatched = ~np.all(np.isclose(out, state, rtol=0, atol=1e-3), axis=1)
+        assert np.mean(mismatched) < 0.01, f'{np.sum(mismatched)} pixels differ at t={t}'
+
+def test_invalid_arguments(animation_utils, controller):
+    mapping = np.zeros((10, 3), dtype=np.float64)
+    palette = np.zeros((16, 3), dtype=np.float32)
+    out = np.zeros((10, 3), dtype=np.float64)
+    assert animation_utils.default_pattern_colors_buffer(6, mapping, palette, 0.0, out) == -1
+    assert animation_utils.default_pattern_colors_buffer(0, mapping[:5], palette, 0.0, out) == -1
+    assert animation_utils.default_pattern_colors_buffer(0, mapping, palette[:15], 0.0, out) == -1
+    with pytest.raises(TypeError):
+        animation_utils.default_pattern_colors_buffer(0, mapping.astype(np.float32), palette,
+                                                      0.0, out)
@@ -0,0 +1,35 @@
+# led-control WS2812B LED Controller Server
+# Copyright 2023 jackw01. Released under the MIT License (see LICENSE for details).
+
+import time
+
+from ledcontrol.intervaltimer import IntervalTimer
+
+def test_exception_does_not_stop_timer(capsys):
+    calls = []
+    def function():
+        calls.append(time.perf_counter())
+        if len(calls) % 2:
+            raise ValueError('test')
+    timer = IntervalTimer(0.005, function)
+    timer.start()
+    time.sleep(0.2)
+    timer.stop()
+    assert len(calls) > 10
+    assert timer.get_count() == len(calls)
+    # Repeated errors are only printed once every error_interval seconds, as a traceback
+    output = capsys.readouterr().out
+    assert output.count('Error in timer function') == 1
+    assert 'Traceback (most recent call last):\n' in output
+    assert output.endswith('ValueError: test\n')
+
+def test_stats_while_running():
+    timer = IntervalTimer(0.001, lambda: None, history=50)
+    timer.start()
+    deadline = time.perf_counter() + 0.3
+    while time.perf_counter() < deadline:
+        stats = timer.get_stats()
+        assert stats['execution']['max_ms'] < 100
+        assert stats['latency']['p50_ms'] >= 0
+    timer.stop()
+    assert timer.get_stats()['count'] == timer.get_count() > 50
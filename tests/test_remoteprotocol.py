@@ -0,0 +1,177 @@
+# led-control WS2812B LED Controller Server
+# Copyright 2023 jackw01. Released under the MIT License (see LICENSE for details).
+
+import numpy as np
+import pytest
+
+import ledcontrol.remoteprotocol as remoteprotocol
+from ledcontrol.benchmark import StandInReceiver
+from ledcontrol.remoteprotocol import CmdType
+
+led_count = 2000
+
+def random_colors(rng, count=led_count):
+    return rng.integers(0, 256, (count, 3), dtype=np.uint8)
+
+def connect(receiver):
+    'Returns a RemoteTarget that has negotiated the protocol version with the receiver'
+    target = remoteprotocol.RemoteTarget(led_count)
+    packets = target.range_packets(np.zeros(3, dtype=np.uint8), False,
+                                   0xffffff, 1.0, 1.0, 0, 1)
+    assert packets[0][1] == CmdType.hello
+    send(target, receiver, target.datagrams(packets))
+    assert target.version == remoteprotocol.protocol_version
+    return target
+
+def send(target, receiver, datagrams):
+    'Delivers datagrams to the receiver and returns its replies to the target'
+    replies = []
+    for datagram in datagrams:
+        replies += receiver.handle(datagram)
+    for reply in replies:
+        target.handle_replies(reply)
+    return replies
+
+def frame_datagrams(target, colors, start=0, end=led_count):
+    packets = target.range_packets(colors[start:end].reshape(-1), False,
+                                   0xffffff, 1.0, 1.0, start, end)
+    packets.append(target.end_frame())
+    return target.datagrams(packets)
+
+@pytest.fixture
+def receiver():
+    return StandInReceiver(led_count)
+
+def test_delta_round_trip(receiver):
+    rng = np.random.default_rng(0)
+    target = connect(receiver)
+    colors = random_colors(rng)
+    bytes_sent = []
+    for i in range(20):
+        # A few LEDs and a run of LEDs change every frame
+        colors[rng.integers(0, led_count, 10)] = random_colors(rng, 10)
+        colors[100 + i:150 + i] = (i, 2 * i, 3 * i)
+        datagrams = frame_datagrams(target, colors)
+        assert send(target, receiver, datagrams)
+        assert np.array_equal(receiver.colors, colors)
+        bytes_sent.append(sum(len(d) for d in datagrams))
+    # Frames after the first keyframe only send the LEDs that changed
+    assert max(bytes_sent[1:]) < bytes_sent[0] / 10
+
+def test_lost_delta_packet(receiver):
+    rng = np.random.default_rng(1)
+    target = connect(receiver)
+    colors = random_colors(rng)
+    send(target, receiver, frame_datagrams(target, colors))
+    lost = colors.copy()
+    lost[:10] = 0
+    frame_datagrams(target, lost) # Never delivered
+    # The next frame is encoded from the last acknowledged frame, so it is still correct
+    colors[5:20] = 255
+    send(target, receiver, frame_datagrams(target, colors))
+    assert np.array_equal(receiver.colors, colors)
+
+def test_keyframe(receiver):
+    rng = np.random.default_rng(2)
+    target = connect(receiver)
+    for i in range(remoteprotocol.keyframe_interval + 2):
+        colors = random_colors(rng) if i % 10 == 0 else colors
+        packets = target.range_packets(colors.reshape(-1), False, 0xffffff, 1.0, 1.0,
+                                       0, led_count)
+        flags = packets[-1][13]
+        # Keyframes are sent first and at every keyframe interval
+        assert bool(flags & remoteprotocol.delta_flag_keyframe) == \
+            (i % (remoteprotocol.keyframe_interval + 1) == 0)
+        packets.append(target.end_frame())
+        send(target, receiver, target.datagrams(packets))
+        assert np.array_equal(receiver.colors, colors)
+
+def test_decode_delta():
+    rng = np.random.default_rng(3)
+    base = random_colors(rng, 500)
+    colors = base.copy()
+    colors[10:40] = (1, 2, 3) # Run
+    colors[rng.integers(0, 500, 50)] = random_colors(rng, 50)
+    frame = base.copy()
+    remoteprotocol.decode_delta(remoteprotocol.encode_delta(colors, base), frame)
+    assert np.array_equal(frame, colors)
+
+def test_fragment_reassembly(receiver):
+    rng = np.random.default_rng(4)
+    target = connect(receiver)
+    colors = random_colors(rng)
+    datagrams = frame_datagrams(target, colors)
+    assert [d[1] for d in datagrams[:-1]] == [CmdType.fragment] * (len(datagrams) - 1)
+    assert datagrams[-1][1] == CmdType.commit
+    assert all(len(d) <= remoteprotocol.udp_max_packet for d in datagrams)
+    send(target, receiver, datagrams)
+    assert np.array_equal(receiver.colors, colors)
+
+def test_fragments_out_of_order(receiver):
+    rng = np.random.default_rng(5)
+    target = connect(receiver)
+    colors = random_colors(rng)
+    datagrams = frame_datagrams(target, colors)
+    fragments = datagrams[:-1]
+    order = rng.permutation(len(fragments))
+    send(target, receiver, [fragments[i] for i in order] + datagrams[-1:])
+    assert np.array_equal(receiver.colors, colors)
+
+def test_missing_fragment(receiver):
+    rng = np.random.default_rng(6)
+    target = connect(receiver)
+    colors = random_colors(rng)
+    datagrams = frame_datagrams(target, colors)
+    # Without every fragment the commit is ignored, so nothing is displayed or acknowledged
+    assert send(target, receiver, datagrams[1:]) == []
+    assert not receiver.colors.any()
+    # The next frame is a keyframe again, so it can be decoded
+    send(target, receiver, frame_datagrams(target, colors))
+    assert np.array_equal(receiver.colors, colors)
+
+def test_multiple_commands_in_datagram(receiver):
+    rng = np.random.default_rng(7)
+    target = connect(receiver)
+    colors = random_colors(rng)
+    packets = []
+    for start, end in ((0, 50), (50, 60), (200, 300)):
+        packets += target.range_packets(colors[start:end].reshape(-1), False,
+                                        0xffffff, 1.0, 1.0, start, end)
+    packets.append(target.end_frame())
+    datagrams = target.datagrams(packets)
+    assert len(datagrams) == 1
+    assert send(target, receiver, datagrams)
+    for start, end in ((0, 60), (200, 300)):
+        assert np.array_equal(receiver.colors[start:end], colors[start:end])
+    assert not receiver.colors[60:200].any()
+
+@pytest.mark.parametrize('groups', [2, 4, 8])
+def test_multiple_groups(receiver, groups):
+    rng = np.random.default_rng(8)
+    target = connect(receiver)
+    colors = random_colors(rng)
+    bounds = np.linspace(0, led_count, groups + 1).astype(int)
+    replies = []
+    for i in range(30):
+        colors[rng.integers(0, led_count, 5)] = random_colors(rng, 5)
+        packets = []
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            packets += target.range_packets(colors[start:end].reshape(-1), False,
+                                            0xffffff, 1.0, 1.0, int(start), int(end))
+        # Every range in a frame has the same frame ID, and frames are only keyframes until
+        # the first one is acknowledged
+        delta_packets = [p for p in packets if p[1] == CmdType.render_delta]
+        assert len({p[14:16] for p in delta_packets}) == 1
+        keyframe = [bool(p[13] & remoteprotocol.delta_flag_keyframe) for p in delta_packets]
+        assert keyframe == [i < 2] * groups
+        packets.append(target.end_frame())
+        datagrams = target.datagrams(packets)
+        replies.append([reply for d in datagrams for reply in receiver.handle(d)])
+        assert np.array_equal(receiver.colors, colors)
+        # Acknowledgements arrive one frame late
+        if i > 0:
+            for reply in replies.pop(0):
+                target.handle_replies(reply)
+        if i > 2:
+            # Only the changed LEDs are sent for every group
+            assert sum(len(d) for d in datagrams) < led_count * 3 / 20